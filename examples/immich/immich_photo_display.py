@@ -8,7 +8,7 @@ import random
 import sys
 import time
 from io import BytesIO
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import requests
 from PIL import Image, ImageOps
@@ -125,19 +125,21 @@ def resolve_lcd_serials(explicit: Optional[List[str]]) -> List[str]:
     return [_normalize_serial(serial_number)]
 
 
-def push_to_lcd(jpeg_bytes: bytes, selector: str) -> None:
+def push_to_lcds(frames: Dict[str, bytes]) -> Dict[str, lcd.PanelPushResult]:
+    """Push every frame in parallel, retrying only the panels that reported busy."""
+    results: Dict[str, lcd.PanelPushResult] = {}
+    pending = dict(frames)
     for attempt in range(BUSY_RETRY_ATTEMPTS):
-        try:
-            with lcd.TLLCDDevice(selector) as panel:
-                panel.send_jpg(jpeg_bytes)
-            return
-        except lcd.LCDDeviceError as exc:
-            message = str(exc)
-            if BUSY_ERROR_SNIPPET not in message or attempt == BUSY_RETRY_ATTEMPTS - 1:
-                raise
-            delay = BUSY_RETRY_DELAY_SECONDS * (attempt + 1)
-            print(f"LCD {selector} busy; retrying in {delay:.1f}s", file=sys.stderr)
-            time.sleep(delay)
+        for result in lcd.push_many(pending):
+            results[result.serial] = result
+            if result.ok or BUSY_ERROR_SNIPPET not in (result.error or ""):
+                pending.pop(result.serial, None)
+        if not pending or attempt == BUSY_RETRY_ATTEMPTS - 1:
+            break
+        delay = BUSY_RETRY_DELAY_SECONDS * (attempt + 1)
+        print(f"LCD {', '.join(pending)} busy; retrying in {delay:.1f}s", file=sys.stderr)
+        time.sleep(delay)
+    return results
 
 
 def main() -> None:
@@ -169,6 +171,8 @@ def main() -> None:
     asset_ids = args.asset_id or []
     person_ids = args.person_id or []
 
+    frames: Dict[str, bytes] = {}
+    assets: Dict[str, str] = {}
     for index, selector in enumerate(selectors):
         if index < len(asset_ids):
             asset_id = asset_ids[index]
@@ -179,13 +183,18 @@ def main() -> None:
             else:
                 asset_id = fetch_asset_id(base_url, args.api_key, args.take)
         image = download_image(asset_id, base_url, args.api_key)
-        jpeg_bytes = resize_to_square(image, size=args.size)
-        try:
-            push_to_lcd(jpeg_bytes, selector)
-        except lcd.LCDDeviceError as exc:
-            print(f"Failed to push asset {asset_id} to LCD {selector}: {exc}", file=sys.stderr)
+        frames[selector] = resize_to_square(image, size=args.size)
+        assets[selector] = asset_id
+
+    for selector, result in push_to_lcds(frames).items():
+        asset_id = assets[selector]
+        if not result.ok:
+            print(f"Failed to push asset {asset_id} to LCD {selector}: {result.error}", file=sys.stderr)
             continue
-        print(f"Pushed asset {asset_id} to LCD {selector} at {args.size}x{args.size}.")
+        print(
+            f"Pushed asset {asset_id} to LCD {selector} at {args.size}x{args.size} "
+            f"in {result.latency_ms:.0f} ms."
+        )
 
 
 if __name__ == "__main__":
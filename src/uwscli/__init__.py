@@ -3,12 +3,21 @@
 __version__ = "0.4.0"
 
 __all__ = [
+    "aio",
     "cli",
+    "daemon",
+    "effect_cache",
     "lcd",
+    "lcd_dedup",
+    "lcd_image",
+    "lcd_keepalive",
+    "lcd_stream",
     "led",
+    "led_frames",
     "tinyuz",
     "wireless",
     "structs",
     "usbutil",
     "tl_effects",
+    "tl_effects_numpy",
 ]
@@ -0,0 +1,214 @@
+"""Asyncio front-end for the wireless transceiver and TL LCD panels.
+
+Each device wrapper owns a single-threaded executor: blocking libusb/HID
+calls for that device run serially on its worker while the event loop stays
+free to drive other dongles and panels. Waits between RF packets use
+``asyncio.sleep`` instead of blocking the worker; only the sub-millisecond
+gaps between the chunks of one RF payload stay on the worker thread, where
+they are shorter than an event-loop timer tick.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, TypeVar
+
+from . import lcd, wireless
+from .structs import LCDControlSetting
+from .tl_effects import TLEffects
+from .wireless import PWMSendResult, WirelessSnapshot
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _DeviceWorker:
+    """Runs one device's blocking calls on its own worker thread."""
+
+    def __init__(self, name: str, executor: Optional[ThreadPoolExecutor] = None):
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=name
+        )
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def _shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class AsyncWirelessTransceiver(_DeviceWorker):
+    """Async wrapper around :class:`uwscli.wireless.WirelessTransceiver`."""
+
+    def __init__(
+        self,
+        transceiver: Any,
+        *,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        super().__init__("uws-rf", executor)
+        self._tx = transceiver
+
+    @classmethod
+    async def open(cls, **kwargs: Any) -> "AsyncWirelessTransceiver":
+        """Open the dongle pair on a fresh worker; ``kwargs`` go to the transceiver."""
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="uws-rf")
+        loop = asyncio.get_running_loop()
+        try:
+            transceiver = await loop.run_in_executor(
+                executor, functools.partial(wireless.WirelessTransceiver, **kwargs)
+            )
+        except BaseException:
+            executor.shutdown(wait=False)
+            raise
+        return cls(transceiver, executor=executor)
+
+    @property
+    def transceiver(self) -> Any:
+        return self._tx
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run any blocking transceiver method on the device worker."""
+
+        return await self._run(getattr(self._tx, method), *args, **kwargs)
+
+    async def list_devices(self) -> WirelessSnapshot:
+        return await self._run(self._tx.list_devices)
+
+    async def set_pwm(
+        self, mac: str, pwm_values: Sequence[int], *, sequence_index: int = 1
+    ) -> None:
+        await self._run(
+            self._tx.set_pwm, mac, pwm_values, sequence_index=sequence_index
+        )
+
+    async def set_pwm_many(
+        self,
+        targets: Mapping[str, Sequence[int]],
+        *,
+        sequence_index: int = 1,
+        chunk_interval: Optional[float] = None,
+    ) -> List[PWMSendResult]:
+        return await self._run(
+            self._tx.set_pwm_many,
+            targets,
+            sequence_index=sequence_index,
+            chunk_interval=chunk_interval,
+        )
+
+    async def set_led_effect(
+        self,
+        mac: str,
+        effect: TLEffects,
+        *,
+        tb: Optional[int] = 0,
+        brightness: int = 255,
+        direction: int = 1,
+        interval_ms: Optional[int] = 50,
+        broadcast: bool = False,
+        use_cache: bool = True,
+    ) -> None:
+        target, snapshot, payload, options = await self._run(
+            self._tx._prepare_led_effect,
+            mac,
+            effect,
+            tb=tb,
+            brightness=brightness,
+            direction=direction,
+            interval_ms=interval_ms,
+            broadcast=broadcast,
+            use_cache=use_cache,
+        )
+        upload = wireless._LEDUpload.create(target, snapshot, payload, **options)
+        # The steps share one payload buffer, so each send is awaited before
+        # the generator is advanced to build the next packet.
+        for delay, packet in self._tx._led_upload_steps(upload):
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._run(
+                self._tx._send_rf_data, upload.channel, target.rx_type, packet
+            )
+        await self._run(self._tx._finish_led_upload, target)
+
+    async def close(self) -> None:
+        try:
+            await self._run(self._tx.close)
+        finally:
+            self._shutdown()
+
+    async def __aenter__(self) -> "AsyncWirelessTransceiver":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+class AsyncLCDDevice(_DeviceWorker):
+    """Async wrapper around :class:`uwscli.lcd.TLLCDDevice`."""
+
+    def __init__(
+        self,
+        device: Any,
+        *,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        super().__init__("uws-lcd", executor)
+        self._device = device
+
+    @classmethod
+    async def open(cls, serial: str) -> "AsyncLCDDevice":
+        executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"uws-lcd-{serial}"
+        )
+        loop = asyncio.get_running_loop()
+        try:
+            device = await loop.run_in_executor(executor, lcd.TLLCDDevice, serial)
+        except BaseException:
+            executor.shutdown(wait=False)
+            raise
+        return cls(device, executor=executor)
+
+    @property
+    def device(self) -> Any:
+        return self._device
+
+    async def handshake(self) -> Dict[str, int]:
+        return await self._run(self._device.handshake)
+
+    async def firmware_version(self) -> Dict[str, str]:
+        return await self._run(self._device.firmware_version)
+
+    async def control(self, setting: LCDControlSetting) -> None:
+        await self._run(self._device.control, setting)
+
+    async def send_jpg(self, payload: lcd.LCDPayload) -> None:
+        await self._run(self._device.send_jpg, payload)
+
+    async def send_sync_jpg(self, payload: lcd.LCDPayload) -> None:
+        await self._run(self._device.send_sync_jpg, payload)
+
+    async def close(self) -> None:
+        try:
+            await self._run(self._device.close)
+        finally:
+            self._shutdown()
+
+    async def __aenter__(self) -> "AsyncLCDDevice":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+async def list_lcd_devices() -> List[lcd.HidDeviceInfo]:
+    """Enumerate LCD panels without blocking the event loop."""
+
+    return await asyncio.to_thread(lcd.enumerate_devices)
@@ -3,14 +3,33 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import io
 import json
+import os
 import random
+import stat
+import sys
+import threading
 import time
+import urllib.request
 from importlib import metadata
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
-
-from . import lcd, tl_effects, tlcontroller, wireless
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, cast
+
+from . import (
+    daemon,
+    effect_cache,
+    lcd,
+    lcd_dedup,
+    lcd_image,
+    lcd_keepalive,
+    lcd_stream,
+    rf_pacing,
+    tl_effects,
+    tlcontroller,
+    wireless,
+)
 from .logging_utils import configure_logging
 from .structs import LCDControlSetting, ScreenRotation, clamp_pwm_values
 
@@ -55,6 +74,18 @@ def build_parser() -> argparse.ArgumentParser:
         default="text",
         help="Output format for supported commands (default: text)",
     )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Open the RF dongles directly even when `uws daemon` is running",
+    )
+    parser.add_argument(
+        "--rf-pacing",
+        choices=["adaptive", "fixed"],
+        help="RF send pacing: use the stock timings (fixed) or learn shorter gaps "
+        "per dongle (adaptive; lost LED effects are not detected). "
+        f"Default: ${rf_pacing.PACING_ENV} or fixed",
+    )
     subparsers = parser.add_subparsers(dest="namespace")
 
     # LCD namespace
@@ -76,21 +107,155 @@ def build_parser() -> argparse.ArgumentParser:
     send_jpg_parser.add_argument(
         "--file", required=True, type=Path, help="JPEG file path"
     )
+    send_jpg_target = send_jpg_parser.add_mutually_exclusive_group()
+    send_jpg_target.add_argument(
+        "--serial", required=False, help="USB serial number of the LCD device"
+    )
+    send_jpg_target.add_argument(
+        "--all",
+        action="store_true",
+        help="Push the frame to every attached LCD panel in parallel",
+    )
+    send_jpg_parser.add_argument(
+        "--fit",
+        action="store_true",
+        help="Resize, rotate and re-encode the image for the panel (needs Pillow)",
+    )
+    send_jpg_parser.add_argument(
+        "--size",
+        type=_parse_panel_size,
+        default=lcd_image.PANEL_SIZE,
+        help="Panel resolution for --fit as WIDTHxHEIGHT (default: 400x400)",
+    )
+    send_jpg_parser.add_argument(
+        "--rotate",
+        type=int,
+        default=0,
+        choices=[0, 90, 180, 270],
+        help="Rotate the image clockwise before fitting (with --fit)",
+    )
     send_jpg_parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=lcd_image.DEFAULT_MAX_BYTES,
+        help="JPEG size budget for --fit "
+        f"(default: {lcd_image.DEFAULT_MAX_BYTES}, one wireless transfer)",
+    )
+    send_jpg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not reuse or store fitted frames in the on-disk cache",
+    )
+
+    send_video_parser = lcd_sub.add_parser(
+        "send-video", help="Upload an AVI video to the LCD"
+    )
+    send_video_parser.add_argument(
+        "--file", required=True, type=Path, help="AVI file path"
+    )
+    send_video_parser.add_argument(
         "--serial", required=False, help="USB serial number of the LCD device"
     )
+    send_video_parser.add_argument(
+        "--boot",
+        action="store_true",
+        help="Store the video as the boot animation instead of playing it",
+    )
 
     keep_alive_parser = lcd_sub.add_parser(
         "keep-alive", help="Send periodic keep-alive handshakes"
     )
-    keep_alive_parser.add_argument(
-        "--serial", required=False, help="USB serial number of the LCD device"
+    keep_alive_target = keep_alive_parser.add_mutually_exclusive_group()
+    keep_alive_target.add_argument(
+        "--serial",
+        action="append",
+        help="USB serial number of an LCD device (repeat for several panels)",
+    )
+    keep_alive_target.add_argument(
+        "--all", action="store_true", help="Keep every attached LCD panel awake"
     )
     keep_alive_parser.add_argument(
         "--interval",
         type=float,
         default=5.0,
-        help="Seconds between keep-alive messages (default: 5)",
+        help="Seconds between keep-alive messages per panel (default: 5)",
+    )
+    keep_alive_parser.add_argument(
+        "--jitter",
+        type=float,
+        default=lcd_keepalive.DEFAULT_JITTER,
+        help="Fraction of the interval used to spread handshakes across panels "
+        f"(default: {lcd_keepalive.DEFAULT_JITTER:g})",
+    )
+
+    stream_parser = lcd_sub.add_parser(
+        "stream", help="Continuously stream JPEG frames to the LCD"
+    )
+    stream_parser.add_argument(
+        "--serial", required=False, help="USB serial number of the LCD device"
+    )
+    stream_source = stream_parser.add_mutually_exclusive_group(required=True)
+    stream_source.add_argument(
+        "--dir",
+        type=Path,
+        help="Watch a directory and push the newest JPEG whenever it changes",
+    )
+    stream_source.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read concatenated JPEG frames from standard input",
+    )
+    stream_source.add_argument(
+        "--url", help="Read an MJPEG (multipart JPEG) stream from an HTTP URL"
+    )
+    stream_source.add_argument(
+        "--file",
+        type=Path,
+        help="Read concatenated JPEG frames from a file (played in real time) or FIFO",
+    )
+    stream_parser.add_argument(
+        "--fps",
+        type=float,
+        default=lcd_stream.DEFAULT_FPS,
+        help=f"Target frames per second (default: {lcd_stream.DEFAULT_FPS:g})",
+    )
+    stream_parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=lcd_stream.DEFAULT_QUEUE_SIZE,
+        help="Frames buffered between reader and panel before the oldest is dropped (default: 2)",
+    )
+    stream_parser.add_argument(
+        "--duration", type=float, help="Stop after this many seconds"
+    )
+    stream_parser.add_argument(
+        "--max-frames",
+        type=int,
+        help="Stop after this many frames (including frames skipped by --dedup)",
+    )
+    stream_parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between progress reports on stderr; 0 disables (default: 5)",
+    )
+    stream_parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Use the app-sync frame command (no per-packet acknowledgement on HID panels)",
+    )
+    stream_parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Skip frames identical to the last one pushed (still refreshed before the panel dims)",
+    )
+    stream_parser.add_argument(
+        "--similarity",
+        type=float,
+        help=(
+            "With --dedup, also skip frames whose pixels differ from the last "
+            "pushed frame by at most this mean fraction, e.g. 0.01 (requires Pillow)"
+        ),
     )
 
     control_parser = lcd_sub.add_parser("control", help="Send an LCD control setting")
@@ -139,11 +304,23 @@ def build_parser() -> argparse.ArgumentParser:
     fan_target = set_fan_parser.add_mutually_exclusive_group(required=True)
     fan_target.add_argument(
         "--mac",
-        help="MAC address of the wireless receiver (aa:bb:cc:dd:ee:ff)",
+        action="append",
+        metavar="MAC[=PWM]",
+        help=(
+            "MAC address of the wireless receiver (aa:bb:cc:dd:ee:ff). Repeat to "
+            "update several receivers in one burst; MAC=PWM or MAC=p1,p2,p3,p4 "
+            "overrides --pwm/--pwm-list for that receiver"
+        ),
     )
     fan_target.add_argument(
         "--all", action="store_true", help="Apply PWM to all bound wireless receivers"
     )
+    fan_target.add_argument(
+        "--targets-json",
+        metavar="FILE",
+        help='JSON object mapping MAC to PWM value or list, e.g. {"aa:..": 120} '
+        "(use - for stdin)",
+    )
     set_fan_parser.add_argument(
         "--pwm", type=int, help="Single PWM value (0-255) applied to all ports"
     )
@@ -157,6 +334,13 @@ def build_parser() -> argparse.ArgumentParser:
         default=1,
         help="Sequence index used by the RF command (default: 1)",
     )
+    set_fan_parser.add_argument(
+        "--chunk-interval-ms",
+        type=float,
+        help="Pause between RF chunks of a multi-receiver burst (default: "
+        f"{wireless.RF_CHUNK_INTERVAL * 1000:g}, or the learned RF pacing with "
+        "--rf-pacing adaptive)",
+    )
 
     effect_names = sorted(effect.name.lower() for effect in tl_effects.TLEffects)
 
@@ -225,6 +409,11 @@ def build_parser() -> argparse.ArgumentParser:
         default="both",
         help="Fan segment for TL effects (front, behind, or both; default: both)",
     )
+    set_led_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Regenerate TL effects instead of using the compressed effect cache",
+    )
 
     bind_parser = fan_sub.add_parser(
         "bind", help="Bind an unlinked wireless receiver to the current master"
@@ -270,7 +459,20 @@ def build_parser() -> argparse.ArgumentParser:
         "--interval",
         type=float,
         default=1.0,
-        help="Polling interval in seconds (controller mode only; default: 1.0)",
+        help="Polling interval in seconds (controller mode only; default: 1.0, "
+        f"minimum {wireless.MIN_SYNC_INTERVAL:g})",
+    )
+    sync_parser.add_argument(
+        "--deadband",
+        type=int,
+        help="Ignore motherboard PWM changes smaller than this many steps "
+        f"(controller mode only; default: {wireless.DEFAULT_SYNC_DEADBAND})",
+    )
+    sync_parser.add_argument(
+        "--min-send-interval",
+        type=float,
+        help="Minimum seconds between updates to the same receiver "
+        f"(controller mode only; default: {wireless.DEFAULT_SYNC_MIN_SEND_INTERVAL:g})",
     )
     sync_parser.add_argument(
         "--once",
@@ -284,9 +486,108 @@ def build_parser() -> argparse.ArgumentParser:
         help="Sequence index used by the RF command (receiver mode only; default: 1)",
     )
 
+    # Cache namespace (compressed TL effect payloads)
+    cache_parser = subparsers.add_parser(
+        "cache", help="Manage the compressed TL effect cache"
+    )
+    cache_sub = cache_parser.add_subparsers(dest="command", required=True)
+
+    cache_sub.add_parser("list", help="List cached TL effect payloads")
+    cache_sub.add_parser("purge", help="Remove every cached TL effect payload")
+
+    warm_parser = cache_sub.add_parser(
+        "warm", help="Precompute compressed TL effect payloads"
+    )
+    warm_parser.add_argument(
+        "--effect",
+        action="append",
+        choices=effect_names,
+        help="TL effect to precompute (repeatable; default: all effects)",
+    )
+    warm_parser.add_argument(
+        "--fans",
+        action="append",
+        type=int,
+        choices=[1, 2, 3, 4],
+        help="Fan count to precompute for (repeatable; default: 4)",
+    )
+    warm_parser.add_argument(
+        "--effect-brightness",
+        type=int,
+        default=255,
+        help="Brightness (0-255) to precompute (default: 255)",
+    )
+    warm_parser.add_argument(
+        "--effect-direction",
+        type=int,
+        choices=[0, 1],
+        default=1,
+        help="Direction to precompute (0=reverse, 1=forward; default: 1)",
+    )
+    warm_parser.add_argument(
+        "--effect-scope",
+        choices=["front", "behind", "both"],
+        default="both",
+        help="Fan segment to precompute (default: both)",
+    )
+
+    # Daemon namespace (long-lived transceiver session)
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Hold the RF dongles open and serve fan commands locally"
+    )
+    daemon_sub = daemon_parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("run", "Run the daemon in the foreground"),
+        ("status", "Report whether a daemon is running"),
+        ("stop", "Ask a running daemon to exit"),
+    ):
+        daemon_cmd = daemon_sub.add_parser(name, help=help_text)
+        daemon_cmd.add_argument(
+            "--socket",
+            type=Path,
+            help=(
+                f"Control socket path (default: ${daemon.SOCKET_ENV} "
+                "or a per-user runtime path)"
+            ),
+        )
+        if name == "run":
+            daemon_cmd.add_argument(
+                "--no-cache",
+                action="store_true",
+                help="Disable the compressed TL effect cache inside the daemon",
+            )
+
     return parser
 
 
+def _open_transceiver(args: argparse.Namespace, **kwargs: Any) -> Any:
+    """Route through a running `uws daemon` when possible, else open the dongles."""
+
+    if not getattr(args, "no_daemon", False):
+        client = daemon.connect(use_effect_cache=kwargs.get("effect_cache") is not None)
+        if client is not None:
+            return client
+    if rf_pacing.adaptive_enabled(getattr(args, "rf_pacing", None)):
+        kwargs.setdefault("pacing", rf_pacing.PacingStore())
+    return wireless.WirelessTransceiver(**kwargs)
+
+
+def _scope_to_tb(scope: str) -> Optional[int]:
+    if scope == "front":
+        return 0
+    if scope == "behind":
+        return 1
+    return None
+
+
+def _tb_to_scope(tb: Optional[int]) -> str:
+    if tb == 0:
+        return "front"
+    if tb == 1:
+        return "behind"
+    return "both"
+
+
 def _resolve_lcd_serial(cli_serial: str | None) -> str:
     if cli_serial:
         return _normalize_serial(cli_serial)
@@ -325,6 +626,66 @@ def _load_file_bytes(path: Path) -> bytes:
     return data
 
 
+def _parse_panel_size(value: str) -> Tuple[int, int]:
+    width, sep, height = value.lower().partition("x")
+    try:
+        size = (int(width), int(height))
+    except ValueError:
+        size = (0, 0)
+    if not sep or min(size) <= 0:
+        raise argparse.ArgumentTypeError("Size must look like 400x400")
+    return size
+
+
+def _fit_jpg_file(args: argparse.Namespace) -> lcd_image.FittedFrame:
+    """Load ``args.file`` and fit it to the panel for ``send-jpg --fit``."""
+
+    source = _load_file_bytes(args.file)
+    if not lcd_image.is_available():
+        raise SystemExit(
+            "--fit requires Pillow. Install with 'pip install uwscli[images]'."
+        )
+    try:
+        options = lcd_image.FitOptions(
+            size=args.size, rotation=args.rotate, max_bytes=args.max_bytes
+        )
+        cache = None if args.no_cache else lcd_image.FrameCache()
+        return lcd_image.fit_jpeg(source, options, cache=cache)
+    except lcd_image.LCDImageError as exc:
+        raise SystemExit(str(exc))
+
+
+def _fit_summary(frame: lcd_image.FittedFrame) -> Dict[str, Any]:
+    return {
+        "source_bytes": frame.source_bytes,
+        "quality": frame.quality,
+        "cached": frame.cached,
+    }
+
+
+def _open_upload(path: Path) -> Tuple[BinaryIO, int]:
+    """Open ``path`` for streaming to a panel; returns the handle and size."""
+
+    try:
+        handle: BinaryIO = path.open("rb")
+    except FileNotFoundError:
+        raise SystemExit(f"File not found: {path}")
+    except OSError as exc:
+        raise SystemExit(f"Unable to open {path}: {exc}")
+    info = os.fstat(handle.fileno())
+    if not stat.S_ISREG(info.st_mode):
+        # Pipes and devices have no size up front; read them once here.
+        with handle:
+            data = handle.read()
+        handle, size = io.BytesIO(data), len(data)
+    else:
+        size = info.st_size
+    if not size:
+        handle.close()
+        raise SystemExit("File is empty")
+    return handle, size
+
+
 def _parse_test_color(value: str) -> tuple[int, int, int]:
     try:
         parts = [int(part.strip()) for part in value.split(",")]
@@ -414,6 +775,119 @@ def _ensure_pwm_values(args) -> List[int]:
     return [args.pwm] * 4
 
 
+def _parse_pwm_spec(spec: str, option: str) -> List[int]:
+    try:
+        values = [int(part.strip()) for part in spec.split(",") if part.strip()]
+    except ValueError as exc:
+        raise SystemExit(f"{option} PWM values must be integers") from exc
+    if not values:
+        raise SystemExit(f"{option} is missing PWM values")
+    if len(values) == 1:
+        values = values * 4
+    return list(clamp_pwm_values(values))
+
+
+def _parse_pwm_targets(args) -> Optional[Dict[str, List[int]]]:
+    """Return the MAC->PWM mapping of a multi-receiver set-fan, else ``None``."""
+
+    if args.targets_json:
+        try:
+            if args.targets_json == "-":
+                raw = json.load(sys.stdin)
+            else:
+                raw = json.loads(Path(args.targets_json).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise SystemExit(f"Unable to read --targets-json: {exc}") from exc
+        if not isinstance(raw, dict) or not raw:
+            raise SystemExit("--targets-json must be a non-empty JSON object")
+        targets: Dict[str, List[int]] = {}
+        for mac, value in raw.items():
+            if isinstance(value, int):
+                value = [value]
+            if not isinstance(value, list) or not all(
+                isinstance(v, int) for v in value
+            ):
+                raise SystemExit(f"PWM for {mac} must be an integer or integer list")
+            targets[mac] = _parse_pwm_spec(",".join(map(str, value)), mac)
+        return targets
+    if not args.mac:
+        return None
+    if len(args.mac) == 1 and "=" not in args.mac[0]:
+        return None
+    targets = {}
+    default_values: Optional[List[int]] = None
+    for entry in args.mac:
+        mac, sep, spec = entry.partition("=")
+        mac = mac.strip()
+        if sep:
+            targets[mac] = _parse_pwm_spec(spec, f"--mac {mac}")
+            continue
+        if default_values is None:
+            default_values = _ensure_pwm_values(args)
+        targets[mac] = list(default_values)
+    return targets
+
+
+def _handle_set_fan_many(
+    args: argparse.Namespace, pwm_targets: Optional[Dict[str, List[int]]]
+) -> None:
+    pwm_values = _ensure_pwm_values(args) if pwm_targets is None else None
+    chunk_interval = (
+        None
+        if args.chunk_interval_ms is None
+        else max(0.0, args.chunk_interval_ms) / 1000
+    )
+    try:
+        with _open_transceiver(args) as tx:
+            if pwm_targets is None:
+                snapshot = tx.list_devices()
+                pwm_targets = {
+                    dev.mac: list(cast(List[int], pwm_values))
+                    for dev in snapshot.devices
+                    if dev.is_bound
+                }
+                if not pwm_targets:
+                    raise SystemExit("No bound wireless devices found")
+            results = tx.set_pwm_many(
+                pwm_targets,
+                sequence_index=args.sequence_index,
+                chunk_interval=chunk_interval,
+            )
+    except wireless.WirelessError as exc:
+        raise SystemExit(str(exc))
+
+    timings = [
+        {
+            "mac": result.mac,
+            "pwm": list(result.pwm_values),
+            "offset_ms": round(result.offset_ms, 3),
+            "duration_ms": round(result.duration_ms, 3),
+        }
+        for result in results
+    ]
+    payload: Dict[str, Any] = {
+        "macs": [result.mac for result in results],
+        "count": len(results),
+        "sequence_index": args.sequence_index,
+        "targets": timings,
+    }
+    if results:
+        last = results[-1]
+        payload["elapsed_ms"] = round(last.offset_ms + last.duration_ms, 3)
+    if pwm_values is not None:
+        payload["pwm"] = list(pwm_values)
+        lines = [f"Applied PWM {pwm_values} to {', '.join(payload['macs'])}"]
+    else:
+        lines = [
+            f"Applied PWM {list(result.pwm_values)} to {result.mac}" for result in results
+        ]
+    lines.extend(
+        f"  {entry['mac']}: +{entry['offset_ms']:.1f} ms, took {entry['duration_ms']:.1f} ms"
+        for entry in timings
+    )
+    _emit_output(args, payload, text="\n".join(lines))
+
+
 def handle_lcd(args: argparse.Namespace) -> None:
     if args.command == "list":
         devices = lcd.enumerate_devices()
@@ -433,6 +907,13 @@ def handle_lcd(args: argparse.Namespace) -> None:
         _emit_output(args, response, text=text)
         return
 
+    if args.command == "send-jpg" and args.all:
+        _handle_send_jpg_all(args)
+        return
+    if args.command == "keep-alive":
+        _handle_keep_alive(args)
+        return
+
     serial = _resolve_lcd_serial(getattr(args, "serial", None))
     try:
         with lcd.TLLCDDevice(serial) as device:
@@ -442,13 +923,36 @@ def handle_lcd(args: argparse.Namespace) -> None:
                     "firmware": device.firmware_version(),
                 }
                 _emit_output(args, info, text=json.dumps(info, indent=2))
+            elif args.command == "send-jpg" and args.fit:
+                frame = _fit_jpg_file(args)
+                device.send_jpg(frame.data)
+                _emit_output(
+                    args,
+                    {"bytes_sent": len(frame.data), "fit": _fit_summary(frame)},
+                    text=f"Sent {len(frame.data)} bytes to LCD "
+                    f"(fitted from {frame.source_bytes} bytes)",
+                )
             elif args.command == "send-jpg":
-                jpg_payload = _load_file_bytes(args.file)
-                device.send_jpg(jpg_payload)
+                handle, size = _open_upload(args.file)
+                with handle:
+                    device.send_jpg(handle)
                 _emit_output(
                     args,
-                    {"bytes_sent": len(jpg_payload)},
-                    text=f"Sent {len(jpg_payload)} bytes to LCD",
+                    {"bytes_sent": size},
+                    text=f"Sent {size} bytes to LCD",
+                )
+            elif args.command == "send-video":
+                handle, size = _open_upload(args.file)
+                with handle:
+                    if args.boot:
+                        device.send_boot_video(handle)
+                    else:
+                        device.send_avi(handle)
+                target = "boot animation" if args.boot else "video"
+                _emit_output(
+                    args,
+                    {"bytes_sent": size, "boot": args.boot},
+                    text=f"Sent {size} bytes of {target} to LCD",
                 )
             elif args.command == "control":
                 setting = LCDControlSetting(
@@ -464,29 +968,199 @@ def handle_lcd(args: argparse.Namespace) -> None:
                 _emit_output(
                     args, {"status": "control_sent"}, text="LCD control command sent"
                 )
-            elif args.command == "keep-alive":
-                interval = max(args.interval, 0.5)
-                print(
-                    f"Keeping LCD {serial} awake every {interval:.1f}s. Press Ctrl+C to stop."
-                )
-                # Perform an initial handshake to confirm connectivity.
-                device.handshake()
-                try:
-                    while True:
-                        time.sleep(interval)
-                        device.handshake()
-                except KeyboardInterrupt:
-                    print("Keep-alive stopped.")
+            elif args.command == "stream":
+                _handle_lcd_stream(args, device)
             else:
                 raise SystemExit("Unknown lcd command")
     except lcd.LCDDeviceError as exc:
         raise SystemExit(str(exc))
 
 
+def _stream_frames(
+    args: argparse.Namespace, stop: threading.Event
+) -> Tuple[Iterable[bytes], Optional[Any]]:
+    """Return the frame iterator for ``lcd stream`` plus a handle to close."""
+
+    if args.dir is not None:
+        if not args.dir.is_dir():
+            raise SystemExit(f"Directory not found: {args.dir}")
+        return lcd_stream.iter_directory(args.dir, stop=stop), None
+    if args.stdin:
+        return lcd_stream.iter_jpeg_stream(sys.stdin.buffer), None
+    if args.url:
+        try:
+            response = urllib.request.urlopen(args.url, timeout=10)
+        except (OSError, ValueError) as exc:
+            raise SystemExit(f"Unable to open {args.url}: {exc}")
+        return lcd_stream.iter_jpeg_stream(response), response
+    if not args.file.exists():
+        raise SystemExit(f"File not found: {args.file}")
+    handle = args.file.open("rb")
+    frames: Iterable[bytes] = lcd_stream.iter_jpeg_stream(handle)
+    if args.file.is_file():
+        # A recorded file is read instantly; replay it at the target rate
+        # instead of letting the queue drop everything but the last frame.
+        frames = lcd_stream.throttle(frames, args.fps, stop=stop)
+    return frames, handle
+
+
+def _handle_lcd_stream(args: argparse.Namespace, device: Any) -> None:
+    if args.fps <= 0:
+        raise SystemExit("--fps must be positive")
+    if args.similarity is not None and not args.dedup:
+        raise SystemExit("--similarity requires --dedup")
+    dedup = None
+    if args.dedup:
+        try:
+            dedup = lcd_dedup.DedupLCDDevice(device, similarity=args.similarity)
+        except lcd_dedup.FrameDedupError as exc:
+            raise SystemExit(str(exc))
+    stop = threading.Event()
+    frames, handle = _stream_frames(args, stop)
+    streamer = lcd_stream.LCDStreamer(
+        dedup or device,
+        frames,
+        fps=args.fps,
+        queue_size=args.queue_size,
+        sync=args.sync,
+    )
+    # Refresh the panel in the background while frames are slow to arrive,
+    # so a push never has to handshake inline.
+    keep_alive = lcd_keepalive.KeepAliveScheduler()
+    keep_alive.add(args.serial or "lcd", device)
+
+    def report(stats: lcd_stream.StreamStats) -> None:
+        info = stats.as_dict()
+        print(
+            f"{info['frames_sent']} frames, {info['fps']:.1f} fps, "
+            f"{info['frames_dropped']} dropped, send {info['avg_send_ms']:.1f} ms avg",
+            file=sys.stderr,
+        )
+
+    try:
+        with keep_alive:
+            stats = streamer.run(
+                duration=args.duration,
+                max_frames=args.max_frames,
+                stats_interval=args.stats_interval or None,
+                on_stats=report,
+            )
+    except KeyboardInterrupt:
+        stats = streamer.stats
+    except lcd_stream.LCDStreamError as exc:
+        raise SystemExit(str(exc))
+    finally:
+        stop.set()
+        if handle is not None:
+            handle.close()
+    info = stats.as_dict()
+    text = (
+        f"Streamed {info['frames_sent']} frames in {info['elapsed_s']:.1f}s "
+        f"({info['fps']:.1f} fps, {info['frames_dropped']} dropped)\n"
+        f"  read {info['avg_read_ms']:.1f} ms, queued {info['avg_queue_ms']:.1f} ms, "
+        f"send {info['avg_send_ms']:.1f} ms avg (max {info['max_send_ms']:.1f} ms)"
+    )
+    if dedup is not None:
+        info["dedup"] = dedup.stats.as_dict()
+        text += (
+            f"\n  skipped {info['frames_skipped']} unchanged frames "
+            f"({dedup.stats.refreshes} refreshed, {dedup.stats.bytes_saved} bytes saved)"
+        )
+    _emit_output(args, info, text=text)
+
+
+def _handle_keep_alive(args: argparse.Namespace) -> None:
+    if args.all:
+        serials = [
+            _normalize_serial(dev.serial_number)
+            for dev in lcd.enumerate_devices()
+            if dev.serial_number
+        ]
+        if not serials:
+            raise SystemExit("No LCD devices detected")
+    elif args.serial:
+        serials = [_normalize_serial(serial) for serial in args.serial]
+    else:
+        serials = [_resolve_lcd_serial(None)]
+    interval = max(args.interval, 0.5)
+    try:
+        scheduler = lcd_keepalive.KeepAliveScheduler(
+            interval=interval, jitter=args.jitter
+        )
+    except lcd_keepalive.KeepAliveError as exc:
+        raise SystemExit(str(exc))
+
+    with contextlib.ExitStack() as stack:
+        for serial in serials:
+            try:
+                device = stack.enter_context(lcd.TLLCDDevice(serial))
+                # Perform an initial handshake to confirm connectivity.
+                device.handshake()
+            except lcd.LCDDeviceError as exc:
+                raise SystemExit(f"{serial}: {exc}")
+            scheduler.add(serial, device)
+        print(
+            f"Keeping LCD {', '.join(serials)} awake every {interval:.1f}s. "
+            "Press Ctrl+C to stop."
+        )
+        try:
+            with scheduler:
+                while True:
+                    time.sleep(3600)
+        except KeyboardInterrupt:
+            print("Keep-alive stopped.")
+    for serial, stats in scheduler.stats().items():
+        if stats.failures:
+            print(
+                f"  {serial}: {stats.handshakes} handshakes, "
+                f"{stats.failures} failed (last: {stats.last_error})"
+            )
+
+
+def _handle_send_jpg_all(args: argparse.Namespace) -> None:
+    fitted = _fit_jpg_file(args) if args.fit else None
+    jpg_payload = fitted.data if fitted else _load_file_bytes(args.file)
+    started = time.perf_counter()
+    results = lcd.push_many(jpg_payload)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not results:
+        raise SystemExit("No LCD devices detected")
+    panels = [
+        {
+            "serial": result.serial,
+            "bytes_sent": result.bytes_sent,
+            "latency_ms": round(result.latency_ms, 3),
+            "error": result.error,
+        }
+        for result in results
+    ]
+    failed = [result for result in results if not result.ok]
+    payload = {
+        "panels": panels,
+        "count": len(results),
+        "failed": len(failed),
+        "elapsed_ms": round(elapsed_ms, 3),
+    }
+    if fitted is not None:
+        payload["fit"] = _fit_summary(fitted)
+    lines = [
+        f"Sent {len(jpg_payload)} bytes to {len(results) - len(failed)}/{len(results)} "
+        f"LCD panel(s) in {elapsed_ms:.1f} ms"
+    ]
+    lines.extend(
+        f"  {entry['serial']}: took {entry['latency_ms']:.1f} ms"
+        + (f" (failed: {entry['error']})" if entry["error"] else "")
+        for entry in panels
+    )
+    _emit_output(args, payload, text="\n".join(lines))
+    if failed:
+        raise SystemExit(f"{len(failed)} of {len(results)} LCD panel(s) failed")
+
+
 def handle_fan(args: argparse.Namespace) -> None:
     if args.command == "list":
         try:
-            with wireless.WirelessTransceiver() as tx:
+            with _open_transceiver(args) as tx:
                 snapshot = tx.list_devices()
                 if not snapshot.devices:
                     _emit_output(
@@ -519,7 +1193,7 @@ def handle_fan(args: argparse.Namespace) -> None:
     if args.command == "list-masters":
         master_query: tuple[str, Optional[int]] | None = None
         try:
-            with wireless.WirelessTransceiver() as tx:
+            with _open_transceiver(args) as tx:
                 snapshot = tx.list_devices()
                 try:
                     master_query = tx.query_master_mac()
@@ -615,41 +1289,21 @@ def handle_fan(args: argparse.Namespace) -> None:
         return
 
     if args.command == "set-fan":
+        pwm_targets = _parse_pwm_targets(args)
+        if pwm_targets is not None or args.all:
+            _handle_set_fan_many(args, pwm_targets)
+            return
         pwm_values = _ensure_pwm_values(args)
+        mac = args.mac[0]
         try:
-            with wireless.WirelessTransceiver() as tx:
-                if args.all:
-                    snapshot = tx.list_devices()
-                    pwm_devices = [dev for dev in snapshot.devices if dev.is_bound]
-                    if not pwm_devices:
-                        raise SystemExit("No bound wireless devices found")
-                    pwm_target_macs: List[str] = []
-                    for dev in pwm_devices:
-                        tx.set_pwm_direct(
-                            dev,
-                            pwm_values,
-                            sequence_index=args.sequence_index,
-                            label=dev.mac,
-                        )
-                        pwm_target_macs.append(dev.mac)
-                else:
-                    tx.set_pwm(args.mac, pwm_values, sequence_index=args.sequence_index)
-                    pwm_target_macs = [args.mac]
-            if args.all:
-                result_payload: Dict[str, Any] = {
-                    "macs": pwm_target_macs,
-                    "count": len(pwm_target_macs),
-                    "pwm": list(pwm_values),
-                    "sequence_index": args.sequence_index,
-                }
-                message = f"Applied PWM {pwm_values} to {', '.join(pwm_target_macs)}"
-            else:
-                result_payload = {
-                    "mac": pwm_target_macs[0],
-                    "pwm": list(pwm_values),
-                    "sequence_index": args.sequence_index,
-                }
-                message = f"Applied PWM {pwm_values} to {pwm_target_macs[0]}"
+            with _open_transceiver(args) as tx:
+                tx.set_pwm(mac, pwm_values, sequence_index=args.sequence_index)
+            result_payload: Dict[str, Any] = {
+                "mac": mac,
+                "pwm": list(pwm_values),
+                "sequence_index": args.sequence_index,
+            }
+            message = f"Applied PWM {pwm_values} to {mac}"
             _emit_output(args, result_payload, text=message)
             return
         except wireless.WirelessError as exc:
@@ -657,22 +1311,24 @@ def handle_fan(args: argparse.Namespace) -> None:
 
     if args.command == "set-led":
         try:
-            if args.all:
-                with wireless.WirelessTransceiver() as tx:
+            results: List[Dict[str, Any]] = []
+            last_text: str = ""
+            selected_random_effect: Optional[tl_effects.TLEffects] = None
+            if args.mode == "random-effect":
+                selected_random_effect = random.choice(list(tl_effects.TLEffects))
+            led_cache = None if args.no_cache else effect_cache.EffectCache()
+            with _open_transceiver(args, effect_cache=led_cache) as tx:
+                # One listing serves every target: the transceiver reuses it
+                # for the per-MAC lookups below.
+                if args.all:
                     snapshot = tx.list_devices()
                     targets: List[str] = [
                         dev.mac for dev in snapshot.devices if dev.is_bound
                     ]
                     if not targets:
                         raise SystemExit("No bound wireless devices found")
-            else:
-                targets = [args.mac]
-            results: List[Dict[str, Any]] = []
-            last_text: str = ""
-            selected_random_effect: Optional[tl_effects.TLEffects] = None
-            if args.mode == "random-effect":
-                selected_random_effect = random.choice(list(tl_effects.TLEffects))
-            with wireless.WirelessTransceiver() as tx:
+                else:
+                    targets = [args.mac]
                 for mac in targets:
                     entry_text: str
                     entry_data: Dict[str, Any]
@@ -725,12 +1381,7 @@ def handle_fan(args: argparse.Namespace) -> None:
                         effect = tl_effects.TLEffects[args.effect.upper()]
                         brightness = max(0, min(255, args.effect_brightness))
                         direction = int(args.effect_direction)
-                        if args.effect_scope == "front":
-                            tb = 0
-                        elif args.effect_scope == "behind":
-                            tb = 1
-                        else:
-                            tb = None
+                        tb = _scope_to_tb(args.effect_scope)
                         interval_ms = max(1, args.interval_ms)
                         tx.set_led_effect(
                             mac,
@@ -753,12 +1404,7 @@ def handle_fan(args: argparse.Namespace) -> None:
                     elif args.mode == "random-effect":
                         brightness = max(0, min(255, args.effect_brightness))
                         direction = int(args.effect_direction)
-                        if args.effect_scope == "front":
-                            tb = 0
-                        elif args.effect_scope == "behind":
-                            tb = 1
-                        else:
-                            tb = None
+                        tb = _scope_to_tb(args.effect_scope)
                         effect = selected_random_effect or random.choice(
                             list(tl_effects.TLEffects)
                         )
@@ -832,7 +1478,7 @@ def handle_fan(args: argparse.Namespace) -> None:
 
     if args.command == "bind":
         try:
-            with wireless.WirelessTransceiver() as tx:
+            with _open_transceiver(args) as tx:
                 updated = tx.bind_device(
                     args.mac, master_mac=args.master_mac, rx_type=args.rx_type
                 )
@@ -857,7 +1503,7 @@ def handle_fan(args: argparse.Namespace) -> None:
 
     if args.command == "unbind":
         try:
-            with wireless.WirelessTransceiver() as tx:
+            with _open_transceiver(args) as tx:
                 updated = tx.unbind_device(args.mac)
             if updated and not updated.is_bound:
                 data = {
@@ -884,12 +1530,18 @@ def handle_fan(args: argparse.Namespace) -> None:
             raise SystemExit("--once is only valid when --mode controller")
         if mode != "controller" and (args.interval != 1.0):
             raise SystemExit("--interval is only valid when --mode controller")
+        if mode != "controller" and (
+            args.deadband is not None or args.min_send_interval is not None
+        ):
+            raise SystemExit(
+                "--deadband/--min-send-interval are only valid when --mode controller"
+            )
         if mode == "receiver":
             if not args.mac and not args.all:
                 args.all = True
             pwm_values = [6, 6, 6, 6]
             try:
-                with wireless.WirelessTransceiver() as tx:
+                with _open_transceiver(args) as tx:
                     receiver_macs: List[str]
                     if args.mac:
                         tx.set_pwm(args.mac, pwm_values, sequence_index=args.sequence_index)
@@ -931,12 +1583,12 @@ def handle_fan(args: argparse.Namespace) -> None:
         if args.mac:
             controller_targets = [args.mac]
         else:
-            with wireless.WirelessTransceiver() as tx:
+            with _open_transceiver(args) as tx:
                 snapshot = tx.list_devices()
             controller_targets = [dev.mac for dev in snapshot.devices if dev.is_bound]
             if not controller_targets:
                 raise SystemExit("No bound wireless devices found")
-        interval = max(args.interval, 0.1)
+        interval = max(args.interval, wireless.MIN_SYNC_INTERVAL)
         try:
             tlcontroller.set_motherboard_rpm_sync(True)
             status = "once" if args.once else "running"
@@ -960,11 +1612,19 @@ def handle_fan(args: argparse.Namespace) -> None:
             _emit_output(args, controller_payload, text=text)
             max_cycles = None
             stop_after_first_send = bool(args.once)
+            sync_kwargs: Dict[str, Any] = {}
+            if not args.no_daemon and daemon.ping() is not None:
+                sync_kwargs["transceiver_factory"] = daemon.DaemonTransceiver
+            if args.deadband is not None:
+                sync_kwargs["deadband"] = args.deadband
+            if args.min_send_interval is not None:
+                sync_kwargs["min_send_interval"] = args.min_send_interval
             wireless.run_pwm_sync_loop(
                 controller_targets,
                 interval=interval,
                 max_cycles=max_cycles,
                 stop_after_first_send=stop_after_first_send,
+                **sync_kwargs,
             )
             return
         except wireless.WirelessError as exc:
@@ -973,6 +1633,145 @@ def handle_fan(args: argparse.Namespace) -> None:
     raise SystemExit("Unknown fan command")
 
 
+def handle_cache(args: argparse.Namespace) -> None:
+    cache = effect_cache.EffectCache()
+    if args.command == "list":
+        entries = [
+            {
+                "effect": entry.key.effect,
+                "scope": _tb_to_scope(entry.key.tb),
+                "fans": entry.key.fan_slots,
+                "brightness": entry.key.brightness,
+                "direction": entry.key.direction,
+                "frames": entry.total_frames,
+                "bytes": entry.size,
+                "last_used": entry.last_used,
+            }
+            for entry in cache.entries()
+        ]
+        if not entries:
+            _emit_output(
+                args,
+                {"directory": str(cache.directory), "entries": []},
+                text=f"No cached TL effects in {cache.directory}",
+            )
+            return
+        _emit_output(
+            args,
+            {"directory": str(cache.directory), "entries": entries},
+            text="\n".join(json.dumps(entry) for entry in entries),
+        )
+        return
+
+    if args.command == "purge":
+        removed = cache.purge()
+        _emit_output(
+            args,
+            {"directory": str(cache.directory), "removed": removed},
+            text=f"Removed {removed} cached TL effect(s) from {cache.directory}",
+        )
+        return
+
+    if args.command == "warm":
+        if args.effect:
+            effects = [tl_effects.TLEffects[name.upper()] for name in args.effect]
+        else:
+            effects = list(tl_effects.TLEffects)
+        fan_counts = sorted(set(args.fans)) if args.fans else [4]
+        brightness = max(0, min(255, args.effect_brightness))
+        direction = int(args.effect_direction)
+        tb = _scope_to_tb(args.effect_scope)
+        warmed = 0
+        try:
+            for effect in effects:
+                for fans in fan_counts:
+                    wireless.compile_led_effect(
+                        effect,
+                        tb=tb,
+                        fan_slots=fans,
+                        brightness=brightness,
+                        direction=direction,
+                        cache=cache,
+                    )
+                    warmed += 1
+        except wireless.WirelessError as exc:
+            raise SystemExit(str(exc))
+        _emit_output(
+            args,
+            {
+                "directory": str(cache.directory),
+                "warmed": warmed,
+                "effects": [effect.name for effect in effects],
+                "fans": fan_counts,
+            },
+            text=f"Cached {warmed} TL effect payload(s) in {cache.directory}",
+        )
+        return
+
+    raise SystemExit("Unknown cache command")
+
+
+def handle_daemon(args: argparse.Namespace) -> None:
+    socket_path = args.socket or daemon.default_socket_path()
+    if args.command == "run":
+        led_cache = None if args.no_cache else effect_cache.EffectCache()
+        pacing = (
+            rf_pacing.PacingStore()
+            if rf_pacing.adaptive_enabled(args.rf_pacing)
+            else None
+        )
+        server = daemon.TransceiverDaemon(
+            socket_path, effect_cache=led_cache, pacing=pacing
+        )
+        _emit_output(
+            args,
+            {"status": "running", "socket": str(socket_path)},
+            text=f"uws daemon listening on {socket_path}. Press Ctrl+C to stop.",
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("uws daemon stopped.")
+        except (OSError, wireless.WirelessError) as exc:
+            raise SystemExit(str(exc))
+        return
+
+    if args.command == "status":
+        status = daemon.ping(socket_path)
+        if status is None:
+            _emit_output(
+                args,
+                {"running": False, "socket": str(socket_path)},
+                text=f"No uws daemon listening on {socket_path}",
+            )
+        else:
+            _emit_output(
+                args,
+                dict(status, running=True, socket=str(socket_path)),
+                text=f"uws daemon {status.get('version')} (pid {status.get('pid')}) "
+                f"listening on {socket_path}",
+            )
+        return
+
+    if args.command == "stop":
+        try:
+            stopped = daemon.stop(socket_path)
+        except wireless.WirelessError as exc:
+            raise SystemExit(str(exc))
+        _emit_output(
+            args,
+            {"stopped": stopped, "socket": str(socket_path)},
+            text=(
+                f"Stopped uws daemon on {socket_path}"
+                if stopped
+                else f"No uws daemon listening on {socket_path}"
+            ),
+        )
+        return
+
+    raise SystemExit("Unknown daemon command")
+
+
 def main(argv: Iterable[str] | None = None) -> None:
     parser = build_parser()
     args = parser.parse_args(list(argv) if argv is not None else None)
@@ -984,6 +1783,10 @@ def main(argv: Iterable[str] | None = None) -> None:
         handle_lcd(args)
     elif args.namespace == "fan":
         handle_fan(args)
+    elif args.namespace == "cache":
+        handle_cache(args)
+    elif args.namespace == "daemon":
+        handle_daemon(args)
     else:
         raise SystemExit("Unknown namespace")
 
@@ -0,0 +1,680 @@
+"""Long-lived transceiver session exposed over a local Unix domain socket.
+
+``uws daemon run`` keeps the RF sender/receiver claimed and serves the
+wireless operations through a newline-delimited JSON protocol::
+
+    -> {"method": "set_pwm", "params": {"mac": "...", "pwm_values": [...]}}
+    <- {"ok": true, "result": null}
+    <- {"ok": false, "error": "...", "error_type": "WirelessError"}
+
+:class:`DaemonTransceiver` mirrors the :class:`WirelessTransceiver` methods
+used by the CLI, so commands can route through a running daemon instead of
+opening the USB dongles themselves.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, cast
+
+from . import __version__
+from .effect_cache import EffectCache
+from .rf_pacing import PacingStore
+from .structs import WirelessDeviceInfo
+from .tl_effects import TLEffects
+from .usbutil import USBError
+from .wireless import (
+    PWMSendResult,
+    WirelessError,
+    WirelessSnapshot,
+    WirelessTransceiver,
+)
+
+__all__ = [
+    "DaemonError",
+    "DaemonTransceiver",
+    "SOCKET_ENV",
+    "TransceiverDaemon",
+    "connect",
+    "default_socket_path",
+    "ping",
+    "stop",
+]
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV = "UWS_DAEMON_SOCKET"
+DEFAULT_TIMEOUT = 60.0
+
+_MAX_REQUEST_BYTES = 4 * 1024 * 1024
+
+
+class DaemonError(WirelessError):
+    """Raised when the daemon cannot be reached or rejects a request."""
+
+
+def default_socket_path() -> Path:
+    """Return the control socket path (``UWS_DAEMON_SOCKET`` overrides it)."""
+
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override).expanduser()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "uwscli.sock"
+    return Path(tempfile.gettempdir()) / f"uwscli-{os.getuid()}.sock"
+
+
+# --- Wire format helpers ---
+
+
+def device_to_dict(device: WirelessDeviceInfo) -> Dict[str, Any]:
+    return {
+        "mac": device.mac,
+        "master_mac": device.master_mac,
+        "channel": device.channel,
+        "rx_type": device.rx_type,
+        "device_type": device.device_type,
+        "fan_count": device.fan_count,
+        "pwm_values": list(device.pwm_values),
+        "fan_rpm": list(device.fan_rpm),
+        "command_sequence": device.command_sequence,
+        "raw": device.raw.hex(),
+    }
+
+
+def device_from_dict(data: Dict[str, Any]) -> WirelessDeviceInfo:
+    try:
+        return WirelessDeviceInfo(
+            mac=str(data["mac"]),
+            master_mac=str(data["master_mac"]),
+            channel=int(data["channel"]),
+            rx_type=int(data["rx_type"]),
+            device_type=int(data["device_type"]),
+            fan_count=int(data["fan_count"]),
+            pwm_values=cast(
+                Tuple[int, int, int, int], tuple(int(v) for v in data["pwm_values"])
+            ),
+            fan_rpm=cast(
+                Tuple[int, int, int, int], tuple(int(v) for v in data["fan_rpm"])
+            ),
+            command_sequence=int(data["command_sequence"]),
+            raw=bytes.fromhex(data.get("raw", "")),
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise DaemonError(f"Malformed device record: {exc}") from exc
+
+
+def snapshot_to_dict(snapshot: WirelessSnapshot) -> Dict[str, Any]:
+    return {
+        "devices": [device_to_dict(dev) for dev in snapshot.devices],
+        "raw": snapshot.raw.hex(),
+    }
+
+
+def snapshot_from_dict(data: Dict[str, Any]) -> WirelessSnapshot:
+    return WirelessSnapshot(
+        devices=[device_from_dict(dev) for dev in data.get("devices", [])],
+        raw=bytes.fromhex(data.get("raw", "")),
+    )
+
+
+def _colour(value: Any) -> Tuple[int, int, int]:
+    red, green, blue = (int(component) for component in value)
+    return red, green, blue
+
+
+# --- Server ---
+
+
+class TransceiverDaemon:
+    """Serve wireless operations from a single, long-lived transceiver.
+
+    Requests are serialised through a lock so concurrent clients never
+    interleave RF traffic. The transceiver is opened on first use and
+    reopened after USB-level failures.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        *,
+        transceiver_factory: Optional[Callable[[], Any]] = None,
+        effect_cache: Optional[EffectCache] = None,
+        pacing: Optional[PacingStore] = None,
+    ) -> None:
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self._effect_cache = effect_cache
+        self._factory = transceiver_factory or (
+            lambda: WirelessTransceiver(effect_cache=self._effect_cache, pacing=pacing)
+        )
+        self._transceiver: Any = None
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.BaseServer] = None
+        self._handlers: Dict[str, Callable[[Any, Dict[str, Any]], Any]] = {
+            "list_devices": self._list_devices,
+            "cached_snapshot": self._cached_snapshot,
+            "poll_motherboard_pwm": self._poll_motherboard_pwm,
+            "query_master_mac": self._query_master_mac,
+            "set_pwm": self._set_pwm,
+            "set_pwm_direct": self._set_pwm_direct,
+            "set_pwm_many": self._set_pwm_many,
+            "set_led_static": self._set_led_static,
+            "set_led_rainbow": self._set_led_rainbow,
+            "set_led_effect": self._set_led_effect,
+            "set_led_frames": self._set_led_frames,
+            "bind_device": self._bind_device,
+            "unbind_device": self._unbind_device,
+        }
+
+    def serve_forever(self) -> None:
+        self._prepare_socket_path()
+        daemon = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                while True:
+                    line = self.rfile.readline(_MAX_REQUEST_BYTES)
+                    if not line:
+                        return
+                    response = daemon.handle_request_line(line)
+                    self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+        class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        previous_umask = os.umask(0o177)
+        try:
+            server = _Server(str(self.socket_path), _Handler)
+        finally:
+            os.umask(previous_umask)
+        self._server = server
+        logger.info("uws daemon listening on %s", self.socket_path)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self._server = None
+            with contextlib.suppress(OSError):
+                self.socket_path.unlink()
+            self.close()
+            logger.info("uws daemon stopped")
+
+    def shutdown(self) -> None:
+        server = self._server
+        if server is not None:
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop_transceiver()
+
+    def handle_request_line(self, line: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(line.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            return _error_response("Malformed request", "DaemonError")
+        if not isinstance(request, dict):
+            return _error_response("Malformed request", "DaemonError")
+        return self.handle_request(request)
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request.get("method")
+        params = request.get("params") or {}
+        if method == "ping":
+            return {"ok": True, "result": {"pid": os.getpid(), "version": __version__}}
+        if method == "shutdown":
+            self.shutdown()
+            return {"ok": True, "result": None}
+        handler = self._handlers.get(cast(str, method))
+        if handler is None or not isinstance(params, dict):
+            return _error_response(f"Unknown method {method!r}", "DaemonError")
+        with self._lock:
+            try:
+                if self._transceiver is None:
+                    self._transceiver = self._factory()
+                result = handler(self._transceiver, params)
+            except USBError as exc:
+                logger.warning("USB failure while handling %s: %s", method, exc)
+                self._drop_transceiver()
+                return _error_response(str(exc), "WirelessError")
+            except WirelessError as exc:
+                return _error_response(str(exc), "WirelessError")
+            except (KeyError, TypeError, ValueError) as exc:
+                return _error_response(
+                    f"Invalid parameters for {method}: {exc}", "DaemonError"
+                )
+            except Exception as exc:
+                # Keep the connection alive and report the failure instead of
+                # letting it kill the handler thread.
+                logger.exception("Unexpected failure while handling %s", method)
+                self._drop_transceiver()
+                return _error_response(
+                    f"uws daemon failed to handle {method}: {exc}", "DaemonError"
+                )
+        return {"ok": True, "result": result}
+
+    def _drop_transceiver(self) -> None:
+        if self._transceiver is not None:
+            with contextlib.suppress(Exception):
+                self._transceiver.close()
+            self._transceiver = None
+
+    def _prepare_socket_path(self) -> None:
+        path = self.socket_path
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return
+        if not stat.S_ISSOCK(path.stat().st_mode):
+            raise DaemonError(f"{path} exists and is not a socket")
+        if ping(path) is not None:
+            raise DaemonError(f"uws daemon already running on {path}")
+        logger.debug("Removing stale daemon socket %s", path)
+        path.unlink()
+
+    # --- Method handlers ---
+
+    @staticmethod
+    def _list_devices(tx: Any, params: Dict[str, Any]) -> Any:
+        return snapshot_to_dict(tx.list_devices())
+
+    @staticmethod
+    def _cached_snapshot(tx: Any, params: Dict[str, Any]) -> Any:
+        return snapshot_to_dict(tx.cached_snapshot())
+
+    @staticmethod
+    def _poll_motherboard_pwm(tx: Any, params: Dict[str, Any]) -> Any:
+        return tx.poll_motherboard_pwm()
+
+    @staticmethod
+    def _query_master_mac(tx: Any, params: Dict[str, Any]) -> Any:
+        result = tx.query_master_mac(channel=params.get("channel"))
+        return list(result) if result else None
+
+    @staticmethod
+    def _set_pwm(tx: Any, params: Dict[str, Any]) -> Any:
+        tx.set_pwm(
+            params["mac"],
+            [int(v) for v in params["pwm_values"]],
+            sequence_index=int(params.get("sequence_index", 1)),
+        )
+
+    @staticmethod
+    def _set_pwm_direct(tx: Any, params: Dict[str, Any]) -> Any:
+        tx.set_pwm_direct(
+            device_from_dict(params["target"]),
+            [int(v) for v in params["pwm_values"]],
+            sequence_index=int(params.get("sequence_index", 1)),
+            label=params.get("label"),
+        )
+
+    @staticmethod
+    def _set_pwm_many(tx: Any, params: Dict[str, Any]) -> Any:
+        chunk_interval = params.get("chunk_interval")
+        results = tx.set_pwm_many(
+            {
+                str(mac): [int(v) for v in values]
+                for mac, values in params["targets"].items()
+            },
+            sequence_index=int(params.get("sequence_index", 1)),
+            chunk_interval=(
+                None if chunk_interval is None else float(chunk_interval)
+            ),
+        )
+        return [asdict(result) for result in results]
+
+    @staticmethod
+    def _set_led_static(tx: Any, params: Dict[str, Any]) -> Any:
+        color = params.get("color")
+        color_list = params.get("color_list")
+        tx.set_led_static(
+            params["mac"],
+            _colour(color) if color is not None else None,
+            color_list=[_colour(c) for c in color_list] if color_list else None,
+            broadcast=bool(params.get("broadcast", False)),
+        )
+
+    @staticmethod
+    def _set_led_rainbow(tx: Any, params: Dict[str, Any]) -> Any:
+        tx.set_led_rainbow(
+            params["mac"],
+            frames=int(params.get("frames", 24)),
+            interval_ms=int(params.get("interval_ms", 50)),
+            broadcast=bool(params.get("broadcast", False)),
+        )
+
+    @staticmethod
+    def _set_led_effect(tx: Any, params: Dict[str, Any]) -> Any:
+        interval_ms = params.get("interval_ms", 50)
+        tb = params.get("tb", 0)
+        tx.set_led_effect(
+            params["mac"],
+            TLEffects[str(params["effect"]).upper()],
+            tb=None if tb is None else int(tb),
+            brightness=int(params.get("brightness", 255)),
+            direction=int(params.get("direction", 1)),
+            interval_ms=None if interval_ms is None else int(interval_ms),
+            broadcast=bool(params.get("broadcast", False)),
+            use_cache=bool(params.get("use_cache", True)),
+        )
+
+    @staticmethod
+    def _set_led_frames(tx: Any, params: Dict[str, Any]) -> Any:
+        frames = [[_colour(c) for c in frame] for frame in params["frames"]]
+        tx.set_led_frames(
+            params["mac"],
+            frames,
+            interval_ms=int(params.get("interval_ms", 50)),
+            broadcast=bool(params.get("broadcast", False)),
+        )
+
+    @staticmethod
+    def _bind_device(tx: Any, params: Dict[str, Any]) -> Any:
+        rx_type = params.get("rx_type")
+        device = tx.bind_device(
+            params["mac"],
+            master_mac=params.get("master_mac"),
+            rx_type=None if rx_type is None else int(rx_type),
+        )
+        return device_to_dict(device) if device else None
+
+    @staticmethod
+    def _unbind_device(tx: Any, params: Dict[str, Any]) -> Any:
+        device = tx.unbind_device(params["mac"])
+        return device_to_dict(device) if device else None
+
+
+def _error_response(message: str, error_type: str) -> Dict[str, Any]:
+    return {"ok": False, "error": message, "error_type": error_type}
+
+
+# --- Client ---
+
+
+class DaemonTransceiver:
+    """Client-side stand-in for :class:`WirelessTransceiver` backed by the daemon."""
+
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        use_effect_cache: bool = True,
+    ) -> None:
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.use_effect_cache = use_effect_cache
+        _check_socket_owner(self.socket_path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError as exc:
+            sock.close()
+            raise DaemonError(
+                f"Unable to reach uws daemon at {self.socket_path}: {exc}"
+            ) from exc
+        self._sock = sock
+        self._stream = sock.makefile("rwb")
+
+    def close(self) -> None:
+        with contextlib.suppress(OSError):
+            self._stream.close()
+        with contextlib.suppress(OSError):
+            self._sock.close()
+
+    def __enter__(self) -> "DaemonTransceiver":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def call(self, method: str, **params: Any) -> Any:
+        message = json.dumps({"method": method, "params": params}).encode("utf-8")
+        try:
+            self._stream.write(message + b"\n")
+            self._stream.flush()
+            line = self._stream.readline(_MAX_REQUEST_BYTES)
+        except OSError as exc:
+            raise DaemonError(f"uws daemon request {method} failed: {exc}") from exc
+        if not line:
+            raise DaemonError("uws daemon closed the connection")
+        try:
+            response = json.loads(line.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError) as exc:
+            raise DaemonError("Malformed response from uws daemon") from exc
+        if response.get("ok"):
+            return response.get("result")
+        message_text = str(response.get("error") or "uws daemon request failed")
+        if response.get("error_type") == "WirelessError":
+            raise WirelessError(message_text)
+        raise DaemonError(message_text)
+
+    # --- WirelessTransceiver API ---
+
+    def list_devices(self) -> WirelessSnapshot:
+        return snapshot_from_dict(self.call("list_devices"))
+
+    def cached_snapshot(self) -> WirelessSnapshot:
+        return snapshot_from_dict(self.call("cached_snapshot"))
+
+    def poll_motherboard_pwm(self) -> Optional[int]:
+        result = self.call("poll_motherboard_pwm")
+        return None if result is None else int(result)
+
+    def query_master_mac(
+        self, *, channel: Optional[int] = None
+    ) -> Optional[Tuple[str, Optional[int]]]:
+        result = self.call("query_master_mac", channel=channel)
+        if not result:
+            return None
+        return str(result[0]), result[1]
+
+    def set_pwm(
+        self, mac: str, pwm_values: Sequence[int], *, sequence_index: int = 1
+    ) -> None:
+        self.call(
+            "set_pwm",
+            mac=mac,
+            pwm_values=list(pwm_values),
+            sequence_index=sequence_index,
+        )
+
+    def set_pwm_direct(
+        self,
+        target: WirelessDeviceInfo,
+        pwm_values: Sequence[int],
+        *,
+        sequence_index: int = 1,
+        label: Optional[str] = None,
+    ) -> None:
+        self.call(
+            "set_pwm_direct",
+            target=device_to_dict(target),
+            pwm_values=list(pwm_values),
+            sequence_index=sequence_index,
+            label=label,
+        )
+
+    def set_pwm_many(
+        self,
+        targets: Mapping[str, Sequence[int]],
+        *,
+        sequence_index: int = 1,
+        chunk_interval: Optional[float] = None,
+    ) -> List[PWMSendResult]:
+        results = self.call(
+            "set_pwm_many",
+            targets={mac: list(values) for mac, values in targets.items()},
+            sequence_index=sequence_index,
+            chunk_interval=chunk_interval,
+        )
+        return [
+            PWMSendResult(
+                mac=item["mac"],
+                pwm_values=cast(Tuple[int, int, int, int], tuple(item["pwm_values"])),
+                offset_ms=float(item["offset_ms"]),
+                duration_ms=float(item["duration_ms"]),
+            )
+            for item in results
+        ]
+
+    def set_led_static(
+        self,
+        mac: str,
+        color: Optional[Tuple[int, int, int]],
+        *,
+        color_list: Optional[Sequence[Tuple[int, int, int]]] = None,
+        broadcast: bool = False,
+    ) -> None:
+        self.call(
+            "set_led_static",
+            mac=mac,
+            color=list(color) if color is not None else None,
+            color_list=[list(c) for c in color_list] if color_list else None,
+            broadcast=broadcast,
+        )
+
+    def set_led_rainbow(
+        self,
+        mac: str,
+        *,
+        frames: int = 24,
+        interval_ms: int = 50,
+        broadcast: bool = False,
+    ) -> None:
+        self.call(
+            "set_led_rainbow",
+            mac=mac,
+            frames=frames,
+            interval_ms=interval_ms,
+            broadcast=broadcast,
+        )
+
+    def set_led_effect(
+        self,
+        mac: str,
+        effect: TLEffects,
+        *,
+        tb: Optional[int] = 0,
+        brightness: int = 255,
+        direction: int = 1,
+        interval_ms: Optional[int] = 50,
+        broadcast: bool = False,
+        use_cache: bool = True,
+    ) -> None:
+        self.call(
+            "set_led_effect",
+            mac=mac,
+            effect=effect.name,
+            tb=tb,
+            brightness=brightness,
+            direction=direction,
+            interval_ms=interval_ms,
+            broadcast=broadcast,
+            use_cache=self.use_effect_cache and use_cache,
+        )
+
+    def set_led_frames(
+        self,
+        mac: str,
+        frames: Sequence[Sequence[Tuple[int, int, int]]],
+        *,
+        interval_ms: int = 50,
+        broadcast: bool = False,
+    ) -> None:
+        self.call(
+            "set_led_frames",
+            mac=mac,
+            frames=[[list(c) for c in frame] for frame in frames],
+            interval_ms=interval_ms,
+            broadcast=broadcast,
+        )
+
+    def bind_device(
+        self,
+        mac: str,
+        *,
+        master_mac: Optional[str] = None,
+        rx_type: Optional[int] = None,
+    ) -> Optional[WirelessDeviceInfo]:
+        result = self.call(
+            "bind_device", mac=mac, master_mac=master_mac, rx_type=rx_type
+        )
+        return device_from_dict(result) if result else None
+
+    def unbind_device(self, mac: str) -> Optional[WirelessDeviceInfo]:
+        result = self.call("unbind_device", mac=mac)
+        return device_from_dict(result) if result else None
+
+
+def _check_socket_owner(path: Path) -> None:
+    """Refuse sockets not created by the current user.
+
+    The fallback path lives in the shared temporary directory, where any
+    local user could pre-create it and impersonate the daemon.
+    """
+
+    try:
+        info = os.lstat(path)
+    except OSError as exc:
+        raise DaemonError(f"Unable to reach uws daemon at {path}: {exc}") from exc
+    if not stat.S_ISSOCK(info.st_mode):
+        raise DaemonError(f"{path} is not a socket")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        logger.warning(
+            "Ignoring %s: owned by uid %d, not the current user", path, info.st_uid
+        )
+        raise DaemonError(f"{path} is owned by another user")
+
+
+def ping(
+    socket_path: Optional[Path] = None, *, timeout: float = 1.0
+) -> Optional[Dict[str, Any]]:
+    """Return daemon status, or None when no daemon answers on ``socket_path``."""
+
+    path = Path(socket_path) if socket_path else default_socket_path()
+    if not path.exists():
+        return None
+    try:
+        with DaemonTransceiver(path, timeout=timeout) as client:
+            return cast(Dict[str, Any], client.call("ping"))
+    except WirelessError:
+        return None
+
+
+def connect(
+    socket_path: Optional[Path] = None, *, use_effect_cache: bool = True
+) -> Optional[DaemonTransceiver]:
+    """Connect to a running daemon, returning None when none is listening."""
+
+    path = Path(socket_path) if socket_path else default_socket_path()
+    if not path.exists():
+        return None
+    try:
+        return DaemonTransceiver(path, use_effect_cache=use_effect_cache)
+    except DaemonError as exc:
+        logger.debug("Not using uws daemon: %s", exc)
+        return None
+
+
+def stop(socket_path: Optional[Path] = None) -> bool:
+    """Ask a running daemon to exit. Returns False when none was running."""
+
+    client = connect(socket_path)
+    if client is None:
+        return False
+    with client:
+        client.call("shutdown")
+    return True
+
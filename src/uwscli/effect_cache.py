@@ -0,0 +1,247 @@
+"""Persistent on-disk cache of compressed TL effect payloads."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from . import __version__
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+CACHE_DIR_ENV = "UWS_CACHE_DIR"
+
+_ENTRY_SUFFIX = ".uzc"
+_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class EffectCacheKey:
+    """Parameters that fully determine a compressed TL effect stream."""
+
+    effect: str
+    tb: Optional[int]
+    fan_slots: int
+    brightness: int
+    direction: int
+    led_count: int
+    dict_size: int
+
+    def as_dict(self) -> dict:
+        return {
+            "effect": self.effect,
+            "tb": self.tb,
+            "fan_slots": self.fan_slots,
+            "brightness": self.brightness,
+            "direction": self.direction,
+            "led_count": self.led_count,
+            "dict_size": self.dict_size,
+        }
+
+    def digest(self) -> str:
+        material = dict(self.as_dict(), version=__version__, format=_FORMAT_VERSION)
+        encoded = json.dumps(material, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+
+@dataclass(frozen=True)
+class CompressedEffect:
+    """TinyUZ stream plus the frame geometry needed to transmit it."""
+
+    payload: bytes
+    led_count: int
+    total_frames: int
+
+
+@dataclass(frozen=True)
+class EffectCacheEntry:
+    key: EffectCacheKey
+    path: Path
+    size: int
+    total_frames: int
+    last_used: float
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory used for effect payloads."""
+
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+    if sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "uwscli" / "effects"
+
+
+class EffectCache:
+    """Content-addressed store of compressed effects with size-bounded LRU eviction.
+
+    Each entry is a single file holding a JSON header line followed by the
+    TinyUZ stream. Recency is tracked through the file modification time,
+    which is refreshed on every hit. Filesystem errors never propagate: a
+    failing cache simply behaves like an empty one.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_bytes = max(0, int(max_bytes))
+
+    def get(self, key: EffectCacheKey) -> Optional[CompressedEffect]:
+        path = self._path_for(key)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            logger.debug("Effect cache read failed for %s: %s", path, exc)
+            return None
+        parsed = _parse_entry(raw)
+        if parsed is None or parsed[0].get("digest") != key.digest():
+            logger.debug("Discarding malformed effect cache entry %s", path)
+            with contextlib.suppress(OSError):
+                path.unlink()
+            return None
+        header, payload = parsed
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        logger.debug("Effect cache hit for %s (%d bytes)", key.effect, len(payload))
+        return CompressedEffect(
+            payload=payload,
+            led_count=int(header["stream_leds"]),
+            total_frames=int(header["total_frames"]),
+        )
+
+    def put(self, key: EffectCacheKey, effect: CompressedEffect) -> None:
+        header = dict(
+            key.as_dict(),
+            digest=key.digest(),
+            total_frames=effect.total_frames,
+            stream_leds=effect.led_count,
+            payload_len=len(effect.payload),
+        )
+        data = json.dumps(header, sort_keys=True).encode("utf-8") + b"\n"
+        data += effect.payload
+        if self.max_bytes and len(data) > self.max_bytes:
+            return
+        path = self._path_for(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp_name, path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+                raise
+        except OSError as exc:
+            logger.debug("Effect cache write failed for %s: %s", path, exc)
+            return
+        self._evict()
+
+    def entries(self) -> List[EffectCacheEntry]:
+        entries: List[EffectCacheEntry] = []
+        for path, stat in self._scan():
+            try:
+                with path.open("rb") as handle:
+                    header_line = handle.readline()
+                header = json.loads(header_line.decode("utf-8"))
+                key = EffectCacheKey(
+                    effect=header["effect"],
+                    tb=header["tb"],
+                    fan_slots=int(header["fan_slots"]),
+                    brightness=int(header["brightness"]),
+                    direction=int(header["direction"]),
+                    led_count=int(header["led_count"]),
+                    dict_size=int(header["dict_size"]),
+                )
+                total_frames = int(header["total_frames"])
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            entries.append(
+                EffectCacheEntry(
+                    key=key,
+                    path=path,
+                    size=stat.st_size,
+                    total_frames=total_frames,
+                    last_used=stat.st_mtime,
+                )
+            )
+        entries.sort(key=lambda entry: entry.last_used, reverse=True)
+        return entries
+
+    def purge(self) -> int:
+        removed = 0
+        for path, _ in self._scan():
+            try:
+                path.unlink()
+            except OSError as exc:
+                logger.debug("Unable to remove effect cache entry %s: %s", path, exc)
+                continue
+            removed += 1
+        return removed
+
+    def total_bytes(self) -> int:
+        return sum(stat.st_size for _, stat in self._scan())
+
+    def _evict(self) -> None:
+        if not self.max_bytes:
+            return
+        files = sorted(self._scan(), key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in files)
+        for path, stat in files:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
+                total -= stat.st_size
+                logger.debug("Evicted effect cache entry %s", path.name)
+
+    def _scan(self) -> List[Tuple[Path, os.stat_result]]:
+        results: List[Tuple[Path, os.stat_result]] = []
+        try:
+            candidates = list(self.directory.glob(f"*{_ENTRY_SUFFIX}"))
+        except OSError:
+            return results
+        for path in candidates:
+            with contextlib.suppress(OSError):
+                results.append((path, path.stat()))
+        return results
+
+    def _path_for(self, key: EffectCacheKey) -> Path:
+        return self.directory / f"{key.digest()}{_ENTRY_SUFFIX}"
+
+
+def _parse_entry(raw: bytes) -> Optional[Tuple[dict, bytes]]:
+    header_end = raw.find(b"\n")
+    if header_end < 0:
+        return None
+    try:
+        header = json.loads(raw[:header_end].decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    payload = raw[header_end + 1 :]
+    if not isinstance(header, dict) or header.get("payload_len") != len(payload):
+        return None
+    if "stream_leds" not in header or "total_frames" not in header:
+        return None
+    return header, payload
+
@@ -4,37 +4,54 @@ from __future__ import annotations
 
 import contextlib
 import dataclasses
-import datetime
 import enum
+import functools
+import io
+import logging
+import math
+import mmap
+import os
+import stat
+import threading
 import time
-from typing import Any, Dict, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from .structs import LCDControlMode, LCDControlSetting, ScreenRotation
-from .system_usb import find_devices_by_vid_pid
+from .system_usb import find_devices_by_vid_pid, register_usb_ids
 from .usbutil import USBEndpointDevice, USBError
 
 import hid
 
 DES: Any
-Padding: Any
 
 try:  # Prefer the namespace-safe module
     from Cryptodome.Cipher import DES as _CryptodomeDES
-    from Cryptodome.Util import Padding as _CryptodomePadding
 
     DES = _CryptodomeDES
-    Padding = _CryptodomePadding
 except ImportError:  # pragma: no cover - fallback for alternative install
     try:
         from Crypto.Cipher import DES as _CryptoDES
-        from Crypto.Util import Padding as _CryptoPadding
 
         DES = _CryptoDES
-        Padding = _CryptoPadding
     except ImportError:  # pragma: no cover - handled at runtime
         DES = None
-        Padding = None
 
+logger = logging.getLogger(__name__)
 
 LCD_REPORT_ID = 0x02
 OUTPUT_PACKET_SIZE = 512
@@ -42,17 +59,72 @@ INPUT_PACKET_SIZE = 64
 USB_INPUT_PACKET_SIZE = OUTPUT_PACKET_SIZE
 MAX_CHUNK = 501
 
+# A wireless panel handshaken or written to within this many seconds is
+# considered awake; past it the next command handshakes first.
+AWAKE_WINDOW = 2.0
+
+# HID/USB panels acknowledge every report of a multi-report command; up to
+# this many reports are written ahead of their acknowledgements.
+DEFAULT_ACK_WINDOW = 8
+
 # Known Uni Fan LCD VID/PID combinations (original and TL V2 wireless receiver)
 KNOWN_LCD_IDS = (
     (0x04FC, 0x7393),
     (0x1CBE, 0x0006),
 )
+register_usb_ids(KNOWN_LCD_IDS)
 
 
 class LCDDeviceError(RuntimeError):
     """Raised when HID operations fail."""
 
 
+class _AckError(LCDDeviceError):
+    """A report was not acknowledged as expected."""
+
+
+_Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+# Upload payloads: any buffer (bytes, memoryview, mmap) or a binary file
+# object positioned at the start of the data.
+LCDPayload = Union[_Buffer, BinaryIO]
+
+
+@contextlib.contextmanager
+def _payload_buffer(payload: LCDPayload) -> Iterator[_Buffer]:
+    """Expose ``payload`` as a buffer for the duration of one upload.
+
+    Regular files are memory-mapped from their current position, so the
+    data is paged in as packets are built instead of being read up front.
+    Pipes and other unmappable streams are read to the end.
+    """
+
+    if isinstance(payload, (bytes, bytearray, mmap.mmap)):
+        yield payload
+        return
+    if isinstance(payload, memoryview):
+        yield payload if payload.format == "B" else payload.cast("B")
+        return
+    try:
+        fileno = payload.fileno()
+        offset = payload.tell()
+        info = os.fstat(fileno)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        info = None
+    if info is None or not stat.S_ISREG(info.st_mode) or info.st_size <= offset:
+        yield payload.read()
+        return
+    mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)[offset:]
+    try:
+        yield view
+    finally:
+        view.release()
+        # Views created while packetizing may outlive a failed upload
+        # (held by its traceback); the mapping is then closed on collection.
+        with contextlib.suppress(BufferError):
+            mapped.close()
+
+
 @dataclasses.dataclass
 class HidDeviceInfo:
     path: str
@@ -127,12 +199,39 @@ class WirelessCommand(enum.IntEnum):
     FACTORY_H264_TEST = 253
 
 
+_HEADER_FIELDS_CLEAR = bytes(12)
+
+# Set to 1 to try used-length frame transfers instead of the vendor's fixed
+# 100 KiB buffer; each receiver must show the probe frame before they are kept.
+COMPACT_TRANSFERS_ENV = "UWS_LCD_COMPACT_TRANSFERS"
+
+# Smallest payload transfer each wireless receiver accepted, keyed by
+# (vid, pid, serial, location) and probed on its first frame this process.
+_MIN_TRANSFER_SIZES: Dict[Tuple[int, int, Optional[str], Optional[int]], int] = {}
+
+
+def compact_transfers_enabled() -> bool:
+    """Return True when ``$UWS_LCD_COMPACT_TRANSFERS`` opts into short frames."""
+
+    value = os.environ.get(COMPACT_TRANSFERS_ENV, "").strip().lower()
+    return value in ("1", "true", "yes", "on")
+
+
 class WirelessUSBTransport:
     """Implements the wireless receiver WinUSB protocol used by Uni Fan LCD devices."""
 
     _KEY = b"slv3tuzx"
     _HEADER_SIZE = 512
     _PAYLOAD_BUFFER = 102400
+    # Largest JPEG that fits in one transfer behind the header.
+    MAX_PAYLOAD = _PAYLOAD_BUFFER - _HEADER_SIZE
+    # USB max packet size of the receiver's bulk OUT endpoint; a transfer
+    # that is an exact multiple of it would not end in a short packet.
+    _BULK_PACKET_SIZE = 512
+
+    _transfer: Optional[bytearray] = None
+    _header: Optional[bytearray] = None
+    _dirty_end = 0
 
     def __init__(
         self,
@@ -142,12 +241,16 @@ class WirelessUSBTransport:
         *,
         serial_number: Optional[str] = None,
         location_id: Optional[int] = None,
+        compact_transfers: Optional[bool] = None,
     ) -> None:
         self._vendor_id = vendor_id
         self._product_id = product_id
         self._timeout_ms = timeout_ms
         self._serial_number = serial_number
         self._location_id = location_id
+        if compact_transfers is None:
+            compact_transfers = compact_transfers_enabled()
+        self._compact = compact_transfers
         self._device = USBEndpointDevice(
             vendor_id,
             product_id,
@@ -159,15 +262,14 @@ class WirelessUSBTransport:
             serial_number=serial_number,
             location_id=location_id,
         )
-        utc_midnight = datetime.datetime.utcnow().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        self._epoch = utc_midnight - datetime.timedelta(days=1)
-        self._last_handshake = 0.0
+        # Timestamps count from UTC midnight of the previous day; POSIX days
+        # are exactly 86400 s, so the epoch is plain arithmetic on time().
+        self._epoch = (time.time() // 86400 - 1) * 86400
+        self._last_contact = 0.0
 
     def close(self) -> None:
         self._device.close()
-        self._last_handshake = 0.0
+        self._last_contact = 0.0
 
     def handshake(self) -> Dict[str, int]:
         response = self._send_command(WirelessCommand.GET_POS_INDEX, expect_reply=True)
@@ -177,11 +279,11 @@ class WirelessUSBTransport:
                 if command == WirelessCommand.GET_POS_INDEX:
                     mode = response[8] if len(response) > 8 else 0
                     frame_index = response[9] if len(response) > 9 else 0
-                    self._last_handshake = time.monotonic()
+                    self._last_contact = time.monotonic()
                     return {"mode": mode, "frame_index": frame_index}
                 if command == WirelessCommand.GET_VER:
                     self._parse_version(response)
-                    self._last_handshake = time.monotonic()
+                    self._last_contact = time.monotonic()
                     return {"mode": 0, "frame_index": 0}
             response = self._read_next()
         raise LCDDeviceError("No valid handshake response from wireless LCD")
@@ -191,14 +293,20 @@ class WirelessUSBTransport:
         for _ in range(4):
             if response and response[0] == WirelessCommand.GET_VER:
                 version = self._parse_version(response)
-                self._last_handshake = time.monotonic()
+                self._last_contact = time.monotonic()
                 return {"version": version or "unknown", "build": ""}
             response = self._read_next()
         raise LCDDeviceError("Firmware request did not return expected data")
 
+    def idle_seconds(self) -> float:
+        """Seconds since the receiver last acknowledged or accepted a command."""
+
+        if not self._last_contact:
+            return math.inf
+        return time.monotonic() - self._last_contact
+
     def _ensure_awake(self) -> None:
-        now = time.monotonic()
-        if self._last_handshake and now - self._last_handshake <= 2.0:
+        if self.idle_seconds() <= AWAKE_WINDOW:
             return
         self.handshake()
 
@@ -216,27 +324,28 @@ class WirelessUSBTransport:
             drain_response=True,
         )
 
-    def send_jpg(self, payload: bytes) -> None:
+    def send_jpg(self, payload: LCDPayload) -> None:
         self._ensure_awake()
-        self._send_command(
-            WirelessCommand.PUSH_JPG,
-            payload=payload,
-            expect_reply=False,
-            drain_response=True,
-        )
+        with _payload_buffer(payload) as data:
+            self._send_command(
+                WirelessCommand.PUSH_JPG,
+                payload=data,
+                expect_reply=False,
+                drain_response=True,
+            )
 
-    def send_sync_jpg(self, payload: bytes) -> None:
+    def send_sync_jpg(self, payload: LCDPayload) -> None:
         self.send_jpg(payload)
 
-    def send_boot_jpg(self, payload: bytes) -> None:
+    def send_boot_jpg(self, payload: LCDPayload) -> None:
         self.send_jpg(payload)
 
-    def send_boot_video(self, payload: bytes) -> None:
+    def send_boot_video(self, payload: LCDPayload) -> None:
         raise LCDDeviceError(
             "Boot video upload is not supported for wireless LCD devices"
         )
 
-    def send_avi(self, payload: bytes) -> None:
+    def send_avi(self, payload: LCDPayload) -> None:
         raise LCDDeviceError("AVI streaming is not supported for wireless LCD devices")
 
     def reboot(self) -> None:
@@ -246,31 +355,42 @@ class WirelessUSBTransport:
         )
 
     def _timestamp_ms(self) -> int:
-        delta = datetime.datetime.utcnow() - self._epoch
-        return int(delta.total_seconds() * 1000) & 0xFFFFFFFF
+        return int((time.time() - self._epoch) * 1000) & 0xFFFFFFFF
 
     def _send_command(
         self,
         command: WirelessCommand,
         *,
-        payload: Optional[bytes] = None,
+        payload: Optional[_Buffer] = None,
         single_byte: Optional[int] = None,
         expect_reply: bool = False,
         drain_response: bool = False,
     ) -> bytes:
+        if (
+            payload is not None
+            and not expect_reply
+            and self._compact
+            and self._transfer_key() not in _MIN_TRANSFER_SIZES
+            and self._probe_compact_transfer(command, payload)
+        ):
+            return b""
         packet = self._build_packet(command, payload=payload, single_byte=single_byte)
-        written = self._write_with_recovery(packet)
+        if payload is None:
+            written = self._write_with_recovery(packet)
+        else:
+            packet, written = self._write_payload(packet)
         if written != len(packet):
             raise LCDDeviceError(
                 f"Incomplete wireless USB write ({written}/{len(packet)})"
             )
         if expect_reply:
             return self._device.read(self._HEADER_SIZE)
+        self._last_contact = time.monotonic()
         if drain_response:
             self._drain_optional_response()
         return b""
 
-    def _write_with_recovery(self, packet: bytes) -> int:
+    def _write_with_recovery(self, packet: Union[bytes, bytearray, memoryview]) -> int:
         try:
             return self._device.write(packet)
         except USBError as exc:
@@ -301,47 +421,127 @@ class WirelessUSBTransport:
             serial_number=self._serial_number,
             location_id=self._location_id,
         )
-        self._last_handshake = 0.0
+        self._last_contact = 0.0
         time.sleep(0.05)
 
     def _build_packet(
         self,
         command: WirelessCommand,
         *,
-        payload: Optional[bytes],
+        payload: Optional[_Buffer],
         single_byte: Optional[int],
-    ) -> bytes:
-        header = bytearray(504)
+    ) -> memoryview:
+        """Fill the transport's transfer buffer and return the used prefix.
+
+        The buffer is allocated once per transport: the header is encrypted
+        straight into its first 512 bytes and the payload copied in behind
+        it, so a frame costs one copy of the JPEG and no 100 KiB allocation.
+        The returned view is only valid until the next packet is built.
+        """
+
+        if DES is None:  # pragma: no cover - dependency missing
+            raise LCDDeviceError(
+                "PyCryptodome is required for wireless LCD support. Install with 'pip install pycryptodomex'.",
+            )
+        if payload is not None and len(payload) > self.MAX_PAYLOAD:
+            raise LCDDeviceError("Payload too large for wireless LCD transfer")
+        if self._transfer is None or self._header is None:
+            self._transfer = bytearray(self._PAYLOAD_BUFFER)
+            # 504 bytes of header plus its constant PKCS#7 padding block.
+            self._header = bytearray(504) + bytes([8] * 8)
+        header = self._header
+        header[0:12] = _HEADER_FIELDS_CLEAR
         header[0] = command & 0xFF
         header[2] = 26
         header[3] = 109
         header[4:8] = self._timestamp_ms().to_bytes(4, "little", signed=False)
         if payload is not None:
-            if len(payload) > self._PAYLOAD_BUFFER - self._HEADER_SIZE:
-                raise LCDDeviceError("Payload too large for wireless LCD transfer")
             header[8:12] = len(payload).to_bytes(4, "big", signed=False)
         elif single_byte is not None:
             header[8] = single_byte & 0xFF
-        encrypted_header = self._encrypt(bytes(header))
+
+        view = memoryview(self._transfer)
+        # CBC ciphers carry chaining state, so every header needs a fresh one.
+        cipher = DES.new(self._KEY, DES.MODE_CBC, iv=self._KEY)
+        cipher.encrypt(header, output=view[: self._HEADER_SIZE])
         if payload is None:
-            packet = bytearray(self._HEADER_SIZE)
-            packet[: len(encrypted_header)] = encrypted_header
-            return bytes(packet)
-
-        packet_length = max(self._PAYLOAD_BUFFER, self._HEADER_SIZE + len(payload))
-        packet = bytearray(packet_length)
-        packet[: len(encrypted_header)] = encrypted_header
-        packet[self._HEADER_SIZE : self._HEADER_SIZE + len(payload)] = payload
-        return bytes(packet)
-
-    def _encrypt(self, data: bytes) -> bytes:
-        if DES is None or Padding is None:  # pragma: no cover - dependency missing
-            raise LCDDeviceError(
-                "PyCryptodome is required for wireless LCD support. Install with 'pip install pycryptodomex'.",
+            return view[: self._HEADER_SIZE]
+
+        used = self._HEADER_SIZE + len(payload)
+        view[self._HEADER_SIZE : used] = payload
+        # Keep everything past the payload zeroed, as a fresh buffer would be.
+        if self._dirty_end > used:
+            view[used : self._dirty_end] = bytes(self._dirty_end - used)
+        self._dirty_end = used
+        return view[:used]
+
+    def _transfer_key(self) -> Tuple[int, int, Optional[str], Optional[int]]:
+        return (
+            self._vendor_id,
+            self._product_id,
+            self._serial_number,
+            self._location_id,
+        )
+
+    def _probe_compact_transfer(
+        self, command: WirelessCommand, payload: _Buffer
+    ) -> bool:
+        """Send the first frame at its used length and check the receiver showed it.
+
+        libusb reports a short bulk transfer as written whatever the firmware
+        does with it, so acceptance is judged by the handshake frame index
+        moving past the probe. Returns True when the frame was delivered;
+        otherwise the receiver is remembered as needing full-size transfers.
+        """
+
+        key = self._transfer_key()
+        before = self.handshake()["frame_index"]
+        packet = self._build_packet(command, payload=payload, single_byte=None)
+        view = memoryview(self._transfer)  # type: ignore[arg-type]
+        probe = view[: self._compact_length(len(packet))]
+        try:
+            written = self._device.write(probe)
+            self._drain_optional_response()
+            accepted = (
+                written == len(probe) and self.handshake()["frame_index"] != before
             )
-        padded = Padding.pad(data, 8, style="pkcs7")
-        cipher = DES.new(self._KEY, DES.MODE_CBC, iv=self._KEY)
-        return cipher.encrypt(padded)
+        except (USBError, LCDDeviceError) as exc:
+            logger.debug("Short wireless LCD transfer rejected: %s", exc)
+            self._reset_connection()
+            accepted = False
+        if accepted:
+            _MIN_TRANSFER_SIZES[key] = self._HEADER_SIZE
+            return True
+        logger.info(
+            "Wireless LCD %04x:%04x needs full-size transfers",
+            self._vendor_id,
+            self._product_id,
+        )
+        _MIN_TRANSFER_SIZES[key] = self._PAYLOAD_BUFFER
+        return False
+
+    def _write_payload(self, packet: memoryview) -> Tuple[memoryview, int]:
+        """Write a payload packet padded to what the receiver accepts.
+
+        Frames go out in the full 100 KiB buffer the vendor software always
+        sends, unless compact transfers were enabled and the receiver passed
+        :meth:`_probe_compact_transfer`. Returns the transfer that was
+        written and the byte count reported by libusb.
+        """
+
+        view = memoryview(self._transfer)  # type: ignore[arg-type]
+        minimum = _MIN_TRANSFER_SIZES.get(self._transfer_key(), self._PAYLOAD_BUFFER)
+        if self._compact and minimum < self._PAYLOAD_BUFFER:
+            transfer = view[: self._compact_length(max(len(packet), minimum))]
+        else:
+            transfer = view[: max(len(packet), self._PAYLOAD_BUFFER)]
+        return transfer, self._write_with_recovery(transfer)
+
+    def _compact_length(self, used: int) -> int:
+        # End on a short USB packet so the receiver sees the end of transfer.
+        if used % self._BULK_PACKET_SIZE == 0:
+            return used + 1
+        return used
 
     def _parse_version(self, packet: bytes) -> str:
         raw = packet[8 : 8 + 32]
@@ -362,10 +562,47 @@ class WirelessUSBTransport:
             return b""
 
 
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+# HID/USB panels (vid, pid, serial) that lost acknowledgements with several
+# reports in flight; they are driven lock-step for the rest of the process.
+_LOCKSTEP_PANELS: Set[Tuple[int, int, str]] = set()
+
+
+def _serialized(method: _F) -> _F:
+    @functools.wraps(method)
+    def wrapper(self: "TLLCDDevice", *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
 class TLLCDDevice:
-    """Control a TL LCD panel resolved by its USB serial number."""
+    """Control a TL LCD panel resolved by its USB serial number.
+
+    ``info`` skips the enumeration when the caller already resolved the
+    panel, e.g. when opening many panels from a single device listing.
+    ``ack_window`` bounds how many reports of one command are written
+    before their acknowledgements are read; ``1`` is strict lock-step.
+    """
 
-    def __init__(self, serial: str) -> None:
+    _last_activity = 0.0
+    _ack_window = DEFAULT_ACK_WINDOW
+    _reports: Optional[Tuple[bytearray, bytearray]] = None
+    _panel_key: Optional[Tuple[int, int, str]] = None
+
+    def __init__(
+        self,
+        serial: str,
+        *,
+        info: Optional[HidDeviceInfo] = None,
+        ack_window: int = DEFAULT_ACK_WINDOW,
+    ) -> None:
+        # Serialises I/O so a keep-alive thread can share the device with
+        # the thread pushing frames.
+        self._lock = threading.RLock()
         self._backend = "hid"
         self._hid: Optional[hid.Device] = None
         self._usb: Optional[USBEndpointDevice] = None
@@ -378,9 +615,8 @@ class TLLCDDevice:
         if not normalized:
             raise LCDDeviceError("Serial selector cannot be empty")
 
-        matches = [
-            dev for dev in enumerate_devices() if dev.serial_number == normalized
-        ]
+        candidates = [info] if info is not None else enumerate_devices()
+        matches = [dev for dev in candidates if dev.serial_number == normalized]
         if not matches:
             raise LCDDeviceError(f"No LCD device found with serial {normalized}")
         if len(matches) > 1:
@@ -389,6 +625,8 @@ class TLLCDDevice:
             )
 
         resolved = matches[0]
+        self._ack_window = max(1, ack_window)
+        self._panel_key = (resolved.vendor_id, resolved.product_id, normalized)
         if resolved.source == "hid":
             try:
                 self._hid = hid.Device(path=resolved.path)
@@ -425,6 +663,7 @@ class TLLCDDevice:
         except USBError as exc:
             raise LCDDeviceError(str(exc)) from exc
 
+    @_serialized
     def close(self) -> None:
         if self._backend == "hid" and self._hid is not None:
             with contextlib.suppress(Exception):
@@ -440,62 +679,124 @@ class TLLCDDevice:
     def __enter__(self) -> "TLLCDDevice":
         return self
 
+    def idle_seconds(self) -> float:
+        """Seconds since the panel last completed a command (``inf`` if never)."""
+
+        if self._backend == "wireless" and self._wireless is not None:
+            return self._wireless.idle_seconds()
+        if not self._last_activity:
+            return math.inf
+        return time.monotonic() - self._last_activity
+
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
 
-    def _build_packets(self, command: int, data: bytes) -> Iterator[bytes]:
-        data_length = len(data)
+    def _build_packets(self, command: int, data: _Buffer) -> Iterator[memoryview]:
+        """Yield the HID reports carrying ``data``, one at a time.
+
+        Reports are assembled in two alternating buffers owned by the device,
+        so each yielded view stays valid until the next-but-one report is
+        built. Chunks are copied straight from a view of ``data``, which may
+        be any buffer (e.g. an mmap) and is never copied as a whole.
+        """
+
+        reports = self._reports
+        if reports is None:
+            reports = self._reports = (
+                bytearray(OUTPUT_PACKET_SIZE),
+                bytearray(OUTPUT_PACKET_SIZE),
+            )
+        source = memoryview(data).cast("B")
+        data_length = len(source)
+        for report in reports:
+            report[0] = LCD_REPORT_ID
+            report[1] = command
+            report[2:6] = data_length.to_bytes(4, "big")
         if data_length == 0:
-            packet = bytearray(OUTPUT_PACKET_SIZE)
-            packet[0] = LCD_REPORT_ID
-            packet[1] = command
-            return iter([bytes(packet)])
-        packets: List[bytes] = []
-        packet_number = 0
-        offset = 0
-        while offset < data_length:
-            chunk = data[offset : offset + MAX_CHUNK]
-            packet = bytearray(OUTPUT_PACKET_SIZE)
-            packet[0] = LCD_REPORT_ID
-            packet[1] = command
-            packet[2:6] = data_length.to_bytes(4, "big")
-            packet[6:9] = packet_number.to_bytes(3, "big")
-            packet[9:11] = len(chunk).to_bytes(2, "big")
-            packet[11 : 11 + len(chunk)] = chunk
-            packets.append(bytes(packet))
-            offset += len(chunk)
-            packet_number += 1
-        return iter(packets)
-
-    def _write(self, command: int, data: bytes, expect_reply: bool) -> List[bytes]:
+            report = reports[0]
+            report[6:] = bytes(OUTPUT_PACKET_SIZE - 6)
+            yield memoryview(report)
+            return
+        for packet_number, offset in enumerate(range(0, data_length, MAX_CHUNK)):
+            report = reports[packet_number & 1]
+            chunk = source[offset : offset + MAX_CHUNK]
+            end = 11 + len(chunk)
+            report[6:9] = packet_number.to_bytes(3, "big")
+            report[9:11] = len(chunk).to_bytes(2, "big")
+            report[11:end] = chunk
+            if end < OUTPUT_PACKET_SIZE:
+                report[end:] = bytes(OUTPUT_PACKET_SIZE - end)
+            yield memoryview(report)
+
+    def _write(self, command: int, data: _Buffer, expect_reply: bool) -> List[bytes]:
         if self._backend == "wireless":
             raise LCDDeviceError("Wireless LCD backend does not support HID framing")
+        window = 0
+        if expect_reply:
+            window = 1 if self._panel_key in _LOCKSTEP_PANELS else self._ack_window
+        try:
+            responses = self._send_packets(command, data, window)
+        except _AckError as exc:
+            if window <= 1 or len(data) <= MAX_CHUNK:
+                raise
+            # Some firmware drops acknowledgements while reports queue up;
+            # resend the command one report at a time from now on.
+            logger.info("LCD did not keep up with pipelined writes (%s)", exc)
+            if self._panel_key is not None:
+                _LOCKSTEP_PANELS.add(self._panel_key)
+            self._drain_replies()
+            responses = self._send_packets(command, data, 1)
+        self._last_activity = time.monotonic()
+        return responses
+
+    def _send_packets(self, command: int, data: _Buffer, window: int) -> List[bytes]:
+        """Write every report, keeping at most ``window`` unacknowledged.
+
+        Replies are returned for single-report commands (queries); the
+        acknowledgements of a multi-report upload are checked and dropped.
+        """
+
         responses: List[bytes] = []
-        packets = list(self._build_packets(command, data))
-        if not packets:
-            packets = [
-                bytes(
-                    bytearray([LCD_REPORT_ID, command] + [0] * (OUTPUT_PACKET_SIZE - 2))
-                )
-            ]
-        for packet in packets:
+        keep = len(data) <= MAX_CHUNK
+        pending = 0
+        for packet in self._build_packets(command, data):
+            if window and pending >= window:
+                self._read_reply(command)
+                pending -= 1
             written = self._write_packet(packet)
             if written != len(packet):
                 raise LCDDeviceError(
                     f"Incomplete HID write ({written}/{len(packet)})",
                 )
-            if expect_reply:
-                response = self._read_packet()
-                if not response:
-                    raise LCDDeviceError("Timeout waiting for LCD response")
-                if response[1] != command:
-                    raise LCDDeviceError(
-                        f"Unexpected response command 0x{response[1]:02x} for 0x{command:02x}",
-                    )
-                responses.append(bytes(response))
+            if window:
+                pending += 1
+        for _ in range(pending):
+            reply = self._read_reply(command)
+            if keep:
+                responses.append(reply)
         return responses
 
-    def _write_packet(self, packet: bytes) -> int:
+    def _read_reply(self, command: int) -> bytes:
+        response = self._read_packet()
+        if not response:
+            raise _AckError("Timeout waiting for LCD response")
+        if response[1] != command:
+            raise _AckError(
+                f"Unexpected response command 0x{response[1]:02x} for 0x{command:02x}",
+            )
+        return bytes(response)
+
+    def _drain_replies(self, timeout_ms: int = 50) -> None:
+        # Late acknowledgements of the abandoned attempt must not be taken
+        # for replies to the resent reports.
+        for _ in range(self._ack_window):
+            try:
+                if not self._read_packet(timeout_ms):
+                    return
+            except LCDDeviceError:
+                return
+
+    def _write_packet(self, packet: memoryview) -> int:
         if self._backend == "hid" and self._hid is not None:
             return self._hid.write(packet)
         if self._backend == "usb" and self._usb is not None:
@@ -509,12 +810,13 @@ class TLLCDDevice:
             )
         raise LCDDeviceError("LCD device is not open")
 
-    def _read_packet(self) -> bytes:
+    def _read_packet(self, timeout_ms: Optional[int] = None) -> bytes:
         if self._backend == "hid" and self._hid is not None:
-            return bytes(self._hid.read(INPUT_PACKET_SIZE, timeout=1000))
+            timeout = 1000 if timeout_ms is None else timeout_ms
+            return bytes(self._hid.read(INPUT_PACKET_SIZE, timeout=timeout))
         if self._backend == "usb" and self._usb is not None:
             try:
-                return self._usb.read(USB_INPUT_PACKET_SIZE)
+                return self._usb.read(USB_INPUT_PACKET_SIZE, timeout_ms)
             except USBError as exc:
                 raise LCDDeviceError(f"USB read failed: {exc}") from exc
         if self._backend == "wireless":
@@ -523,6 +825,7 @@ class TLLCDDevice:
             )
         raise LCDDeviceError("LCD device is not open")
 
+    @_serialized
     def handshake(self) -> Dict[str, int]:
         if self._backend == "wireless":
             if not self._wireless:
@@ -538,6 +841,7 @@ class TLLCDDevice:
         frame_index = (payload[1] << 8) | payload[2]
         return {"mode": mode, "frame_index": frame_index}
 
+    @_serialized
     def firmware_version(self) -> Dict[str, str]:
         if self._backend == "wireless":
             if not self._wireless:
@@ -558,6 +862,7 @@ class TLLCDDevice:
         )
         return {"version": version, "build": build_date}
 
+    @_serialized
     def control(self, setting: LCDControlSetting) -> None:
         if self._backend == "wireless":
             if not self._wireless:
@@ -566,45 +871,129 @@ class TLLCDDevice:
             return
         self._write(0x40, setting.to_bytes(), expect_reply=True)
 
-    def send_jpg(self, payload: bytes) -> None:
+    @_serialized
+    def send_jpg(self, payload: LCDPayload) -> None:
         if self._backend == "wireless":
             if not self._wireless:
                 raise LCDDeviceError("Wireless transport is unavailable")
             self._wireless.send_jpg(payload)
             return
-        self._write(0x41, payload, expect_reply=True)
+        with _payload_buffer(payload) as data:
+            self._write(0x41, data, expect_reply=True)
 
-    def send_avi(self, payload: bytes) -> None:
+    @_serialized
+    def send_avi(self, payload: LCDPayload) -> None:
         if self._backend == "wireless":
             if not self._wireless:
                 raise LCDDeviceError("Wireless transport is unavailable")
             self._wireless.send_avi(payload)
             return
-        self._write(0x45, payload, expect_reply=True)
+        with _payload_buffer(payload) as data:
+            self._write(0x45, data, expect_reply=True)
 
-    def send_sync_jpg(self, payload: bytes) -> None:
+    @_serialized
+    def send_sync_jpg(self, payload: LCDPayload) -> None:
         if self._backend == "wireless":
             if not self._wireless:
                 raise LCDDeviceError("Wireless transport is unavailable")
             self._wireless.send_sync_jpg(payload)
             return
-        self._write(0x46, payload, expect_reply=False)
+        with _payload_buffer(payload) as data:
+            self._write(0x46, data, expect_reply=False)
 
-    def send_boot_jpg(self, payload: bytes) -> None:
+    @_serialized
+    def send_boot_jpg(self, payload: LCDPayload) -> None:
         if self._backend == "wireless":
             if not self._wireless:
                 raise LCDDeviceError("Wireless transport is unavailable")
             self._wireless.send_boot_jpg(payload)
             return
-        self._write(0x48, payload, expect_reply=True)
+        with _payload_buffer(payload) as data:
+            self._write(0x48, data, expect_reply=True)
 
-    def send_boot_video(self, payload: bytes) -> None:
+    @_serialized
+    def send_boot_video(self, payload: LCDPayload) -> None:
         if self._backend == "wireless":
             if not self._wireless:
                 raise LCDDeviceError("Wireless transport is unavailable")
             self._wireless.send_boot_video(payload)
             return
-        self._write(0x47, payload, expect_reply=True)
+        with _payload_buffer(payload) as data:
+            self._write(0x47, data, expect_reply=True)
+
+
+@dataclasses.dataclass
+class PanelPushResult:
+    """Outcome of one panel in :func:`push_many`."""
+
+    serial: str
+    bytes_sent: int
+    latency_ms: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def push_many(
+    frames: Union[bytes, Mapping[str, bytes]],
+    *,
+    serials: Optional[Sequence[str]] = None,
+) -> List[PanelPushResult]:
+    """Push JPEG frames to several panels in parallel.
+
+    ``frames`` is either one payload sent to every panel or a mapping of
+    serial to payload. Without ``serials`` a single payload goes to every
+    enumerated panel. Each panel is opened on its own worker thread with
+    its own USB handle, so the wall time tracks the slowest panel rather
+    than the sum. Failures are reported per panel instead of raised.
+    """
+
+    devices = [dev for dev in enumerate_devices() if dev.serial_number]
+    if isinstance(frames, (bytes, bytearray, memoryview)):
+        if serials is None:
+            serials = [dev.serial_number for dev in devices]  # type: ignore[misc]
+        frame = bytes(frames)
+        targets = {serial: frame for serial in serials}
+    else:
+        targets = dict(frames)
+    if not targets:
+        return []
+
+    # Resolve every panel from the one listing; ambiguous or unknown serials
+    # fall back to TLLCDDevice's own lookup so they fail with its messages.
+    by_serial: Dict[str, List[HidDeviceInfo]] = {}
+    for dev in devices:
+        by_serial.setdefault(dev.serial_number, []).append(dev)  # type: ignore[arg-type]
+
+    def resolved(serial: str) -> Optional[HidDeviceInfo]:
+        matches = by_serial.get(serial.strip(), [])
+        return matches[0] if len(matches) == 1 else None
+
+    def push(serial: str, payload: bytes) -> PanelPushResult:
+        started = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            with TLLCDDevice(serial, info=resolved(serial)) as device:
+                device.send_jpg(payload)
+        except (LCDDeviceError, USBError) as exc:
+            error = str(exc)
+        return PanelPushResult(
+            serial=serial,
+            bytes_sent=0 if error else len(payload),
+            latency_ms=(time.perf_counter() - started) * 1000,
+            error=error,
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=len(targets), thread_name_prefix="uws-lcd-push"
+    ) as executor:
+        futures = [
+            executor.submit(push, serial, payload)
+            for serial, payload in targets.items()
+        ]
+        return [future.result() for future in futures]
 
 
 def rotation_from_arg(value: int) -> ScreenRotation:
@@ -0,0 +1,193 @@
+"""Skip LCD frame pushes that would not change what the panel shows."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .lcd_keepalive import DEFAULT_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+Image: Any
+ImageChops: Any
+ImageStat: Any
+
+try:
+    from PIL import Image as _Image
+    from PIL import ImageChops as _ImageChops
+    from PIL import ImageStat as _ImageStat
+
+    Image = _Image
+    ImageChops = _ImageChops
+    ImageStat = _ImageStat
+except ImportError:  # pragma: no cover - Pillow is optional
+    Image = None
+    ImageChops = None
+    ImageStat = None
+
+# A duplicate is still pushed once the panel has been idle this long, so
+# suppressed frames never let it drift out of its awake window.
+DEFAULT_REFRESH_AFTER = DEFAULT_INTERVAL
+# Frames are compared as small greyscale thumbnails of this size.
+SIMILARITY_SIZE = (64, 64)
+
+
+class FrameDedupError(RuntimeError):
+    """Raised for invalid frame deduplication settings."""
+
+
+@dataclass
+class DedupStats:
+    """Counters for :class:`DedupLCDDevice`."""
+
+    frames: int = 0
+    sent: int = 0
+    identical: int = 0
+    similar: int = 0
+    refreshes: int = 0
+    bytes_sent: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def skipped(self) -> int:
+        return self.identical + self.similar
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "identical": self.identical,
+            "similar": self.similar,
+            "refreshes": self.refreshes,
+            "bytes_sent": self.bytes_sent,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+class DedupLCDDevice:
+    """Wrap an LCD device so repeated frames are not pushed again.
+
+    ``send_jpg``/``send_sync_jpg`` hash each payload and drop it when it
+    matches the last frame sent. With ``similarity`` set (requires Pillow),
+    a frame is also dropped when its decoded pixels differ from the last
+    sent frame by at most that mean fraction of full scale, e.g. ``0.01``
+    for a 1% average change. A dropped frame is pushed anyway once the
+    panel has been idle for ``refresh_after`` seconds. Every other
+    attribute is forwarded to the wrapped device. The send methods return
+    whether the frame went out.
+    """
+
+    def __init__(
+        self,
+        device: Any,
+        *,
+        similarity: Optional[float] = None,
+        refresh_after: float = DEFAULT_REFRESH_AFTER,
+    ) -> None:
+        if similarity is not None:
+            if not 0 <= similarity < 1:
+                raise FrameDedupError("Similarity threshold must be in [0, 1)")
+            if Image is None:
+                raise FrameDedupError(
+                    "Pillow is required for pixel similarity. Install with 'pip install uwscli[images]'.",
+                )
+        if refresh_after <= 0:
+            raise FrameDedupError("Refresh interval must be positive")
+        self._device = device
+        self.similarity = similarity
+        self.refresh_after = refresh_after
+        self.stats = DedupStats()
+        self._lock = threading.Lock()
+        self._last_digest: Optional[bytes] = None
+        self._last_thumbnail: Any = None
+        self._last_sent = 0.0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._device, name)
+
+    def __enter__(self) -> "DedupLCDDevice":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._device.close()
+
+    def send_jpg(self, payload: bytes) -> bool:
+        return self._push(self._device.send_jpg, payload)
+
+    def send_sync_jpg(self, payload: bytes) -> bool:
+        return self._push(self._device.send_sync_jpg, payload)
+
+    def reset(self) -> None:
+        """Forget the last frame so the next one is always pushed."""
+
+        with self._lock:
+            self._last_digest = None
+            self._last_thumbnail = None
+
+    def _push(self, send: Any, payload: bytes) -> bool:
+        with self._lock:
+            stats = self.stats
+            stats.frames += 1
+            digest = hashlib.blake2b(payload, digest_size=16).digest()
+            thumbnail = None
+            duplicate = None
+            if digest == self._last_digest:
+                duplicate = "identical"
+            elif self.similarity is not None and self._last_thumbnail is not None:
+                thumbnail = _thumbnail(payload)
+                if thumbnail is not None and self._close_to_last(thumbnail):
+                    duplicate = "similar"
+            if duplicate is not None and not self._refresh_due():
+                if duplicate == "identical":
+                    stats.identical += 1
+                else:
+                    stats.similar += 1
+                stats.bytes_saved += len(payload)
+                return False
+            if duplicate is not None:
+                stats.refreshes += 1
+            send(payload)
+            stats.sent += 1
+            stats.bytes_sent += len(payload)
+            self._last_sent = time.monotonic()
+            if duplicate is None:
+                # A similar frame that is resent keeps the older reference,
+                # so slow drift still ends up on the panel.
+                self._last_digest = digest
+                if self.similarity is not None:
+                    if thumbnail is None:
+                        thumbnail = _thumbnail(payload)
+                    self._last_thumbnail = thumbnail
+            return True
+
+    def _close_to_last(self, thumbnail: Any) -> bool:
+        difference = ImageChops.difference(thumbnail, self._last_thumbnail)
+        mean = ImageStat.Stat(difference).mean[0] / 255
+        return mean <= self.similarity
+
+    def _refresh_due(self) -> bool:
+        idle_seconds = getattr(self._device, "idle_seconds", None)
+        if idle_seconds is not None:
+            idle = idle_seconds()
+        else:
+            idle = time.monotonic() - self._last_sent if self._last_sent else math.inf
+        return idle >= self.refresh_after
+
+
+def _thumbnail(payload: bytes) -> Any:
+    try:
+        image = Image.open(io.BytesIO(payload))
+        # Let the JPEG decoder downscale (up to 8x) while decoding.
+        image.draft("L", SIMILARITY_SIZE)
+        return image.convert("L").resize(SIMILARITY_SIZE)
+    except (OSError, ValueError) as exc:
+        logger.debug("Unable to decode frame for similarity check: %s", exc)
+        return None
@@ -0,0 +1,287 @@
+"""Fit images to TL LCD panels: resize, rotate and size-targeted JPEG encoding.
+
+Pillow is optional (``pip install uwscli[images]``); check
+:func:`is_available` before use.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from .effect_cache import CACHE_DIR_ENV, default_cache_dir
+from .lcd import WirelessUSBTransport
+
+logger = logging.getLogger(__name__)
+
+Image: Any
+ImageOps: Any
+
+try:
+    from PIL import Image as _Image
+    from PIL import ImageOps as _ImageOps
+
+    Image = _Image
+    ImageOps = _ImageOps
+except ImportError:  # pragma: no cover - Pillow is optional
+    Image = None
+    ImageOps = None
+
+PANEL_SIZE = (400, 400)
+# Every panel backend accepts a frame this large in one push.
+DEFAULT_MAX_BYTES = WirelessUSBTransport.MAX_PAYLOAD
+MAX_QUALITY = 95
+MIN_QUALITY = 20
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+
+_FIT_MODES = ("cover", "contain")
+_ROTATIONS = (0, 90, 180, 270)
+_ENTRY_SUFFIX = ".jpg"
+_FORMAT_VERSION = 1
+
+
+class LCDImageError(RuntimeError):
+    """Raised when an image cannot be prepared for an LCD panel."""
+
+
+def is_available() -> bool:
+    """Return True when Pillow is importable."""
+
+    return Image is not None
+
+
+@dataclass(frozen=True)
+class FitOptions:
+    """Target geometry and byte budget for :func:`fit_jpeg`.
+
+    ``rotation`` turns the picture clockwise before it is fitted. ``cover``
+    crops to fill the panel; ``contain`` letterboxes on black.
+    """
+
+    size: Tuple[int, int] = PANEL_SIZE
+    rotation: int = 0
+    fit: str = "cover"
+    max_bytes: int = DEFAULT_MAX_BYTES
+    max_quality: int = MAX_QUALITY
+    min_quality: int = MIN_QUALITY
+
+    def __post_init__(self) -> None:
+        if self.size[0] <= 0 or self.size[1] <= 0:
+            raise LCDImageError("Panel size must be positive")
+        if self.rotation not in _ROTATIONS:
+            raise LCDImageError("Rotation must be one of 0, 90, 180 or 270")
+        if self.fit not in _FIT_MODES:
+            raise LCDImageError(f"Fit mode must be one of {', '.join(_FIT_MODES)}")
+        if self.max_bytes <= 0:
+            raise LCDImageError("Byte budget must be positive")
+        if not 1 <= self.min_quality <= self.max_quality <= 100:
+            raise LCDImageError("JPEG quality bounds must satisfy 1 <= min <= max <= 100")
+
+    def digest(self, source: bytes) -> str:
+        material = dict(
+            asdict(self),
+            source=hashlib.sha256(source).hexdigest(),
+            pillow=getattr(Image, "__version__", None),
+            format=_FORMAT_VERSION,
+        )
+        encoded = json.dumps(material, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+
+@dataclass(frozen=True)
+class FittedFrame:
+    """A panel-ready JPEG.
+
+    ``quality`` is ``None`` when the source was passed through or the frame
+    came from the cache.
+    """
+
+    data: bytes
+    quality: Optional[int]
+    source_bytes: int
+    encodes: int = 0
+    cached: bool = False
+
+
+def default_frame_cache_dir() -> Path:
+    """Return the directory of fitted frames, next to the effect cache."""
+
+    if os.environ.get(CACHE_DIR_ENV):
+        return default_cache_dir() / "lcd-frames"
+    return default_cache_dir().parent / "lcd-frames"
+
+
+class FrameCache:
+    """On-disk store of fitted frames keyed by source hash and :class:`FitOptions`.
+
+    Entries are plain JPEG files named by digest; recency is tracked through
+    the modification time and the directory is trimmed to ``max_bytes``.
+    Filesystem errors never propagate: a failing cache behaves like an
+    empty one.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        *,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+    ) -> None:
+        self.directory = Path(directory) if directory else default_frame_cache_dir()
+        self.max_bytes = max(0, int(max_bytes))
+
+    def get(self, digest: str) -> Optional[bytes]:
+        path = self._path_for(digest)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return data
+
+    def put(self, digest: str, data: bytes) -> None:
+        if self.max_bytes and len(data) > self.max_bytes:
+            return
+        path = self._path_for(digest)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp_name, path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+                raise
+        except OSError as exc:
+            logger.debug("Frame cache write failed for %s: %s", path, exc)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        if not self.max_bytes:
+            return
+        files: List[Tuple[Path, os.stat_result]] = []
+        with contextlib.suppress(OSError):
+            for path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+                with contextlib.suppress(OSError):
+                    files.append((path, path.stat()))
+        files.sort(key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in files)
+        for path, stat in files:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
+                total -= stat.st_size
+
+    def _path_for(self, digest: str) -> Path:
+        return self.directory / f"{digest}{_ENTRY_SUFFIX}"
+
+
+def fit_jpeg(
+    source: bytes,
+    options: FitOptions = FitOptions(),
+    *,
+    cache: Optional[FrameCache] = None,
+) -> FittedFrame:
+    """Return ``source`` as a JPEG sized, rotated and within ``options.max_bytes``.
+
+    A JPEG that already has the target size, needs no rotation and fits the
+    budget is passed through untouched. Otherwise the image is re-encoded at
+    the highest quality that fits, found by binary search between
+    ``min_quality`` and ``max_quality``.
+    """
+
+    if Image is None:
+        raise LCDImageError(
+            "Pillow is required for image fitting. Install with 'pip install uwscli[images]'.",
+        )
+    digest = options.digest(source) if cache is not None else ""
+    if cache is not None:
+        cached = cache.get(digest)
+        if cached is not None:
+            return FittedFrame(cached, None, len(source), cached=True)
+
+    try:
+        image = Image.open(io.BytesIO(source))
+        image.load()
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        raise LCDImageError(f"Unable to decode image: {exc}") from exc
+    if (
+        image.format == "JPEG"
+        and image.size == options.size
+        and options.rotation == 0
+        and len(source) <= options.max_bytes
+        and not _needs_transpose(image)
+    ):
+        return FittedFrame(source, None, len(source))
+
+    frame = _prepare(image, options)
+    best: Optional[Tuple[int, bytes]] = None
+    encodes = 1
+    data = _encode(frame, options.max_quality)
+    if len(data) <= options.max_bytes:
+        best = (options.max_quality, data)
+    else:
+        low, high = options.min_quality, options.max_quality - 1
+        while low <= high:
+            quality = (low + high) // 2
+            data = _encode(frame, quality)
+            encodes += 1
+            if len(data) <= options.max_bytes:
+                best = (quality, data)
+                low = quality + 1
+            else:
+                high = quality - 1
+    if best is None:
+        raise LCDImageError(
+            f"Image does not fit in {options.max_bytes} bytes even at JPEG quality "
+            f"{options.min_quality}",
+        )
+    quality, data = best
+    logger.debug(
+        "Fitted %d-byte image to %d bytes at quality %d (%d encodes)",
+        len(source),
+        len(data),
+        quality,
+        encodes,
+    )
+    if cache is not None:
+        cache.put(digest, data)
+    return FittedFrame(data, quality, len(source), encodes=encodes)
+
+
+def _needs_transpose(image: Any) -> bool:
+    try:
+        orientation = image.getexif().get(0x0112, 1)
+    except Exception:  # malformed EXIF: treat as upright
+        return False
+    return orientation not in (0, 1)
+
+
+def _prepare(image: Any, options: FitOptions) -> Any:
+    image = ImageOps.exif_transpose(image)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    if options.rotation:
+        # Image.rotate turns counter-clockwise.
+        image = image.rotate(-options.rotation, expand=True)
+    if options.fit == "cover":
+        return ImageOps.fit(image, options.size, Image.Resampling.LANCZOS)
+    return ImageOps.pad(image, options.size, Image.Resampling.LANCZOS, color=(0, 0, 0))
+
+
+def _encode(image: Any, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
@@ -0,0 +1,172 @@
+"""Background keep-alive handshakes for any number of LCD panels."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .lcd import AWAKE_WINDOW, LCDDeviceError
+from .usbutil import USBError
+
+logger = logging.getLogger(__name__)
+
+# Refresh comfortably inside the window after which a frame push would
+# handshake inline, and spread each refresh by up to this fraction.
+DEFAULT_INTERVAL = AWAKE_WINDOW * 0.75
+DEFAULT_JITTER = 0.2
+
+
+class KeepAliveError(RuntimeError):
+    """Raised for invalid keep-alive scheduler configuration."""
+
+
+@dataclass
+class PanelKeepAlive:
+    """Per-panel counters reported by :meth:`KeepAliveScheduler.stats`."""
+
+    handshakes: int = 0
+    skipped: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+
+
+class KeepAliveScheduler:
+    """Handshake idle panels from one background thread.
+
+    Each panel is handshaken roughly every ``interval`` seconds, minus a
+    random share of up to ``jitter * interval`` so handshakes to many panels
+    do not line up on the bus. A panel whose ``idle_seconds()`` shows it was
+    written to by someone else within the interval is skipped and looked
+    at again one interval after that write. Devices must serialise their
+    own I/O (``TLLCDDevice`` does), since frame pushes keep running on
+    other threads. ``clock`` supplies monotonic time and may be replaced
+    in tests.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = DEFAULT_INTERVAL,
+        jitter: float = DEFAULT_JITTER,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if interval <= 0:
+            raise KeepAliveError("Keep-alive interval must be positive")
+        if not 0 <= jitter < 1:
+            raise KeepAliveError("Keep-alive jitter must be in [0, 1)")
+        self.interval = interval
+        self.jitter = jitter
+        self._on_error = on_error
+        self._clock = clock
+        self._devices: Dict[str, Any] = {}
+        self._stats: Dict[str, PanelKeepAlive] = {}
+        # Monotonic time of each panel's last keep-alive handshake, used to
+        # tell our own refreshes apart from frame pushes.
+        self._refreshed: Dict[str, float] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, name: str, device: Any) -> None:
+        with self._cond:
+            self._devices[name] = device
+            self._stats.setdefault(name, PanelKeepAlive())
+            # Stagger first refreshes across one interval.
+            self._schedule(name, self._clock() + random.uniform(0, self.interval))
+
+    def remove(self, name: str) -> None:
+        with self._cond:
+            self._devices.pop(name, None)
+
+    def start(self) -> "KeepAliveScheduler":
+        with self._cond:
+            if self._thread is not None:
+                return self
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run, name="uws-lcd-keepalive", daemon=True
+            )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def stats(self) -> Dict[str, PanelKeepAlive]:
+        with self._cond:
+            return {
+                name: PanelKeepAlive(**vars(entry))
+                for name, entry in self._stats.items()
+            }
+
+    def __enter__(self) -> "KeepAliveScheduler":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _schedule(self, name: str, due: float) -> None:
+        self._sequence += 1
+        heapq.heappush(self._queue, (due, self._sequence, name))
+        self._cond.notify()
+
+    def _next_due(self, since: float) -> float:
+        return since + self.interval * (1 - random.uniform(0, self.jitter))
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if self._queue:
+                        wait = self._queue[0][0] - self._clock()
+                        if wait <= 0:
+                            break
+                    else:
+                        wait = None
+                    self._cond.wait(wait)
+                if self._stopped:
+                    return
+                _, _, name = heapq.heappop(self._queue)
+                device = self._devices.get(name)
+                stats = self._stats.get(name)
+            if device is None or stats is None:
+                continue
+            self._refresh(name, device, stats)
+
+    def _refresh(self, name: str, device: Any, stats: PanelKeepAlive) -> None:
+        idle = device.idle_seconds()
+        now = self._clock()
+        last_write = now - idle
+        if idle < self.interval and last_write > self._refreshed.get(name, 0.0):
+            # Written to recently: look again one interval after that write.
+            stats.skipped += 1
+            due = last_write + self.interval
+        else:
+            try:
+                device.handshake()
+            except (LCDDeviceError, USBError) as exc:
+                stats.failures += 1
+                stats.last_error = str(exc)
+                logger.warning("Keep-alive handshake failed for %s: %s", name, exc)
+                if self._on_error is not None:
+                    self._on_error(name, exc)
+            else:
+                stats.handshakes += 1
+            self._refreshed[name] = self._clock()
+            due = self._next_due(self._refreshed[name])
+        with self._cond:
+            if name in self._devices:
+                self._schedule(name, due)
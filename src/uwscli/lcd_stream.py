@@ -0,0 +1,403 @@
+"""Continuous JPEG streaming to a TL LCD panel."""
+
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FPS = 15.0
+DEFAULT_QUEUE_SIZE = 2
+DIRECTORY_POLL_INTERVAL = 0.05
+
+_READ_SIZE = 64 * 1024
+_JPEG_SUFFIXES = (".jpg", ".jpeg")
+
+
+class LCDStreamError(RuntimeError):
+    """Raised when a frame source fails while streaming."""
+
+
+class JPEGSplitter:
+    """Incrementally split a byte stream of concatenated JPEGs into frames.
+
+    Marker segments are skipped by their declared length and entropy-coded
+    data is scanned for the next real marker, so EXIF thumbnails and stray
+    ``FFD9`` bytes inside a frame never end it early. Anything between
+    frames (MJPEG multipart headers, boundaries) is discarded.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0
+        self._in_scan = False
+
+    def feed(self, data: bytes) -> List[bytes]:
+        self._buffer += data
+        frames: List[bytes] = []
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                return frames
+            frames.append(frame)
+
+    def _next_frame(self) -> Optional[bytes]:
+        buf = self._buffer
+        while True:
+            if self._pos == 0:
+                start = buf.find(b"\xff\xd8")
+                if start < 0:
+                    # Keep a trailing 0xFF: it may be the first half of an SOI.
+                    del buf[: max(0, len(buf) - 1)]
+                    return None
+                del buf[:start]
+                self._pos = 2
+                self._in_scan = False
+
+            pos = self._pos
+            size = len(buf)
+            while True:
+                if self._in_scan:
+                    marker_at = buf.find(b"\xff", pos)
+                    if marker_at < 0:
+                        pos = size
+                        break
+                    if marker_at + 1 >= size:
+                        pos = marker_at
+                        break
+                    code = buf[marker_at + 1]
+                    if code == 0x00 or 0xD0 <= code <= 0xD7:
+                        pos = marker_at + 2
+                    elif code == 0xFF:
+                        pos = marker_at + 1
+                    else:
+                        pos = marker_at
+                        self._in_scan = False
+                    continue
+
+                if pos + 2 > size:
+                    break
+                if buf[pos] != 0xFF:
+                    # Corrupt frame: drop its SOI and resynchronise.
+                    del buf[:2]
+                    pos = 0
+                    break
+                code = buf[pos + 1]
+                if code == 0xFF:
+                    pos += 1
+                    continue
+                if code == 0xD9:
+                    end = pos + 2
+                    frame = bytes(buf[:end])
+                    del buf[:end]
+                    self._pos = 0
+                    return frame
+                if 0xD0 <= code <= 0xD7 or code == 0x01:
+                    pos += 2
+                    continue
+                if pos + 4 > size:
+                    break
+                length = int.from_bytes(buf[pos + 2 : pos + 4], "big")
+                if pos + 2 + length > size:
+                    break
+                pos += 2 + length
+                if code == 0xDA:
+                    self._in_scan = True
+
+            self._pos = pos
+            if pos:
+                return None
+
+
+def iter_jpeg_stream(stream: BinaryIO, chunk_size: int = _READ_SIZE) -> Iterator[bytes]:
+    """Yield frames from a pipe, file, or MJPEG response of concatenated JPEGs."""
+
+    read = getattr(stream, "read1", stream.read)
+    splitter = JPEGSplitter()
+    while True:
+        data = read(chunk_size)
+        if not data:
+            return
+        yield from splitter.feed(data)
+
+
+def iter_directory(
+    path: Path,
+    *,
+    poll_interval: float = DIRECTORY_POLL_INTERVAL,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[bytes]:
+    """Yield the newest JPEG in ``path`` each time it is written or replaced.
+
+    Files that do not yet hold a complete JPEG are treated as still being
+    written and picked up on a later poll.
+    """
+
+    stop = stop or threading.Event()
+    last: Optional[Tuple[str, int, int]] = None
+    while not stop.is_set():
+        newest: Optional[Tuple[int, str, int]] = None
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(_JPEG_SUFFIXES):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    candidate = (stat.st_mtime_ns, entry.path, stat.st_size)
+                    if newest is None or candidate > newest:
+                        newest = candidate
+        except OSError as exc:
+            raise LCDStreamError(f"Unable to watch {path}: {exc}") from exc
+        if newest is not None:
+            mtime_ns, file_path, file_size = newest
+            signature = (file_path, mtime_ns, file_size)
+            if signature != last:
+                try:
+                    frames = JPEGSplitter().feed(Path(file_path).read_bytes())
+                except OSError:
+                    frames = []
+                if frames:
+                    last = signature
+                    yield frames[0]
+                    continue
+        stop.wait(poll_interval)
+
+
+def throttle(
+    frames: Iterable[bytes],
+    fps: float,
+    *,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[bytes]:
+    """Release frames from a non-live source (e.g. a recorded file) in real time."""
+
+    stop = stop or threading.Event()
+    period = 1.0 / fps
+    next_due = time.perf_counter()
+    for frame in frames:
+        delay = next_due - time.perf_counter()
+        if delay > 0 and stop.wait(delay):
+            return
+        yield frame
+        next_due = max(next_due + period, time.perf_counter())
+
+
+@dataclass
+class Frame:
+    data: bytes
+    enqueued: float
+    read_ms: float
+
+
+class FrameQueue:
+    """Bounded hand-off between the frame reader and the LCD writer.
+
+    A full queue discards its oldest frame, and :meth:`get_latest` skips to
+    the newest one, so a slow panel shows the most recent frame instead of
+    falling further behind. Every discarded frame is counted in ``dropped``.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE) -> None:
+        self._frames: Deque[Frame] = collections.deque(maxlen=max(1, maxsize))
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, frame: Frame) -> None:
+        with self._cond:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(frame)
+            self._cond.notify()
+
+    def get_latest(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        with self._cond:
+            if not self._frames and not self._closed:
+                self._cond.wait(timeout)
+            if not self._frames:
+                return None
+            self.dropped += len(self._frames) - 1
+            frame = self._frames.pop()
+            self._frames.clear()
+            return frame
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def exhausted(self) -> bool:
+        with self._cond:
+            return self._closed and not self._frames
+
+
+@dataclass
+class StreamStats:
+    """Counters and per-stage timings collected while streaming."""
+
+    frames_read: int = 0
+    frames_sent: int = 0
+    frames_skipped: int = 0
+    frames_dropped: int = 0
+    bytes_sent: int = 0
+    elapsed: float = 0.0
+    read_ms: float = 0.0
+    queue_ms: float = 0.0
+    send_ms: float = 0.0
+    max_send_ms: float = 0.0
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def record_send(self, frame: Frame, dequeued: float, send_ms: float) -> None:
+        self.frames_sent += 1
+        self.bytes_sent += len(frame.data)
+        self.read_ms += frame.read_ms
+        self.queue_ms += (dequeued - frame.enqueued) * 1000
+        self.send_ms += send_ms
+        self.max_send_ms = max(self.max_send_ms, send_ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        sent = self.frames_sent or 1
+        return {
+            "frames_read": self.frames_read,
+            "frames_sent": self.frames_sent,
+            "frames_skipped": self.frames_skipped,
+            "frames_dropped": self.frames_dropped,
+            "bytes_sent": self.bytes_sent,
+            "elapsed_s": round(self.elapsed, 3),
+            "fps": round(self.frames_sent / self.elapsed, 2) if self.elapsed else 0.0,
+            "avg_read_ms": round(self.read_ms / sent, 3),
+            "avg_queue_ms": round(self.queue_ms / sent, 3),
+            "avg_send_ms": round(self.send_ms / sent, 3),
+            "max_send_ms": round(self.max_send_ms, 3),
+        }
+
+
+class LCDStreamer:
+    """Push frames from ``frames`` to ``device`` at up to ``fps`` frames per second.
+
+    Frames are read on a background thread into a :class:`FrameQueue`; the
+    calling thread paces the panel writes and always sends the newest frame
+    available when a slot comes up. ``sync=True`` uses ``send_sync_jpg``,
+    which skips the per-packet acknowledgement on HID panels. A send that
+    returns ``False`` (see :class:`~uwscli.lcd_dedup.DedupLCDDevice`) was
+    suppressed: it uses up its slot but counts as skipped, not sent.
+    """
+
+    def __init__(
+        self,
+        device: Any,
+        frames: Iterable[bytes],
+        *,
+        fps: float = DEFAULT_FPS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        sync: bool = False,
+    ) -> None:
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self._device = device
+        self._frames = frames
+        self._period = 1.0 / fps
+        self._send = device.send_sync_jpg if sync else device.send_jpg
+        self._queue = FrameQueue(queue_size)
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.stats = StreamStats()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._queue.close()
+
+    def run(
+        self,
+        *,
+        duration: Optional[float] = None,
+        max_frames: Optional[int] = None,
+        stats_interval: Optional[float] = None,
+        on_stats: Optional[Callable[[StreamStats], None]] = None,
+    ) -> StreamStats:
+        stats = self.stats = StreamStats()
+        reader = threading.Thread(
+            target=self._read_frames, name="uws-lcd-stream", daemon=True
+        )
+        reader.start()
+        next_due = stats.started
+        next_report = stats.started + stats_interval if stats_interval else None
+        try:
+            while not self._stop.is_set():
+                now = time.perf_counter()
+                if duration is not None and now - stats.started >= duration:
+                    break
+                if now < next_due and self._stop.wait(next_due - now):
+                    break
+                frame = self._queue.get_latest(timeout=0.1)
+                if frame is None:
+                    if self._queue.exhausted:
+                        break
+                    continue
+                dequeued = time.perf_counter()
+                pushed = self._send(frame.data)
+                sent = time.perf_counter()
+                if pushed is False:
+                    stats.frames_skipped += 1
+                else:
+                    stats.record_send(frame, dequeued, (sent - dequeued) * 1000)
+                # Never bank missed slots: a slow write must not cause a burst.
+                next_due = max(next_due + self._period, sent)
+                handled = stats.frames_sent + stats.frames_skipped
+                if max_frames is not None and handled >= max_frames:
+                    break
+                if next_report is not None and sent >= next_report:
+                    self._update_stats(sent)
+                    if on_stats is not None:
+                        on_stats(stats)
+                    next_report = sent + stats_interval  # type: ignore[operator]
+        finally:
+            self.stop()
+            self._update_stats(time.perf_counter())
+        if self._error is not None:
+            raise LCDStreamError(f"Frame source failed: {self._error}") from self._error
+        return stats
+
+    def _update_stats(self, now: float) -> None:
+        self.stats.elapsed = now - self.stats.started
+        self.stats.frames_dropped = self._queue.dropped
+
+    def _read_frames(self) -> None:
+        iterator = iter(self._frames)
+        try:
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                try:
+                    data = next(iterator)
+                except StopIteration:
+                    break
+                now = time.perf_counter()
+                self.stats.frames_read += 1
+                self._queue.put(Frame(data, now, (now - started) * 1000))
+        except Exception as exc:  # reported from run()
+            logger.debug("LCD frame source failed: %s", exc)
+            self._error = exc
+        finally:
+            self._queue.close()
@@ -0,0 +1,156 @@
+"""Contiguous interleaved RGB storage for LED animations."""
+
+from __future__ import annotations
+
+from typing import Iterator, Sequence, Union
+
+__all__ = ["LEDFrameBuffer"]
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+# Maps any non-zero byte to 0xFF so per-LED "lit" masks can be built with
+# bytes.translate instead of a Python loop.
+_LIT_MASK = bytes([0]) + bytes([0xFF]) * 255
+
+
+class LEDFrameBuffer:
+    """LED animation stored as one contiguous ``R, G, B`` interleaved buffer.
+
+    Frame ``i`` occupies ``led_count * 3`` bytes starting at
+    ``i * frame_size``. :meth:`frame` and iteration hand out memoryview
+    slices, so walking an effect never copies frame data. Buffers created
+    from immutable bytes are read-only; use :meth:`blank` for a writable one.
+    """
+
+    __slots__ = ("led_count", "_data")
+
+    def __init__(self, data: BufferLike, led_count: int) -> None:
+        if led_count <= 0:
+            raise ValueError("led_count must be positive")
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        frame_size = led_count * 3
+        if len(data) % frame_size:
+            raise ValueError(
+                f"LED data length {len(data)} is not a multiple of the "
+                f"{frame_size}-byte frame size"
+            )
+        self.led_count = led_count
+        self._data: Union[bytes, bytearray] = data
+
+    @classmethod
+    def blank(cls, frame_count: int, led_count: int) -> "LEDFrameBuffer":
+        return cls(bytearray(max(0, frame_count) * led_count * 3), led_count)
+
+    @classmethod
+    def from_planes(
+        cls, frames: Sequence[Sequence[Sequence[int]]], led_count: int
+    ) -> "LEDFrameBuffer":
+        """Interleave generator output laid out as ``[red, green, blue]`` lists."""
+
+        buffer = cls.blank(len(frames), led_count)
+        for index, frame in enumerate(frames):
+            buffer.set_frame_planes(index, frame)
+        return buffer
+
+    @property
+    def frame_size(self) -> int:
+        return self.led_count * 3
+
+    @property
+    def buffer(self) -> memoryview:
+        return memoryview(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data) // self.frame_size
+
+    def __iter__(self) -> Iterator[memoryview]:
+        view = memoryview(self._data)
+        size = self.frame_size
+        for start in range(0, len(self._data), size):
+            yield view[start : start + size]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LEDFrameBuffer):
+            return NotImplemented
+        return self.led_count == other.led_count and self._data == other._data
+
+    def frame(self, index: int) -> memoryview:
+        start = self._frame_start(index)
+        return memoryview(self._data)[start : start + self.frame_size]
+
+    def set_frame(self, index: int, rgb: BufferLike) -> None:
+        if len(rgb) != self.frame_size:
+            raise ValueError(
+                f"Frame must be {self.frame_size} bytes (got {len(rgb)})"
+            )
+        start = self._frame_start(index)
+        self._writable()[start : start + self.frame_size] = rgb
+
+    def set_frame_planes(self, index: int, planes: Sequence[Sequence[int]]) -> None:
+        start = self._frame_start(index)
+        end = start + self.frame_size
+        data = self._writable()
+        for channel in range(3):
+            plane = planes[channel]
+            if len(plane) != self.led_count:
+                raise ValueError(
+                    f"Frame planes must hold {self.led_count} LEDs (got {len(plane)})"
+                )
+            data[start + channel : end : 3] = bytes(plane)
+
+    def overlay(self, back: "LEDFrameBuffer") -> "LEDFrameBuffer":
+        """Return a copy with every lit LED of ``back`` drawn over this buffer.
+
+        An LED is lit when any of its channels is non-zero. The shorter
+        animation loops so the result spans the longer one.
+        """
+
+        if back.led_count != self.led_count:
+            raise ValueError("Cannot overlay buffers with different LED counts")
+        if not len(back):
+            return self
+        if not len(self):
+            return back
+        total = max(len(self), len(back))
+        front_rgb = self._cycled(total)
+        back_rgb = back._cycled(total)
+        size = total * self.led_count
+        back_channels = [
+            int.from_bytes(back_rgb[channel::3], "little") for channel in range(3)
+        ]
+        lit = (back_channels[0] | back_channels[1] | back_channels[2]).to_bytes(
+            size, "little"
+        )
+        keep = int.from_bytes(lit.translate(_LIT_MASK), "little") ^ (
+            (1 << (8 * size)) - 1
+        )
+        merged = bytearray(len(front_rgb))
+        for channel in range(3):
+            front = int.from_bytes(front_rgb[channel::3], "little")
+            merged[channel::3] = ((front & keep) | back_channels[channel]).to_bytes(
+                size, "little"
+            )
+        return LEDFrameBuffer(merged, self.led_count)
+
+    def tobytes(self) -> bytes:
+        return bytes(self._data)
+
+    def _cycled(self, frame_count: int) -> Union[bytes, bytearray]:
+        if frame_count == len(self):
+            return self._data
+        repeats = -(-frame_count // len(self))
+        return (bytes(self._data) * repeats)[: frame_count * self.frame_size]
+
+    def _frame_start(self, index: int) -> int:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("frame index out of range")
+        return index * self.frame_size
+
+    def _writable(self) -> bytearray:
+        if not isinstance(self._data, bytearray):
+            raise TypeError("LED frame buffer is read-only")
+        return self._data
@@ -0,0 +1,241 @@
+"""Adaptive RF pacing learned per wireless sender dongle."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from .effect_cache import CACHE_DIR_ENV, default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+PACING_ENV = "UWS_RF_PACING"
+
+# Starting point for a dongle we have never talked to, as a fraction of the
+# fixed timings below, and the tightest pacing the controller will try.
+INITIAL_SCALE = 0.25
+MIN_SCALE = 0.1
+
+_SUCCESS_FACTOR = 0.85
+_FAILURE_FACTOR = 2.0
+_FLOOR_MARGIN = 1.25
+_STATE_FILE = "rf_pacing.json"
+_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class RFPacing:
+    """Delays used while streaming RF payloads through the sender."""
+
+    chunk_interval: float
+    packet_interval: float
+    header_repeat_interval: float
+    header_repeats: int
+
+    def scaled(self, scale: float) -> "RFPacing":
+        # Only the gaps are learned. Upload feedback cannot tell that a
+        # receiver missed packet 0, so its re-sends are never traded away.
+        return RFPacing(
+            chunk_interval=self.chunk_interval * scale,
+            packet_interval=self.packet_interval * scale,
+            header_repeat_interval=self.header_repeat_interval * scale,
+            header_repeats=self.header_repeats,
+        )
+
+
+# Timings used by the vendor software; always safe, and used verbatim when
+# adaptive pacing is disabled.
+FIXED_PACING = RFPacing(
+    chunk_interval=0.002,
+    packet_interval=0.01,
+    header_repeat_interval=0.02,
+    header_repeats=3,
+)
+
+
+def default_state_path() -> Path:
+    """Return the file holding learned pacing, next to the effect cache."""
+
+    if os.environ.get(CACHE_DIR_ENV):
+        return default_cache_dir() / _STATE_FILE
+    return default_cache_dir().parent / _STATE_FILE
+
+
+def adaptive_enabled(mode: Optional[str] = None) -> bool:
+    """Resolve the pacing mode from ``mode`` or ``$UWS_RF_PACING``.
+
+    Fixed pacing is the default: receivers do not acknowledge LED effects,
+    so a silently dropped upload still counts as a success and adaptive
+    pacing can only be trusted where the user has verified it.
+    """
+
+    value = (mode or os.environ.get(PACING_ENV) or "fixed").strip().lower()
+    return value == "adaptive"
+
+
+class AdaptivePacing:
+    """Pacing controller for a single sender location.
+
+    Every clean transfer tightens the delays a little; a write error or a
+    receiver that drops out after an upload backs them off sharply and
+    raises the floor so the controller stops probing below a known-bad gap.
+    Backoffs are written to the store at once; everything else is kept in
+    memory until :meth:`flush`.
+    """
+
+    def __init__(
+        self,
+        store: "PacingStore",
+        location: str,
+        *,
+        scale: float = INITIAL_SCALE,
+        floor: float = MIN_SCALE,
+        pending: Optional[Set[str]] = None,
+    ) -> None:
+        self._store = store
+        self.location = location
+        self.floor = min(1.0, max(MIN_SCALE, floor))
+        self.scale = min(1.0, max(self.floor, scale))
+        self.pending: Set[str] = set(pending or ())
+
+    @property
+    def current(self) -> RFPacing:
+        return FIXED_PACING.scaled(self.scale)
+
+    def record_success(self) -> None:
+        scale = max(self.floor, self.scale * _SUCCESS_FACTOR)
+        if scale != self.scale:
+            self.scale = scale
+            self._store.mark_dirty()
+
+    def record_failure(self, reason: str) -> None:
+        failed = self.scale
+        self.floor = min(1.0, max(self.floor, failed * _FLOOR_MARGIN))
+        self.scale = min(1.0, max(self.floor, failed * _FAILURE_FACTOR))
+        logger.info(
+            "Backing off RF pacing for sender %s (%s): scale %.2f -> %.2f",
+            self.location,
+            reason,
+            failed,
+            self.scale,
+        )
+        self._store.save()
+
+    def expect_receiver(self, mac: str) -> None:
+        """Remember ``mac`` so the next listing can confirm it kept up."""
+
+        mac = mac.lower()
+        if mac not in self.pending:
+            self.pending.add(mac)
+            self._store.mark_dirty()
+
+    def confirm_receivers(self, bound_macs: Set[str]) -> None:
+        if not self.pending:
+            return
+        missing = sorted(self.pending - bound_macs)
+        self.pending.clear()
+        if missing:
+            self.record_failure(f"{', '.join(missing)} missing after upload")
+        else:
+            self._store.mark_dirty()
+
+    def flush(self) -> None:
+        self._store.flush()
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "scale": self.scale,
+            "floor": self.floor,
+            "pending": sorted(self.pending),
+        }
+
+
+class PacingStore:
+    """JSON file of learned pacing keyed by sender USB location.
+
+    Like the effect cache, filesystem errors never propagate: an unreadable
+    or unwritable store just means pacing starts from scratch.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path else default_state_path()
+        self._controllers: Dict[str, AdaptivePacing] = {}
+        self._loaded: Optional[Dict[str, dict]] = None
+        self._dirty = False
+
+    def controller(self, location: str) -> AdaptivePacing:
+        existing = self._controllers.get(location)
+        if existing is not None:
+            return existing
+        saved = self._load().get(location, {})
+        try:
+            controller = AdaptivePacing(
+                self,
+                location,
+                scale=float(saved.get("scale", INITIAL_SCALE)),
+                floor=float(saved.get("floor", MIN_SCALE)),
+                pending={str(mac) for mac in saved.get("pending", [])},
+            )
+        except (TypeError, ValueError):
+            controller = AdaptivePacing(self, location)
+        self._controllers[location] = controller
+        return controller
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def flush(self) -> None:
+        """Write pending changes, if any."""
+
+        if self._dirty:
+            self.save()
+
+    def save(self) -> None:
+        self._dirty = False
+        senders = dict(self._load())
+        for location, controller in self._controllers.items():
+            senders[location] = controller.as_dict()
+        data = json.dumps(
+            {"format": _FORMAT_VERSION, "senders": senders}, sort_keys=True
+        )
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    handle.write(data)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+                raise
+        except OSError as exc:
+            logger.debug("RF pacing state write failed for %s: %s", self.path, exc)
+
+    def _load(self) -> Dict[str, dict]:
+        if self._loaded is None:
+            self._loaded = {}
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                return self._loaded
+            except (OSError, ValueError) as exc:
+                logger.debug(
+                    "Ignoring unreadable RF pacing state %s: %s", self.path, exc
+                )
+                return self._loaded
+            if isinstance(raw, dict) and raw.get("format") == _FORMAT_VERSION:
+                senders = raw.get("senders")
+                if isinstance(senders, dict):
+                    self._loaded = {
+                        str(key): value
+                        for key, value in senders.items()
+                        if isinstance(value, dict)
+                    }
+        return self._loaded
@@ -2,13 +2,45 @@
 
 from __future__ import annotations
 
+import errno
+import logging
 import os
 import re
+import socket
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+SYSFS_ROOT = Path("/sys")
+SYSFS_USB_DEVICES = SYSFS_ROOT / "bus/usb/devices"
+DEV_BUS_USB = Path("/dev/bus/usb")
+
+# How long an index may serve results when no change notification source
+# is available (e.g. ioreg on macOS).
+DEFAULT_INDEX_MAX_AGE = 2.0
+
+# (vendor_id, product_id) pairs accepted by the filtered scanners.
+USBIds = Collection[Tuple[int, int]]
+
+_NETLINK_KOBJECT_UEVENT = 15
+_UEVENT_KERNEL_GROUP = 1
 
 
 @dataclass
@@ -108,46 +140,118 @@ def _parse_ioreg(text: str) -> List[USBRecord]:
     return devices
 
 
-def _scan_linux_sysfs() -> List[USBRecord]:
-    root = Path("/sys/bus/usb/devices")
-    if not root.exists():
-        return []
+def _read_uevent(entry: Path) -> Dict[str, str]:
+    text = _read_text(entry / "uevent")
+    if not text:
+        return {}
+    fields: Dict[str, str] = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            fields[key] = value
+    return fields
+
+
+def _uevent_identity(
+    fields: Mapping[str, str],
+) -> Optional[Tuple[int, int, Optional[int]]]:
+    """(vid, pid, location) from uevent ``PRODUCT``/``BUSNUM``/``DEVNUM`` keys."""
+
+    parts = fields.get("PRODUCT", "").split("/")
+    if len(parts) < 2:
+        return None
+    vendor_id = _parse_int(parts[0], base=16)
+    product_id = _parse_int(parts[1], base=16)
+    if vendor_id is None or product_id is None:
+        return None
+    busnum = _parse_int(fields.get("BUSNUM"))
+    devnum = _parse_int(fields.get("DEVNUM"))
+    location_id = None
+    if busnum is not None and devnum is not None:
+        location_id = (busnum << 8) | devnum
+    return vendor_id, product_id, location_id
+
+
+def _attribute_identity(entry: Path) -> Optional[Tuple[int, int, Optional[int]]]:
+    vendor_id = _parse_int(_read_text(entry / "idVendor"), base=16)
+    product_id = _parse_int(_read_text(entry / "idProduct"), base=16)
+    if vendor_id is None or product_id is None:
+        return None
+    busnum = _parse_int(_read_text(entry / "busnum"))
+    devnum = _parse_int(_read_text(entry / "devnum"))
+    location_id = None
+    if busnum is not None and devnum is not None:
+        location_id = (busnum << 8) | devnum
+    return vendor_id, product_id, location_id
+
+
+def _sysfs_identity(
+    entry: Path, fields: Optional[Mapping[str, str]] = None
+) -> Optional[Tuple[int, int, Optional[int]]]:
+    identity = _uevent_identity(fields if fields is not None else _read_uevent(entry))
+    if identity is None:
+        identity = _attribute_identity(entry)
+    return identity
+
+
+def _read_sysfs_device(
+    entry: Path,
+    ids: Optional[USBIds] = None,
+    *,
+    fields: Optional[Mapping[str, str]] = None,
+) -> Optional[USBRecord]:
+    """Build a record for one sysfs device directory.
+
+    The identity comes from a single ``uevent`` read (or ``fields`` already
+    taken from a hotplug event), falling back to the individual attribute
+    files. String descriptors are only read once the device passes ``ids``.
+    """
+
+    identity = _sysfs_identity(entry, fields)
+    if identity is None:
+        return None
+    vendor_id, product_id, location_id = identity
+    if ids is not None and (vendor_id, product_id) not in ids:
+        return None
+    return USBRecord(
+        vendor_id=vendor_id,
+        product_id=product_id,
+        product=_read_text(entry / "product"),
+        vendor=_read_text(entry / "manufacturer"),
+        serial=_read_text(entry / "serial"),
+        location_id=location_id,
+    )
+
+
+def _scan_linux_sysfs(ids: Optional[USBIds] = None) -> List[USBRecord]:
+    root = SYSFS_USB_DEVICES
     devices: List[USBRecord] = []
-    for entry in root.iterdir():
-        if ":" in entry.name or not entry.is_dir():
-            continue
-        vid_str = _read_text(entry / "idVendor")
-        pid_str = _read_text(entry / "idProduct")
-        vendor_id = _parse_int(vid_str, base=16)
-        product_id = _parse_int(pid_str, base=16)
-        if vendor_id is None or product_id is None:
-            continue
-        product = _read_text(entry / "product")
-        vendor = _read_text(entry / "manufacturer")
-        serial = _read_text(entry / "serial")
-        busnum = _parse_int(_read_text(entry / "busnum"))
-        devnum = _parse_int(_read_text(entry / "devnum"))
-        location_id = None
-        if busnum is not None and devnum is not None:
-            location_id = (busnum << 8) | devnum
-        devices.append(
-            USBRecord(
-                vendor_id=vendor_id,
-                product_id=product_id,
-                product=product,
-                vendor=vendor,
-                serial=serial,
-                location_id=location_id,
-            ),
-        )
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        return devices
+    with entries:
+        for entry in entries:
+            # Interfaces ("1-2:1.0") carry the same PRODUCT key as their device.
+            if ":" in entry.name:
+                continue
+            record = _read_sysfs_device(Path(entry.path), ids)
+            if record is not None:
+                devices.append(record)
     return devices
 
 
-def scan_usb_devices() -> List[USBRecord]:
+def scan_usb_devices(ids: Optional[USBIds] = None) -> List[USBRecord]:
+    """List attached USB devices, optionally only those matching ``ids``.
+
+    Passing ``ids`` on Linux skips the string descriptor reads for every
+    other device on the bus.
+    """
+
     if os.name != "posix":
         return []
     if sys.platform.startswith("linux"):
-        return _scan_linux_sysfs()
+        return _scan_linux_sysfs(ids)
     try:
         result = subprocess.run(
             ["ioreg", "-p", "IOUSB", "-l", "-w0"],
@@ -159,12 +263,265 @@ def scan_usb_devices() -> List[USBRecord]:
         return []
     if result.returncode != 0:
         return []
-    return _parse_ioreg(result.stdout)
+    records = _parse_ioreg(result.stdout)
+    if ids is not None:
+        records = [rec for rec in records if (rec.vendor_id, rec.product_id) in ids]
+    return records
 
 
 def find_devices_by_vid_pid(vendor_id: int, product_id: int) -> List[USBRecord]:
-    return [
-        rec
-        for rec in scan_usb_devices()
-        if rec.vendor_id == vendor_id and rec.product_id == product_id
-    ]
+    return default_index().find(vendor_id, product_id)
+
+
+def register_usb_ids(ids: Iterable[Tuple[int, int]]) -> None:
+    """Add (vid, pid) pairs the process-wide index should scan for."""
+
+    ids = list(ids)
+    with _default_index_lock:
+        _known_ids.update(ids)
+        index = _default_index
+    if index is not None:
+        index.add_ids(ids)
+
+
+class _UeventMonitor:
+    """Non-blocking reader of kernel uevents for USB devices (Linux only)."""
+
+    def __init__(self) -> None:
+        family = getattr(socket, "AF_NETLINK", None)
+        if family is None:
+            raise OSError(errno.EAFNOSUPPORT, "netlink is not available")
+        self._sock = socket.socket(family, socket.SOCK_DGRAM, _NETLINK_KOBJECT_UEVENT)
+        try:
+            self._sock.bind((0, _UEVENT_KERNEL_GROUP))
+            self._sock.setblocking(False)
+        except OSError:
+            self._sock.close()
+            raise
+
+    def drain(self) -> Optional[List[Dict[str, str]]]:
+        """Return pending USB device events, or ``None`` if any were lost."""
+
+        events: List[Dict[str, str]] = []
+        while True:
+            try:
+                message = self._sock.recv(65536)
+            except BlockingIOError:
+                return events
+            except OSError as exc:
+                if exc.errno == errno.ENOBUFS:
+                    return None
+                raise
+            event = _parse_uevent(message)
+            if event is not None:
+                events.append(event)
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+def _parse_uevent(message: bytes) -> Optional[Dict[str, str]]:
+    fields = message.split(b"\0")
+    if not fields or b"@" not in fields[0]:
+        return None  # not a kernel uevent
+    event: Dict[str, str] = {}
+    for field in fields[1:]:
+        key, sep, value = field.partition(b"=")
+        if sep:
+            event[key.decode("ascii", "replace")] = value.decode("utf-8", "replace")
+    if event.get("SUBSYSTEM") != "usb" or event.get("DEVTYPE") != "usb_device":
+        return None
+    return event
+
+
+class USBDeviceIndex:
+    """In-process USB device table built from one bus scan.
+
+    Lookups by (vid, pid), serial and location never rescan while the bus
+    is unchanged. On Linux a netlink uevent socket applies hotplug adds and
+    removes incrementally. A changed ``/dev/bus/usb`` triggers a rescan,
+    also while the socket is open, since containers may bind it and never
+    receive an event; without usbfs, results are reused for ``max_age``
+    seconds.
+
+    With ``ids`` only those (vid, pid) pairs are indexed, so scans skip the
+    string descriptors of every other device; looking up a pair outside
+    the set adds it and rescans once.
+    """
+
+    def __init__(
+        self,
+        *,
+        scanner: Callable[[Optional[USBIds]], List[USBRecord]] = scan_usb_devices,
+        ids: Optional[USBIds] = None,
+        max_age: float = DEFAULT_INDEX_MAX_AGE,
+        watch: bool = True,
+    ) -> None:
+        self._scanner = scanner
+        self._ids: Optional[Set[Tuple[int, int]]] = None if ids is None else set(ids)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._records: Optional[List[USBRecord]] = None
+        self._by_id: Dict[Tuple[int, int], List[USBRecord]] = {}
+        self._by_serial: Dict[str, List[USBRecord]] = {}
+        self._by_location: Dict[int, USBRecord] = {}
+        self._scanned_at = 0.0
+        self._signature: Optional[Tuple[Tuple[str, int], ...]] = None
+        self._monitor: Optional[_UeventMonitor] = None
+        if watch and sys.platform.startswith("linux"):
+            try:
+                self._monitor = _UeventMonitor()
+            except OSError as exc:
+                logger.debug("USB hotplug events unavailable: %s", exc)
+
+    @property
+    def watching(self) -> bool:
+        return self._monitor is not None
+
+    def records(self) -> List[USBRecord]:
+        with self._lock:
+            return list(self._current())
+
+    def find(self, vendor_id: int, product_id: int) -> List[USBRecord]:
+        with self._lock:
+            self._add_ids([(vendor_id, product_id)])
+            self._current()
+            return list(self._by_id.get((vendor_id, product_id), ()))
+
+    def find_serial(self, serial: str) -> List[USBRecord]:
+        with self._lock:
+            self._current()
+            return list(self._by_serial.get(serial, ()))
+
+    def find_location(self, location_id: int) -> Optional[USBRecord]:
+        with self._lock:
+            self._current()
+            return self._by_location.get(location_id)
+
+    def add_ids(self, ids: Iterable[Tuple[int, int]]) -> None:
+        """Widen the ``ids`` filter; no-op for an unfiltered index."""
+
+        with self._lock:
+            self._add_ids(ids)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._records = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._monitor is not None:
+                self._monitor.close()
+                self._monitor = None
+
+    def _add_ids(self, ids: Iterable[Tuple[int, int]]) -> None:
+        if self._ids is None:
+            return
+        missing = set(ids) - self._ids
+        if missing:
+            self._ids.update(missing)
+            self._records = None
+
+    def _current(self) -> List[USBRecord]:
+        if self._records is not None and not self._apply_changes():
+            return self._records
+        self._signature = self._bus_signature()
+        self._set_records(self._scanner(self._ids))
+        self._scanned_at = time.monotonic()
+        return self._records  # type: ignore[return-value]
+
+    def _apply_changes(self) -> bool:
+        """Fold in hotplug changes; return True when a full rescan is needed."""
+
+        if self._monitor is not None:
+            try:
+                events = self._monitor.drain()
+            except OSError as exc:
+                logger.debug("Dropping USB hotplug monitor: %s", exc)
+                self._monitor.close()
+                self._monitor = None
+                return True
+            if events is None:
+                return True
+            for event in events:
+                if not self._apply_event(event):
+                    return True
+            if events:
+                # The events account for the usbfs changes they caused.
+                self._signature = self._bus_signature()
+                self._scanned_at = time.monotonic()
+                return False
+        signature = self._bus_signature()
+        if signature is not None:
+            return signature != self._signature
+        return time.monotonic() - self._scanned_at > self.max_age
+
+    def _apply_event(self, event: Dict[str, str]) -> bool:
+        action = event.get("ACTION")
+        busnum = _parse_int(event.get("BUSNUM"))
+        devnum = _parse_int(event.get("DEVNUM"))
+        if busnum is None or devnum is None:
+            return action not in ("add", "remove")
+        location_id = (busnum << 8) | devnum
+        records = [
+            record
+            for record in self._records or []
+            if record.location_id != location_id
+        ]
+        if action == "add":
+            devpath = event.get("DEVPATH", "").lstrip("/")
+            if not devpath:
+                return False
+            entry = SYSFS_ROOT / devpath
+            identity = _sysfs_identity(entry, event)
+            if identity is None:
+                return False
+            if self._ids is None or identity[:2] in self._ids:
+                record = _read_sysfs_device(entry, fields=event)
+                if record is None:
+                    return False
+                records.append(record)
+        elif action != "remove":
+            return True
+        self._set_records(records)
+        return True
+
+    def _set_records(self, records: List[USBRecord]) -> None:
+        self._records = records
+        self._by_id = {}
+        self._by_serial = {}
+        self._by_location = {}
+        for record in records:
+            key = (record.vendor_id, record.product_id)
+            self._by_id.setdefault(key, []).append(record)
+            if record.serial:
+                self._by_serial.setdefault(record.serial, []).append(record)
+            if record.location_id is not None:
+                self._by_location[record.location_id] = record
+
+    def _bus_signature(self) -> Optional[Tuple[Tuple[str, int], ...]]:
+        """Modification times of the usbfs bus directories, if present."""
+
+        try:
+            with os.scandir(DEV_BUS_USB) as entries:
+                return tuple(
+                    sorted((entry.name, entry.stat().st_mtime_ns) for entry in entries)
+                )
+        except OSError:
+            return None
+
+
+_default_index: Optional[USBDeviceIndex] = None
+_default_index_lock = threading.Lock()
+# Device ids the uwscli modules look up, registered as they are imported.
+_known_ids: Set[Tuple[int, int]] = set()
+
+
+def default_index() -> USBDeviceIndex:
+    """Return the process-wide device index, creating it on first use."""
+
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = USBDeviceIndex(ids=_known_ids)
+        return _default_index
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Sequence
+from typing import Dict, List, Sequence, Tuple
 
 __all__ = [
     "TinyUZError",
@@ -21,14 +21,32 @@ _DICT_SIZE_BYTES = 4  # Matches default tinyuz build configuration.
 _CTRL_STREAM_END = 3
 _CODE_TYPE_DICT = 0
 _CODE_TYPE_DATA = 1
+_MIN_DICT_MATCH_LEN = 2
+_MAX_DICT_MATCH_LEN = (1 << 16) - 1
+# Positions above this carry an implicit +1 length bias in the decoder; the
+# match finder never emits them so the stream stays bias-free.
+_BIG_POS_FOR_LEN = (1 << 11) + (1 << 9) + (1 << 7) - 1
+_SMALL_DICT_POS = 0x80
+_HASH_KEY_LEN = 3
+_HASH_CHAIN_DEPTH = 32
+_MATCH_COMPARE_STEP = 64
+
+
+def compress_led_payload(
+    payload: bytes | bytearray | memoryview,
+    *,
+    dict_size: int = _DICT_SIZE,
+    literal_only: bool = False,
+) -> bytes:
+    """Compress raw LED frame data using a TinyUZ encoder.
 
-
-def compress_led_payload(payload: bytes, *, dict_size: int = _DICT_SIZE) -> bytes:
-    """Compress raw LED frame data using a literal-only TinyUZ encoder.
+    Repeated byte runs are replaced with dictionary matches found through a
+    hash chain bounded by ``dict_size``; everything else is emitted as literals.
 
     Args:
         payload: Raw LED RGB data laid out frame-by-frame.
         dict_size: Dictionary size advertised in the output stream (defaults to 4 KiB).
+        literal_only: Skip match finding and emit every byte as a literal.
 
     Returns:
         Bytes encoded in the TinyUZ format.
@@ -42,8 +60,14 @@ def compress_led_payload(payload: bytes, *, dict_size: int = _DICT_SIZE) -> byte
     if dict_size <= 0 or dict_size >= (1 << (8 * _DICT_SIZE_BYTES)):
         raise ValueError("dict_size must be between 1 and 2^32-1")
 
-    writer = _TinyUZLiteralEncoder(dict_size=dict_size)
-    writer.write_literal(payload)
+    writer: _TinyUZLiteralEncoder
+    if literal_only:
+        writer = _TinyUZLiteralEncoder(dict_size=dict_size)
+        writer.write_literal(payload)
+    else:
+        match_writer = _TinyUZEncoder(dict_size=dict_size)
+        match_writer.write_payload(payload)
+        writer = match_writer
     writer.finish()
     return writer.to_bytes()
 
@@ -71,7 +95,7 @@ def generate_rainbow_frames(
 
 @dataclass
 class _BitStreamState:
-    code: List[int]
+    code: bytearray
     type_count: int = 0
     types_index: int | None = None
     dict_pos_back: int = 1
@@ -83,17 +107,41 @@ class _TinyUZLiteralEncoder:
 
     def __init__(self, *, dict_size: int) -> None:
         self._dict_size = dict_size
-        self._state = _BitStreamState(code=[])
+        self._state = _BitStreamState(code=bytearray())
 
         # Reserve space for the dictionary size header.
         for shift in range(_DICT_SIZE_BYTES):
             self._state.code.append((dict_size >> (8 * shift)) & 0xFF)
 
-    def write_literal(self, data: bytes) -> None:
-        for byte in data:
+    def write_literal(self, data: bytes | bytearray | memoryview) -> None:
+        size = len(data)
+        if not size:
+            return
+        state = self._state
+        code = state.code
+        offset = 0
+        # Top up a partially used type byte one literal at a time.
+        while state.type_count and offset < size:
             self._out_type(_CODE_TYPE_DATA)
-            self._state.code.append(byte)
-            self._state.is_have_data_back = True
+            code.append(data[offset])
+            offset += 1
+
+        # Each run of 8 literals is a 0xFF type byte followed by the 8 bytes.
+        groups = (size - offset) >> 3
+        if groups:
+            end = offset + (groups << 3)
+            block = bytearray(groups * 9)
+            block[0::9] = b"\xff" * groups
+            for lane in range(8):
+                block[lane + 1 :: 9] = data[offset + lane : end : 8]
+            code += block
+            offset = end
+
+        while offset < size:
+            self._out_type(_CODE_TYPE_DATA)
+            code.append(data[offset])
+            offset += 1
+        state.is_have_data_back = True
 
     def finish(self) -> None:
         self._out_ctrl(_CTRL_STREAM_END)
@@ -153,12 +201,11 @@ class _TinyUZLiteralEncoder:
     def _out_dict_pos(self, pos: int) -> None:
         if pos < 0:
             raise TinyUZError("Dictionary position cannot be negative")
-        if pos < 0x80:
+        if pos < _SMALL_DICT_POS:
             self._state.code.append(pos & 0x7F)
         else:
-            raise TinyUZError(
-                "Dictionary positions >=128 are not supported in literal encoder"
-            )
+            self._state.code.append((pos & 0x7F) | _SMALL_DICT_POS)
+            self._out_len((pos >> 7) - 1, pack_bit=2)
 
     def _reset_types(self) -> None:
         self._state.type_count = 0
@@ -167,6 +214,118 @@ class _TinyUZLiteralEncoder:
         self._state.is_have_data_back = False
 
 
+class _TinyUZEncoder(_TinyUZLiteralEncoder):
+    """TinyUZ encoder that emits dictionary matches found via a hash chain."""
+
+    def __init__(
+        self, *, dict_size: int, chain_depth: int = _HASH_CHAIN_DEPTH
+    ) -> None:
+        super().__init__(dict_size=dict_size)
+        self._window = min(dict_size, _BIG_POS_FOR_LEN)
+        self._chain_depth = max(1, chain_depth)
+
+    def write_payload(self, data: bytes | bytearray | memoryview) -> None:
+        data = bytes(data)
+        size = len(data)
+        heads: Dict[bytes, int] = {}
+        chain = [-1] * size
+        last_key = size - _HASH_KEY_LEN
+        literal_start = 0
+        pos = 0
+        while pos < size:
+            length, distance = self._find_match(data, pos, heads, chain)
+            if length:
+                if literal_start < pos:
+                    self.write_literal(data[literal_start:pos])
+                self.write_match(length, distance)
+                end = pos + length
+            else:
+                end = pos + 1
+            for index in range(pos, min(end, last_key + 1)):
+                key = data[index : index + _HASH_KEY_LEN]
+                chain[index] = heads.get(key, -1)
+                heads[key] = index
+            if length:
+                literal_start = end
+            pos = end
+        if literal_start < size:
+            self.write_literal(data[literal_start:])
+
+    def write_match(self, length: int, distance: int) -> None:
+        if not _MIN_DICT_MATCH_LEN <= length <= _MAX_DICT_MATCH_LEN:
+            raise TinyUZError(f"Match length {length} is out of range")
+        if not 0 < distance <= self._window:
+            raise TinyUZError(f"Match distance {distance} is out of range")
+        state = self._state
+        is_same_pos = distance == state.dict_pos_back
+        self._out_type(_CODE_TYPE_DICT)
+        self._out_len(length - _MIN_DICT_MATCH_LEN, pack_bit=1)
+        if state.is_have_data_back:
+            self._out_type(1 if is_same_pos else 0)
+        if not (is_same_pos and state.is_have_data_back):
+            self._out_dict_pos(distance)
+        state.is_have_data_back = False
+        state.dict_pos_back = distance
+
+    def _find_match(
+        self,
+        data: bytes,
+        pos: int,
+        heads: Dict[bytes, int],
+        chain: List[int],
+    ) -> Tuple[int, int]:
+        limit = min(_MAX_DICT_MATCH_LEN, len(data) - pos)
+        if limit < _MIN_DICT_MATCH_LEN:
+            return 0, 0
+        max_distance = min(self._window, pos)
+        best_len = 0
+        best_distance = 0
+
+        # The previous distance is free to reuse right after literals.
+        rep = self._state.dict_pos_back
+        if 0 < rep <= max_distance:
+            best_len = _match_length(data, pos - rep, pos, limit)
+            best_distance = rep
+
+        if limit >= _HASH_KEY_LEN:
+            candidate = heads.get(data[pos : pos + _HASH_KEY_LEN], -1)
+            depth = self._chain_depth
+            while candidate >= 0 and depth and best_len < limit:
+                distance = pos - candidate
+                if distance > max_distance:
+                    break
+                length = _match_length(data, candidate, pos, limit)
+                if length > best_len:
+                    best_len = length
+                    best_distance = distance
+                candidate = chain[candidate]
+                depth -= 1
+
+        if best_len < _MIN_DICT_MATCH_LEN:
+            return 0, 0
+        if best_len == _MIN_DICT_MATCH_LEN and best_distance >= _SMALL_DICT_POS:
+            # Two literals are never larger than a short match with a long position.
+            if best_distance != rep or not self._state.is_have_data_back:
+                return 0, 0
+        return best_len, best_distance
+
+
+def _match_length(data: bytes, source: int, target: int, limit: int) -> int:
+    """Return how many bytes at ``target`` repeat those at ``source``."""
+
+    length = 0
+    step = _MATCH_COMPARE_STEP
+    while (
+        length + step <= limit
+        and data[source + length : source + length + step]
+        == data[target + length : target + length + step]
+    ):
+        length += step
+    while length < limit and data[source + length] == data[target + length]:
+        length += 1
+    return length
+
+
 def _hsv_to_rgb(h: float, s: float, v: float) -> Sequence[int]:
     h = h % 1.0
     s = max(0.0, min(1.0, s))
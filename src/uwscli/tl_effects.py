@@ -7,6 +7,8 @@ import zlib
 from enum import Enum, unique
 from typing import Any, List
 
+from .led_frames import LEDFrameBuffer
+
 
 @unique
 class TLEffects(Enum):
@@ -568,6 +570,20 @@ class TLEffectGenerator:
                 f"{effect.name} generator is not defined in the original TLMode set."
             ) from exc
 
+    def generate_buffer(
+        self,
+        effect: TLEffects,
+        tb: int,
+        fan_count: int,
+        brightness: int,
+        direction: int,
+    ) -> LEDFrameBuffer:
+        """Like :meth:`generate`, but packed into an interleaved frame buffer."""
+
+        frames = self.generate(effect, tb, fan_count, brightness, direction)
+        led_count = self._normalize_fans(fan_count) * self.LEDS_PER_FAN
+        return LEDFrameBuffer.from_planes(frames, led_count)
+
     def _rainbow(
         self, tb: int, fans: int, bright: int, direction: int
     ) -> List[List[List[int]]]:
@@ -700,6 +716,24 @@ class TLEffectGenerator:
     def _color_cycle(
         self, tb: int, fans: int, bright: int, direction: int
     ) -> List[List[List[int]]]:
+        num = fans * self.HALF_RING
+        template = self._color_cycle_template(tb, fans)
+        frames: List[List[List[int]]] = []
+        for k in range(num):
+            ring = [[0] * num for _ in range(3)]
+            idx = k
+            for j in range(num):
+                pos = num - j - 1 if direction == 0 else j
+                ring[0][pos] = (template[0][idx] * bright) >> 8
+                ring[1][pos] = (template[1][idx] * bright) >> 8
+                ring[2][pos] = (template[2][idx] * bright) >> 8
+                idx += 1
+                if idx >= num:
+                    idx = 0
+            frames.append(self._project_half(tb, fans, ring))
+        return frames
+
+    def _color_cycle_template(self, tb: int, fans: int) -> List[List[int]]:
         num = fans * self.HALF_RING
         template = [[0] * num for _ in range(3)]
         num2 = 0
@@ -730,38 +764,14 @@ class TLEffectGenerator:
                     template[0][num2] = 0
                     template[1][num2] = 0
                     template[2][num2] = 0
-        frames: List[List[List[int]]] = []
-        for k in range(num):
-            ring = [[0] * num for _ in range(3)]
-            idx = k
-            for j in range(num):
-                pos = num - j - 1 if direction == 0 else j
-                ring[0][pos] = (template[0][idx] * bright) >> 8
-                ring[1][pos] = (template[1][idx] * bright) >> 8
-                ring[2][pos] = (template[2][idx] * bright) >> 8
-                idx += 1
-                if idx >= num:
-                    idx = 0
-            frames.append(self._project_half(tb, fans, ring))
-        return frames
+        return template
 
     def _staggered(
         self, tb: int, fans: int, bright: int, direction: int
     ) -> List[List[List[int]]]:
         num = fans * self.HALF_RING
         palette = SLV3_USER_COLOUR[tb]
-        segments = max(1, len(palette) * 2)
-        segment_len = max(1, num // segments)
-        pattern: List[int] = []
-        for segment in range(segments):
-            colour_idx = segment // 2
-            value = colour_idx if segment % 2 == 0 else -1
-            for _ in range(segment_len):
-                if len(pattern) >= num:
-                    break
-                pattern.append(value)
-        while len(pattern) < num:
-            pattern.append(-1)
+        pattern = self._staggered_pattern(len(palette), num)
 
         frames: List[List[List[int]]] = []
         for shift in range(num):
@@ -776,6 +786,22 @@ class TLEffectGenerator:
             frames.append(self._project_half(tb, fans, ring))
         return frames
 
+    @staticmethod
+    def _staggered_pattern(palette_len: int, num: int) -> List[int]:
+        segments = max(1, palette_len * 2)
+        segment_len = max(1, num // segments)
+        pattern: List[int] = []
+        for segment in range(segments):
+            colour_idx = segment // 2
+            value = colour_idx if segment % 2 == 0 else -1
+            for _ in range(segment_len):
+                if len(pattern) >= num:
+                    break
+                pattern.append(value)
+        while len(pattern) < num:
+            pattern.append(-1)
+        return pattern
+
     def _tide(
         self, tb: int, fans: int, bright: int, direction: int
     ) -> List[List[List[int]]]:
@@ -1251,17 +1277,7 @@ class TLEffectGenerator:
         if num == 0:
             return []
         palette = SLV3_USER_COLOUR[tb]
-        segments = max(1, len(palette) * 4)
-        segment_len = max(1, num // segments)
-        base_pattern: List[List[int]] = []
-        for segment in range(segments):
-            colour = palette[segment % len(palette)]
-            for _ in range(segment_len):
-                if len(base_pattern) >= num:
-                    break
-                base_pattern.append(colour)
-        while len(base_pattern) < num:
-            base_pattern.append(palette[len(base_pattern) % len(palette)])
+        base_pattern = self._kaleidoscope_pattern(palette, num)
 
         frames: List[List[List[int]]] = []
         for step in range(num):
@@ -1274,6 +1290,23 @@ class TLEffectGenerator:
             frames.append(self._project_half(tb, fans, ring))
         return frames
 
+    @staticmethod
+    def _kaleidoscope_pattern(
+        palette: List[List[int]], num: int
+    ) -> List[List[int]]:
+        segments = max(1, len(palette) * 4)
+        segment_len = max(1, num // segments)
+        base_pattern: List[List[int]] = []
+        for segment in range(segments):
+            colour = palette[segment % len(palette)]
+            for _ in range(segment_len):
+                if len(base_pattern) >= num:
+                    break
+                base_pattern.append(colour)
+        while len(base_pattern) < num:
+            base_pattern.append(palette[len(base_pattern) % len(palette)])
+        return base_pattern
+
     def _twinkle(self, tb: int, fans: int, bright: int) -> List[List[List[int]]]:
         data = _load_twinkle_tables()
         colour_map = data["map"]
@@ -0,0 +1,588 @@
+"""NumPy implementation of the TL effect generator.
+
+Produces the same frames as :class:`uwscli.tl_effects.TLEffectGenerator`, but
+computes whole animations as ``(frames, leds, 3)`` ``uint8`` arrays instead of
+nested lists. The layout matches the interleaved RGB stream sent to the
+receiver, so ``array.tobytes()`` is the raw LED payload. NumPy is optional;
+check :func:`is_available` before use.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Dict, List
+
+from .led_frames import LEDFrameBuffer
+from .tl_effects import (
+    METEOR_WEIGHTS,
+    RAINBOW_TABLES,
+    SLV3_USER_COLOUR,
+    TLEffectGenerator,
+    TLEffects,
+    _load_twinkle_tables,
+)
+
+np: Any
+
+try:
+    import numpy as _numpy
+
+    np = _numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+__all__ = ["NumpyTLEffectGenerator", "is_available"]
+
+_LEDS_PER_FAN = TLEffectGenerator.LEDS_PER_FAN
+_HALF_RING = TLEffectGenerator.HALF_RING
+
+
+def is_available() -> bool:
+    """Return True when NumPy is importable."""
+
+    return np is not None
+
+
+class NumpyTLEffectGenerator:
+    """Vectorised counterpart of :class:`TLEffectGenerator`.
+
+    Rings are built as ``(frames, positions, 3)`` integer arrays using the
+    same fixed-point scaling as the list-based generator, then projected onto
+    the requested fan half in one indexed assignment.
+    """
+
+    LEDS_PER_FAN = _LEDS_PER_FAN
+    HALF_RING = _HALF_RING
+
+    def __init__(self) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for NumpyTLEffectGenerator")
+
+    def generate(
+        self,
+        effect: TLEffects,
+        tb: int,
+        fan_count: int,
+        brightness: int,
+        direction: int,
+    ) -> Any:
+        tb = 0 if tb >= 2 else tb
+        fan_count = TLEffectGenerator._normalize_fans(fan_count)
+        brightness = max(0, min(255, int(brightness)))
+        direction = 0 if direction > 1 else max(0, int(direction))
+
+        handlers: Dict[TLEffects, Callable[[int, int, int, int], Any]] = {
+            TLEffects.RAINBOW: self._rainbow,
+            TLEffects.RAINBOW_MORPH: self._rainbow_morph,
+            TLEffects.STATIC_COLOR: self._static_color_quadrants,
+            TLEffects.BREATHING: self._breathing,
+            TLEffects.RUNWAY: self._runway,
+            TLEffects.METEOR: self._meteor,
+            TLEffects.COLOR_CYCLE: self._color_cycle,
+            TLEffects.STAGGERED: self._staggered,
+            TLEffects.TIDE: self._tide,
+            TLEffects.MIXING: self._mixing,
+            TLEffects.VOICE: self._voice,
+            TLEffects.DOOR: self._door,
+            TLEffects.RENDER: self._render,
+            TLEffects.RIPPLE: self._ripple,
+            TLEffects.REFLECT: self._reflect,
+            TLEffects.TAIL_CHASING: self._tail_chasing,
+            TLEffects.PAINT: self._paint,
+            TLEffects.PING_PONG: self._ping_pong,
+            TLEffects.STACK: self._stack,
+            TLEffects.COVER_CYCLE: self._cover_cycle,
+            TLEffects.WAVE: self._wave,
+            TLEffects.RACING: self._racing,
+            TLEffects.LOTTERY: self._lottery,
+            TLEffects.INTERTWINE: self._intertwine,
+            TLEffects.METEOR_SHOWER: self._meteor_shower,
+            TLEffects.COLLIDE: self._collide,
+            TLEffects.ELECTRIC_CURRENT: self._electric_current,
+            TLEffects.KALEIDOSCOPE: self._kaleidoscope,
+            TLEffects.TWINKLE: self._twinkle,
+        }
+
+        try:
+            handler = handlers[effect]
+        except KeyError as exc:
+            raise NotImplementedError(
+                f"{effect.name} generator is not defined in the original TLMode set."
+            ) from exc
+        frames = handler(tb, fan_count, brightness, direction)
+        return frames.astype(np.uint8)
+
+    def generate_buffer(
+        self,
+        effect: TLEffects,
+        tb: int,
+        fan_count: int,
+        brightness: int,
+        direction: int,
+    ) -> LEDFrameBuffer:
+        """Render ``effect`` straight into an interleaved frame buffer."""
+
+        frames = self.generate(effect, tb, fan_count, brightness, direction)
+        return LEDFrameBuffer(frames.tobytes(), frames.shape[1])
+
+    # --- Effects ---
+
+    def _rainbow(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        table = np.array(RAINBOW_TABLES[fans], dtype=np.int64).T
+        num = fans * self.HALF_RING
+        steps = np.arange(num)
+        ring = (table[(steps[:, None] + steps[None, :]) % len(table)] * bright) >> 8
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _rainbow_morph(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        red, green, blue = 255, 0, 0
+        colours: List[List[int]] = []
+        for step in range(255):
+            colours.append([red, green, blue])
+            if step < 85:
+                red -= 3
+                green += 3
+                blue = 0
+            elif step < 170:
+                red = 0
+                green -= 3
+                blue += 3
+            else:
+                red += 3
+                green = 0
+                blue -= 3
+        kept = np.array(colours[: (len(colours) // 2) * 2 : 2], dtype=np.int64)
+        ring = np.broadcast_to(
+            ((kept * bright) >> 8)[:, None, :],
+            (len(kept), fans * self.HALF_RING, 3),
+        )
+        return self._project_half(tb, fans, ring)
+
+    def _static_color_quadrants(
+        self, tb: int, fans: int, bright: int, direction: int
+    ) -> Any:
+        ring = np.zeros((fans * self.HALF_RING, 3), dtype=np.int64)
+        # Like the list generator, the four quadrants need a full 4-fan ring;
+        # out-of-range positions raise IndexError for smaller fan counts.
+        ring[np.arange(4 * self.HALF_RING)] = np.repeat(
+            (_palette(tb) * bright) >> 8, self.HALF_RING, axis=0
+        )
+        frames = np.broadcast_to(ring, (30,) + ring.shape)
+        return self._project_half(tb, fans, frames)
+
+    def _breathing(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        steps = np.arange(170)
+        levels = (np.where(steps <= 85, steps, 170 - steps) * 3) & 0xFF
+        colour_index = np.minimum(np.arange(num) // self.HALF_RING, 3)
+        base = _palette(tb)[colour_index]
+        ring = (base[None, :, :] * levels[:, None, None] * bright) >> 16
+        return self._project_half(tb, fans, ring)
+
+    def _runway(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        lit = _sweep_mask(num, fans * 2)
+        palette = (_palette(tb) * bright) >> 8
+        ring = np.where(lit[:, :, None], palette[0], palette[1])
+        frames = np.concatenate([ring, ring[:, ::-1]])
+        return self._project_half(tb, fans, frames)
+
+    def _meteor(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        span = fans * 2
+        weights = np.array(METEOR_WEIGHTS[fans - 1], dtype=np.int64)
+        lit = _sweep_mask(num, span)
+        sweep = np.arange(len(lit))
+        weight_index = np.arange(num)[None, :] - np.maximum(0, sweep - span + 1)[:, None]
+        lit &= weight_index < len(weights)
+        levels = np.where(lit, weights[np.clip(weight_index, 0, len(weights) - 1)], 0)
+        palette = _palette(tb)
+        blocks = [
+            (palette[block] * levels[:, :, None] * bright) >> 16 for block in range(4)
+        ]
+        ring = np.concatenate(blocks)
+        if direction != 0:
+            ring = ring[:, ::-1]
+        return self._project_half(tb, fans, ring)
+
+    def _color_cycle(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        template = np.array(
+            TLEffectGenerator()._color_cycle_template(tb, fans), dtype=np.int64
+        ).T
+        steps = np.arange(num)
+        ring = (template[(steps[:, None] + steps[None, :]) % num] * bright) >> 8
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _staggered(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        pattern = np.array(
+            TLEffectGenerator._staggered_pattern(len(palette), num), dtype=np.int64
+        )
+        steps = np.arange(num)
+        index = pattern[(steps[None, :] + steps[:, None]) % num]
+        colours = _scaled(palette[index % len(palette)], bright)
+        ring = np.where((index >= 0)[:, :, None], colours, 0)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _tide(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        frame_count = num * 2
+        phase = (2.0 * math.pi * np.arange(frame_count)) / frame_count
+        pos = np.arange(num)
+        wave = _sin(phase[:, None] + (math.pi * pos[None, :]) / max(1, num))
+        intensity = ((wave + 1.0) * 127.5).astype(np.int64)
+        band = (pos * len(palette)) // max(1, num)
+        ring = _scaled(palette[band % len(palette)][None, :, :], bright, intensity)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _mixing(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        base_a = palette[0]
+        base_b = palette[2]
+        steps = np.arange(num * 2)
+        pos = np.arange(num)
+        phase = 2.0 * math.pi * (steps[:, None] + pos[None, :]) / max(1, num)
+        ratio = (_sin(phase) + 1.0) * 0.5
+        blended = np.rint(base_a + (base_b - base_a) * ratio[:, :, None])
+        ring = _scaled(blended.astype(np.int64), bright)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _voice(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        palette = _palette(tb)
+        steps = np.arange(max(1, self.HALF_RING * 4))
+        fan_index = np.arange(fans)
+        amplitude = (
+            (_sin(steps[:, None] * 0.35 + fan_index[None, :]) + 1.0)
+            * (self.HALF_RING - 1)
+            * 0.5
+        ).astype(np.int64) + 1
+        amplitude = np.clip(amplitude, 1, self.HALF_RING)
+        offset = np.arange(self.HALF_RING)
+        lit = offset[None, None, :] < amplitude[:, :, None]
+        intensity = np.maximum(80, 255 - offset * 20)
+        colours = _scaled(
+            palette[fan_index % len(palette)][:, None, :], bright, intensity[None, :]
+        )
+        ring = np.where(lit[..., None], colours[None], 0)
+        ring = ring.reshape(len(steps), fans * self.HALF_RING, 3)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _door(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        half = self.HALF_RING
+        palette = _palette(tb)
+        frame_count = half * 2
+        steps = np.arange(frame_count)
+        extent = np.maximum(0, np.where(steps < half, steps, frame_count - steps - 1))
+        offset = np.abs(np.arange(half) - half // 2)
+        lit = offset[None, :] <= extent[:, None]
+        intensity = np.maximum(64, 255 - offset * 30)
+        fan_index = np.arange(fans)
+        colour = palette[(fan_index[None, :] + steps[:, None]) % len(palette)]
+        colours = _scaled(colour[:, :, None, :], bright, intensity[None, None, :])
+        ring = np.where(lit[:, None, :, None], colours, 0)
+        ring = ring.reshape(frame_count, fans * half, 3)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _render(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        period = max(1, num * 2)
+        steps = np.arange(period)
+        fill = np.clip(np.where(steps < num, steps, period - steps), 0, num)
+        lit = np.arange(num)[None, :] < fill[:, None]
+        colours = _scaled(palette[steps % len(palette)], bright)
+        ring = np.where(lit[:, :, None], colours[:, None, :], 0)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _ripple(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        steps = np.arange(num)
+        pos = np.arange(num)
+        distance = np.minimum(
+            (pos[None, :] - steps[:, None]) % num, (steps[:, None] - pos[None, :]) % num
+        )
+        intensity = np.maximum(
+            0, 255 - (distance * (255 / max(1, self.HALF_RING))).astype(np.int64)
+        )
+        group = max(1, self.HALF_RING // len(palette) or 1)
+        colour = palette[(pos // group) % len(palette)]
+        colours = _scaled(colour[None, :, :], bright, intensity)
+        ring = np.where((intensity > 0)[:, :, None], colours, 0)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _reflect(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        period = max(1, num * 2)
+        steps = np.arange(period)
+        idx = np.clip(np.where(steps < num, steps, period - steps - 1), 0, num - 1)
+        ring = np.zeros((period, num, 3), dtype=np.int64)
+        # The left LED wins when both ends meet, so it is written last.
+        ring[steps, num - idx - 1] = _scaled(palette[(steps + 1) % len(palette)], bright)
+        ring[steps, idx] = _scaled(palette[steps % len(palette)], bright)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _tail_chasing(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        tail = max(4, self.HALF_RING // 2)
+        steps = np.arange(num)
+        colour = palette[(steps // max(1, tail)) % len(palette)]
+        ring = np.zeros((num, num, 3), dtype=np.int64)
+        for offset in range(tail):
+            intensity = max(0, 255 - offset * (255 // max(1, tail)))
+            if intensity <= 0:
+                continue
+            ring[steps, (steps - offset) % num] = _scaled(colour, bright, intensity)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _paint(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        palette = _palette(tb)
+        block_len = self.HALF_RING
+        steps = np.arange(max(1, block_len * len(palette)))
+        colour_index = steps // max(1, block_len)
+        fill = steps % max(1, block_len)
+        lit = np.arange(self.HALF_RING)[None, :] <= fill[:, None]
+        fan_index = np.arange(fans)
+        colours = _scaled(
+            palette[(colour_index[:, None] + fan_index[None, :]) % len(palette)], bright
+        )
+        ring = np.where(lit[:, None, :, None], colours[:, :, None, :], 0)
+        ring = ring.reshape(len(steps), fans * self.HALF_RING, 3)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _ping_pong(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        track = self.HALF_RING
+        palette = _palette(tb)
+        period = max(1, 2 * (track - 1))
+        steps = np.arange(period)
+        offset = np.where(steps < track, steps, period - steps)
+        pos = np.arange(track)
+        head = pos[None, :] == offset[:, None]
+        trail = (pos[None, :] == offset[:, None] - 1) & (offset[:, None] > 0)
+        colour = palette[np.arange(fans) % len(palette)][:, None, :]
+        ring = np.where(
+            head[:, None, :, None],
+            _scaled(colour, bright),
+            np.where(trail[:, None, :, None], _scaled(colour, bright, 128), 0),
+        )
+        ring = ring.reshape(period, fans * track, 3)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _stack(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        span = fans
+        palette = (_palette(tb) * bright) >> 8
+        pos = np.arange(num)
+        masks = []
+        for level in range(self.HALF_RING):
+            remaining = num - level * span
+            sweep = np.arange(remaining)[:, None]
+            masks.append(
+                (pos[None, :] < remaining) & (pos[None, :] <= sweep) & (sweep < pos + span)
+            )
+        masks.append(pos[None, :] > np.arange(num)[:, None])
+        lit = np.concatenate(masks)
+        ring = np.concatenate(
+            [np.where(lit[:, :, None], palette[block], 0) for block in range(4)]
+        )
+        if direction != 0:
+            ring = ring[:, ::-1]
+        return self._project_half(tb, fans, ring)
+
+    def _cover_cycle(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        block = max(1, self.HALF_RING // 2)
+        steps = np.arange(num)
+        ring = np.zeros((num, num, 3), dtype=np.int64)
+        for offset in range(block):
+            colour = palette[(offset // max(1, block // len(palette))) % len(palette)]
+            intensity = max(80, 255 - offset * (200 // max(1, block)))
+            ring[steps, (steps + offset) % num] = _scaled(colour, bright, intensity)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _wave(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        frame_count = num * 2
+        steps = np.arange(frame_count)
+        pos = np.arange(num)
+        phase = (2.0 * math.pi * steps) / frame_count
+        wave = _sin(phase[:, None] + (2.0 * math.pi * pos[None, :]) / max(1, num))
+        intensity = ((wave + 1.0) * 127.5).astype(np.int64)
+        colour = palette[(pos[None, :] + steps[:, None]) % len(palette)]
+        ring = _scaled(colour, bright, intensity)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _racing(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        racers = max(1, min(4, fans + 1))
+        steps = np.arange(num)
+        ring = np.zeros((num, num, 3), dtype=np.int64)
+        for racer in range(racers):
+            speed = racer + 1
+            position = (steps * (speed + 1) + racer * (num // racers)) % num
+            intensity = max(120, 255 - racer * 45)
+            ring[steps, position] = _scaled(
+                palette[racer % len(palette)], bright, intensity
+            )
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _lottery(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        picks_per_frame = max(1, min(num, fans * 3))
+        frame_count = max(1, num // 2)
+        draws: List[List[int]] = []
+        state = 0x135724
+        for _ in range(frame_count):
+            local_state = state
+            row: List[int] = []
+            for _ in range(picks_per_frame):
+                local_state = (local_state * 1103515245 + 12345) & 0x7FFFFFFF
+                row.append(local_state)
+            draws.append(row)
+            state = (state * 1664525 + 1013904223) & 0xFFFFFFFF
+        values = np.array(draws, dtype=np.int64)
+        steps = np.arange(frame_count)
+        ring = np.zeros((frame_count, num, 3), dtype=np.int64)
+        for pick in range(picks_per_frame):
+            intensity = max(100, 255 - pick * 25)
+            colour = palette[(pick + values[:, pick]) % len(palette)]
+            ring[steps, values[:, pick] % max(1, num)] = _scaled(
+                colour, bright, intensity
+            )
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _intertwine(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        steps = np.arange(num)
+        ring = np.zeros((num, num, 3), dtype=np.int64)
+        for strand in range(max(1, num // 2)):
+            colour_a = _scaled(palette[strand % len(palette)], bright)
+            colour_b = _scaled(palette[(strand + 1) % len(palette)], bright, 192)
+            ring[steps, (2 * strand + steps) % num] = colour_a
+            ring[steps, (2 * strand + 1 - steps) % num] = colour_b
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _meteor_shower(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        meteors = max(1, min(4, fans * 2))
+        spacing = max(1, num // meteors)
+        tail = max(3, self.HALF_RING // 2)
+        steps = np.arange(num)
+        ring = np.zeros((num, num, 3), dtype=np.int64)
+        for meteor in range(meteors):
+            start = steps + meteor * spacing
+            colour = palette[meteor % len(palette)]
+            for offset in range(tail):
+                intensity = max(0, 255 - offset * (200 // max(1, tail)))
+                if intensity <= 0:
+                    continue
+                ring[steps, (start - offset) % num] = _scaled(colour, bright, intensity)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _collide(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        half = self.HALF_RING
+        num = fans * half
+        palette = _palette(tb)
+        steps = np.arange(half * 2)
+        offset = np.clip(np.where(steps < half, steps, half * 2 - steps - 1), 0, half - 1)
+        ring = np.zeros((len(steps), num, 3), dtype=np.int64)
+        for fan in range(fans):
+            base = fan * half
+            # Left wins when the two sparks overlap, so it is written last.
+            ring[steps, base + half - 1 - offset] = _scaled(
+                palette[(fan + 1) % len(palette)], bright
+            )
+            ring[steps, base + offset] = _scaled(palette[fan % len(palette)], bright)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _electric_current(
+        self, tb: int, fans: int, bright: int, direction: int
+    ) -> Any:
+        num = fans * self.HALF_RING
+        palette = _palette(tb)
+        steps = np.arange(max(1, num))
+        pos = np.arange(num)
+        noise = _sin(steps[:, None] * 1.7 + pos[None, :] * 2.3) + _sin(pos * 5.1)
+        intensity = (np.abs(noise) * 127.0).astype(np.int64)
+        colour = palette[(pos[None, :] + steps[:, None]) % len(palette)]
+        colours = _scaled(colour, bright, np.minimum(255, 96 + intensity))
+        ring = np.where((intensity > 32)[:, :, None], colours, 0)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _kaleidoscope(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        num = fans * self.HALF_RING
+        pattern = np.array(
+            TLEffectGenerator._kaleidoscope_pattern(SLV3_USER_COLOUR[tb], num),
+            dtype=np.int64,
+        )
+        steps = np.arange(num)
+        pos = np.arange(num)
+        mirrored = np.minimum(pos, num - pos - 1)
+        colour = pattern[(mirrored[None, :] + steps[:, None]) % len(pattern)]
+        ring = _scaled(colour, bright)
+        return self._project_half(tb, fans, _directed(ring, direction))
+
+    def _twinkle(self, tb: int, fans: int, bright: int, direction: int) -> Any:
+        data = _load_twinkle_tables()
+        total_leds = fans * self.LEDS_PER_FAN
+        colour_map = np.array(data["map"][:total_leds], dtype=np.int64)
+        values = np.array(
+            [frame[:total_leds] for frame in data["frames"]], dtype=np.int64
+        ).reshape(len(data["frames"]), total_leds)
+        colours = _palette(tb)[colour_map]
+        return (colours[None, :, :] * values[:, :, None] * bright) >> 16
+
+    # --- Helpers ---
+
+    def _project_half(self, tb: int, fans: int, ring: Any) -> Any:
+        half = self.HALF_RING
+        frames = np.zeros((len(ring), fans * self.LEDS_PER_FAN, 3), dtype=np.int64)
+        offset = 0 if tb == 0 else half
+        dest = (
+            np.arange(fans)[:, None] * self.LEDS_PER_FAN + offset + np.arange(half)
+        ).ravel()
+        frames[:, dest] = ring[:, : fans * half]
+        return frames
+
+
+def _palette(tb: int) -> Any:
+    return np.array(SLV3_USER_COLOUR[tb], dtype=np.int64)
+
+
+def _scaled(colour: Any, bright: int, intensity: Any = 255) -> Any:
+    """Vectorised ``TLEffectGenerator._set_scaled_colour`` rounding."""
+
+    factor = bright * np.clip(np.asarray(intensity, dtype=np.int64), 0, 255)
+    return (colour * factor[..., None] + 0x7FFF) >> 16
+
+
+def _directed(ring: Any, direction: int) -> Any:
+    return ring[:, ::-1] if direction == 0 else ring
+
+
+def _sweep_mask(num: int, span: int) -> Any:
+    """Lit positions for a ``span``-wide window sweeping across ``num`` LEDs."""
+
+    sweep = np.arange(num + span - 1)[:, None]
+    pos = np.arange(num)[None, :]
+    return (pos <= sweep) & (sweep < pos + span)
+
+
+def _sin(values: Any) -> Any:
+    # NumPy's SIMD sine may differ from libm in the last ulp, which can flip
+    # the truncated intensities; evaluate with math.sin to stay bit-exact.
+    flat = np.asarray(values, dtype=np.float64).ravel().tolist()
+    result = np.fromiter(map(math.sin, flat), dtype=np.float64, count=len(flat))
+    return result.reshape(np.shape(values))
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import contextlib
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple, Union
 
 import usb.core
 import usb.util
@@ -16,6 +17,40 @@ class USBError(RuntimeError):
     """Raised when the USB layer encounters a fatal condition."""
 
 
+# Devices already located by (vid, pid, location), reused on reopen (e.g.
+# after a transport reset) so no bus walk is needed, and the location each
+# (vid, pid, serial) resolved to. Both are process-wide.
+_DEVICES: Dict[Tuple[int, int, int], usb.core.Device] = {}
+_SERIAL_LOCATIONS: Dict[Tuple[int, int, str], int] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _device_location(dev: usb.core.Device) -> Optional[int]:
+    bus = getattr(dev, "bus", None)
+    address = getattr(dev, "address", None)
+    if bus is None or address is None:
+        return None
+    return (bus << 8) | address
+
+
+def forget_device(
+    vendor_id: int,
+    product_id: int,
+    *,
+    location_id: Optional[int] = None,
+    serial_number: Optional[str] = None,
+) -> None:
+    """Drop cached handles/locations, e.g. after the device was unplugged."""
+
+    with _CACHE_LOCK:
+        if serial_number is not None:
+            cached = _SERIAL_LOCATIONS.pop((vendor_id, product_id, serial_number), None)
+            if location_id is None:
+                location_id = cached
+        if location_id is not None:
+            _DEVICES.pop((vendor_id, product_id, location_id), None)
+
+
 def _is_resource_busy_error(exc: usb.core.USBError) -> bool:
     """Return True when libusb reports that an interface is still claimed."""
 
@@ -65,8 +100,24 @@ class USBEndpointDevice:
         return self._device
 
     def _open_device(self, configuration: Optional[int]) -> usb.core.Device:
+        location = self._location_id
+        if location is None and self._serial_number is not None:
+            with _CACHE_LOCK:
+                location = _SERIAL_LOCATIONS.get(
+                    (self.vendor_id, self.product_id, self._serial_number)
+                )
+        if location is not None:
+            dev = self._open_at(location, configuration)
+            if dev is not None:
+                return dev
+            if self._location_id is not None:
+                raise self._not_found()
+            # The remembered location went stale; search by serial.
+            forget_device(
+                self.vendor_id, self.product_id, serial_number=self._serial_number
+            )
         try:
-            if self._serial_number is not None or self._location_id is not None:
+            if self._serial_number is not None:
                 dev = usb.core.find(
                     idVendor=self.vendor_id,
                     idProduct=self.product_id,
@@ -79,12 +130,62 @@ class USBEndpointDevice:
                 "PyUSB could not locate a usable libusb backend. Install libusb-1.0 and ensure it is discoverable.",
             ) from exc
         if dev is None:
-            location_hint = ""
-            if self._location_id is not None:
-                location_hint = f" at location 0x{self._location_id:04x}"
-            raise USBError(
-                f"USB device {self.vendor_id:04x}:{self.product_id:04x} not found{location_hint}",
-            )
+            raise self._not_found()
+        self._configure(dev, configuration)
+        self._remember(dev)
+        return dev
+
+    def _not_found(self) -> USBError:
+        location_hint = ""
+        if self._location_id is not None:
+            location_hint = f" at location 0x{self._location_id:04x}"
+        return USBError(
+            f"USB device {self.vendor_id:04x}:{self.product_id:04x} not found{location_hint}",
+        )
+
+    def _open_at(
+        self, location: int, configuration: Optional[int]
+    ) -> Optional[usb.core.Device]:
+        """Open the device at a known bus/address, or return ``None`` on a miss.
+
+        A handle cached from an earlier open is reused without touching the
+        bus; otherwise ``usb.core.find`` matches on bus and address, which
+        compares cached descriptors only. A serial, if given, is checked
+        with a single string request to that one device.
+        """
+
+        key = (self.vendor_id, self.product_id, location)
+        with _CACHE_LOCK:
+            dev = _DEVICES.get(key)
+        cached = dev is not None
+        if dev is None:
+            try:
+                dev = usb.core.find(
+                    idVendor=self.vendor_id,
+                    idProduct=self.product_id,
+                    bus=location >> 8,
+                    address=location & 0xFF,
+                )
+            except NoBackendError as exc:
+                raise USBError(
+                    "PyUSB could not locate a usable libusb backend. Install libusb-1.0 and ensure it is discoverable.",
+                ) from exc
+            if dev is None or _device_location(dev) != location:
+                return None
+        if not cached and not self._match_device(dev):
+            return None
+        try:
+            self._configure(dev, configuration)
+        except usb.core.USBError:
+            if not cached:
+                raise
+            # The cached handle belongs to a device that has since gone away.
+            forget_device(self.vendor_id, self.product_id, location_id=location)
+            return self._open_at(location, configuration)
+        self._remember(dev)
+        return dev
+
+    def _configure(self, dev: usb.core.Device, configuration: Optional[int]) -> None:
         if configuration is not None:
             dev.set_configuration(configuration)
         else:
@@ -92,7 +193,17 @@ class USBEndpointDevice:
                 dev.get_active_configuration()
             except usb.core.USBError:
                 dev.set_configuration()
-        return dev
+
+    def _remember(self, dev: usb.core.Device) -> None:
+        location = _device_location(dev)
+        if location is None:
+            return
+        with _CACHE_LOCK:
+            _DEVICES[(self.vendor_id, self.product_id, location)] = dev
+            if self._serial_number is not None:
+                _SERIAL_LOCATIONS[
+                    (self.vendor_id, self.product_id, self._serial_number)
+                ] = location
 
     def _match_device(self, dev: usb.core.Device) -> bool:
         if dev.idVendor != self.vendor_id or dev.idProduct != self.product_id:
@@ -191,7 +302,7 @@ class USBEndpointDevice:
             usb.util.release_interface(self._device, intf_num)
         raise USBError("Could not locate suitable interface/endpoints for device")
 
-    def write(self, payload: bytes) -> int:
+    def write(self, payload: Union[bytes, bytearray, memoryview]) -> int:
         try:
             return self._endpoints.out.write(payload, self.timeout_ms)
         except usb.core.USBError as exc:
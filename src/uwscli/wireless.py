@@ -2,16 +2,34 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import logging
 import math
+import threading
 import time
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence, Tuple, cast
-
-from . import tinyuz
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+from . import tinyuz, tl_effects_numpy
+from .effect_cache import CompressedEffect, EffectCache, EffectCacheKey
+from .led_frames import LEDFrameBuffer
+from .rf_pacing import FIXED_PACING, AdaptivePacing, PacingStore, RFPacing
 from .tl_effects import TLEffectGenerator, TLEffects
 from .structs import WirelessDeviceInfo, clamp_pwm_values
-from .system_usb import find_devices_by_vid_pid
+from .system_usb import find_devices_by_vid_pid, register_usb_ids
 from .usbutil import USBEndpointDevice, USBError
 
 
@@ -21,10 +39,13 @@ RF_SENDER_VID = 0x0416
 RF_SENDER_PID = 0x8040
 RF_RECEIVER_VID = 0x0416
 RF_RECEIVER_PID = 0x8041
+register_usb_ids([(RF_SENDER_VID, RF_SENDER_PID), (RF_RECEIVER_VID, RF_RECEIVER_PID)])
 
 RF_GET_DEV_CMD = 0x10
 RF_PACKET_HEADER = 0x10
 RF_CHUNK_SIZE = 60
+RF_CHUNK_INTERVAL = FIXED_PACING.chunk_interval
+RF_WRITE_RETRIES = 3
 RF_PAYLOAD_SIZE = 240
 RF_PAGE_STRIDE = 434
 MAX_DEVICES_PER_PAGE = 10
@@ -33,6 +54,17 @@ FIRST_LED_PACKET_DATA_OFFSET = 34
 FIRST_LED_PACKET_DATA_MAX = RF_PAYLOAD_SIZE - FIRST_LED_PACKET_DATA_OFFSET
 
 _DEFAULT_DICT_SIZE = 4096
+_RF_CHUNKS_PER_PAYLOAD = RF_PAYLOAD_SIZE // RF_CHUNK_SIZE
+_LED_DATA_ZEROS = bytes(RF_PAYLOAD_SIZE - 20)
+
+# Motherboard PWM sync: fastest poll, default deadband (PWM units) and the
+# minimum gap between two updates sent to the same receiver.
+MIN_SYNC_INTERVAL = 0.02
+DEFAULT_SYNC_DEADBAND = 2
+DEFAULT_SYNC_MIN_SEND_INTERVAL = 0.25
+
+# How long a device listing is reused before commands query the dongle again.
+DEFAULT_SNAPSHOT_TTL = 5.0
 
 
 class WirelessError(RuntimeError):
@@ -43,15 +75,50 @@ class WirelessError(RuntimeError):
 class WirelessSnapshot:
     devices: List[WirelessDeviceInfo]
     raw: bytes
+    _by_mac: Optional[Dict[str, WirelessDeviceInfo]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def find(self, mac: str) -> Optional[WirelessDeviceInfo]:
+        if self._by_mac is None:
+            self._by_mac = {dev.mac.lower(): dev for dev in self.devices}
+        return self._by_mac.get(mac.lower())
 
     def motherboard_pwm(self) -> Optional[int]:
         return _extract_motherboard_pwm(self.raw)
 
 
+@dataclass
+class PWMSendResult:
+    """Timing of one receiver's PWM update within a :meth:`set_pwm_many` burst."""
+
+    mac: str
+    pwm_values: Tuple[int, int, int, int]
+    offset_ms: float
+    duration_ms: float
+
+
 class WirelessTransceiver:
     """High level helper around the Uni Fan wireless USB dongle pair."""
 
-    def __init__(self, timeout_ms: int = 1000) -> None:
+    _effect_cache: Optional[EffectCache] = None
+    snapshot_ttl: float = DEFAULT_SNAPSHOT_TTL
+    _snapshot: Optional[WirelessSnapshot] = None
+    _snapshot_time: float = 0.0
+    _pacer: Optional[AdaptivePacing] = None
+    _rf_frames: Optional[Dict[Tuple[int, int], "_RFFrame"]] = None
+    _pwm_templates: Optional[Dict[Tuple[str, str, int, int], bytearray]] = None
+
+    def __init__(
+        self,
+        timeout_ms: int = 1000,
+        *,
+        effect_cache: Optional[EffectCache] = None,
+        snapshot_ttl: float = DEFAULT_SNAPSHOT_TTL,
+        pacing: Optional[PacingStore] = None,
+    ) -> None:
+        self._effect_cache = effect_cache
+        self.snapshot_ttl = max(0.0, snapshot_ttl)
         try:
             self._sender = USBEndpointDevice(
                 RF_SENDER_VID,
@@ -79,11 +146,15 @@ class WirelessTransceiver:
                 ) from exc
             raise WirelessError(str(exc)) from exc
 
+        if pacing is not None:
+            self._pacer = pacing.controller(_usb_location(self._sender))
         logger.debug("Opened wireless transceiver (timeout=%sms)", timeout_ms)
 
     def close(self) -> None:
         self._sender.close()
         self._receiver.close()
+        if self._pacer is not None:
+            self._pacer.flush()
         logger.debug("Closed wireless transceiver")
 
     def __enter__(self) -> "WirelessTransceiver":
@@ -102,7 +173,55 @@ class WirelessTransceiver:
         device_count, payload = snapshot
         devices = self._parse_devices(device_count, payload)
         logger.debug("Discovered %d wireless device(s)", len(devices))
-        return WirelessSnapshot(devices=devices, raw=payload)
+        listing = WirelessSnapshot(devices=devices, raw=payload)
+        if self._pacer is not None:
+            self._pacer.confirm_receivers(
+                {dev.mac.lower() for dev in devices if dev.is_bound}
+            )
+        self._remember_snapshot(listing)
+        return listing
+
+    def cached_snapshot(self) -> WirelessSnapshot:
+        """Return the last listing while it is younger than ``snapshot_ttl``."""
+
+        if self._snapshot is not None and self._snapshot_is_fresh():
+            return self._snapshot
+        snapshot = self.list_devices()
+        self._remember_snapshot(snapshot)
+        return snapshot
+
+    def invalidate_snapshot(self) -> None:
+        self._snapshot = None
+
+    def _snapshot_is_fresh(self) -> bool:
+        return time.monotonic() - self._snapshot_time < self.snapshot_ttl
+
+    def _remember_snapshot(self, snapshot: WirelessSnapshot) -> None:
+        if snapshot is not self._snapshot:
+            self._snapshot = snapshot
+            self._snapshot_time = time.monotonic()
+
+    def _lookup_device(self, mac: str) -> Tuple[WirelessSnapshot, WirelessDeviceInfo]:
+        from_cache = self._snapshot is not None and self._snapshot_is_fresh()
+        snapshot = self.cached_snapshot()
+        target = snapshot.find(mac)
+        if target is None and from_cache:
+            # The receiver may have appeared since the cached listing.
+            snapshot = self.list_devices()
+            target = snapshot.find(mac)
+        if target is None:
+            raise WirelessError(f"Device with MAC {mac} not found")
+        return snapshot, target
+
+    def poll_motherboard_pwm(self) -> Optional[int]:
+        """Read the motherboard PWM duty from the first listing page only.
+
+        Skips the device record parsing and any second page, which makes it
+        cheap enough to call many times per second.
+        """
+
+        _, payload = self._fetch_page(1)
+        return _extract_motherboard_pwm(payload)
 
     def query_master_mac(
         self, *, channel: Optional[int] = None
@@ -136,12 +255,7 @@ class WirelessTransceiver:
         *,
         sequence_index: int = 1,
     ) -> None:
-        snapshot = self.list_devices()
-        target = next(
-            (dev for dev in snapshot.devices if dev.mac.lower() == mac.lower()), None
-        )
-        if target is None:
-            raise WirelessError(f"Device with MAC {mac} not found")
+        _, target = self._lookup_device(mac)
         self.set_pwm_direct(
             target, pwm_values, sequence_index=sequence_index, label=mac
         )
@@ -158,6 +272,68 @@ class WirelessTransceiver:
             target, pwm_values, sequence_index=sequence_index, label=label
         )
 
+    def set_pwm_many(
+        self,
+        targets: Mapping[str, Sequence[int]],
+        *,
+        sequence_index: int = 1,
+        chunk_interval: Optional[float] = None,
+    ) -> List[PWMSendResult]:
+        """Send PWM values to several receivers in one back-to-back RF burst.
+
+        Every target is resolved before the first write, so an unknown or
+        unbound MAC aborts the burst without touching any fan. Chunks of all
+        payloads are then streamed through the sender separated only by
+        ``chunk_interval`` seconds (the current RF pacing when omitted).
+        """
+
+        if chunk_interval is None:
+            chunk_interval = self._current_pacing().chunk_interval
+
+        resolved: List[Tuple[WirelessDeviceInfo, Tuple[int, int, int, int]]] = []
+        for mac, values in targets.items():
+            _, target = self._lookup_device(mac)
+            if not target.is_bound:
+                raise WirelessError(
+                    f"Device {mac} is not bound to a master controller; "
+                    "cannot send PWM"
+                )
+            resolved.append((target, clamp_pwm_values(values)))
+        logger.info(
+            "Sending PWM burst to %d receiver(s) (chunk interval=%.1fms)",
+            len(resolved),
+            chunk_interval * 1000,
+        )
+
+        results: List[PWMSendResult] = []
+        first_write = True
+        burst_start = time.perf_counter()
+        for target, pwm_tuple in resolved:
+            payload = self._pwm_payload(target, pwm_tuple, sequence_index)
+            started = time.perf_counter()
+            frame = self._rf_frame(target.channel, target.rx_type)
+            for packet in frame.load(payload):
+                if not first_write and chunk_interval > 0:
+                    time.sleep(chunk_interval)
+                self._write_sender(packet)
+                first_write = False
+            finished = time.perf_counter()
+            results.append(
+                PWMSendResult(
+                    mac=target.mac,
+                    pwm_values=pwm_tuple,
+                    offset_ms=(started - burst_start) * 1000,
+                    duration_ms=(finished - started) * 1000,
+                )
+            )
+            logger.debug(
+                "PWM %s -> %s sent in %.1fms",
+                pwm_tuple,
+                target.mac,
+                results[-1].duration_ms,
+            )
+        return results
+
     def _send_pwm_command(
         self,
         target: WirelessDeviceInfo,
@@ -170,16 +346,8 @@ class WirelessTransceiver:
             raise WirelessError(
                 "Device is not bound to a master controller; cannot send PWM"
             )
-        payload = bytearray(RF_PAYLOAD_SIZE)
-        payload[0] = 0x12
-        payload[1] = 0x10
-        payload[2:8] = _mac_to_bytes(target.mac)
-        payload[8:14] = _mac_to_bytes(target.master_mac)
-        payload[14] = target.rx_type
-        payload[15] = target.channel
-        payload[16] = sequence_index & 0xFF
         pwm_tuple = clamp_pwm_values(pwm_values)
-        payload[17:21] = bytes(pwm_tuple)
+        payload = self._pwm_payload(target, pwm_tuple, sequence_index)
         logger.info(
             "Sending PWM command to %s (channel=%s rx=%s): %s seq=%d",
             label or target.mac,
@@ -190,6 +358,26 @@ class WirelessTransceiver:
         )
         self._send_rf_data(target.channel, target.rx_type, payload)
 
+    def _pwm_payload(
+        self,
+        target: WirelessDeviceInfo,
+        pwm_tuple: Tuple[int, int, int, int],
+        sequence_index: int,
+    ) -> bytearray:
+        """Patch sequence and PWM bytes into the target's cached PWM payload."""
+
+        if self._pwm_templates is None:
+            self._pwm_templates = {}
+        key = (target.mac, target.master_mac, target.channel, target.rx_type)
+        payload = self._pwm_templates.get(key)
+        if payload is None:
+            payload = _pwm_payload(target, pwm_tuple, sequence_index)
+            self._pwm_templates[key] = payload
+            return payload
+        payload[16] = sequence_index & 0xFF
+        payload[17:21] = bytes(pwm_tuple)
+        return payload
+
     def set_led_static(
         self,
         mac: str,
@@ -198,12 +386,7 @@ class WirelessTransceiver:
         color_list: Optional[Sequence[Tuple[int, int, int]]] = None,
         broadcast: bool = False,
     ) -> None:
-        snapshot = self.list_devices()
-        target = next(
-            (dev for dev in snapshot.devices if dev.mac.lower() == mac.lower()), None
-        )
-        if target is None:
-            raise WirelessError(f"Device with MAC {mac} not found")
+        snapshot, target = self._lookup_device(mac)
         if not target.is_bound:
             raise WirelessError(
                 "Device is not bound to a master controller; cannot send LED data"
@@ -222,9 +405,7 @@ class WirelessTransceiver:
         self._transmit_led_effect(
             target,
             snapshot,
-            rgb,
-            led_count=led_count,
-            total_frames=1,
+            LEDFrameBuffer(rgb, led_count),
             dict_size=_DEFAULT_DICT_SIZE,
             broadcast=broadcast,
             interval_ms=None,
@@ -238,12 +419,7 @@ class WirelessTransceiver:
         interval_ms: int = 50,
         broadcast: bool = False,
     ) -> None:
-        snapshot = self.list_devices()
-        target = next(
-            (dev for dev in snapshot.devices if dev.mac.lower() == mac.lower()), None
-        )
-        if target is None:
-            raise WirelessError(f"Device with MAC {mac} not found")
+        snapshot, target = self._lookup_device(mac)
         if not target.is_bound:
             raise WirelessError(
                 "Device is not bound to a master controller; cannot send LED data"
@@ -255,9 +431,7 @@ class WirelessTransceiver:
         self._transmit_led_effect(
             target,
             snapshot,
-            data,
-            led_count=led_count,
-            total_frames=frames,
+            LEDFrameBuffer(data, led_count),
             dict_size=_DEFAULT_DICT_SIZE,
             broadcast=broadcast,
             interval_ms=interval_ms,
@@ -273,19 +447,40 @@ class WirelessTransceiver:
         direction: int = 1,
         interval_ms: Optional[int] = 50,
         broadcast: bool = False,
+        use_cache: bool = True,
     ) -> None:
-        snapshot = self.list_devices()
-        target = next(
-            (dev for dev in snapshot.devices if dev.mac.lower() == mac.lower()), None
+        target, snapshot, payload, options = self._prepare_led_effect(
+            mac,
+            effect,
+            tb=tb,
+            brightness=brightness,
+            direction=direction,
+            interval_ms=interval_ms,
+            broadcast=broadcast,
+            use_cache=use_cache,
         )
-        if target is None:
-            raise WirelessError(f"Device with MAC {mac} not found")
+        self._transmit_compressed_led_effect(target, snapshot, payload, **options)
+
+    def _prepare_led_effect(
+        self,
+        mac: str,
+        effect: TLEffects,
+        *,
+        tb: Optional[int],
+        brightness: int,
+        direction: int,
+        interval_ms: Optional[int],
+        broadcast: bool,
+        use_cache: bool = True,
+    ) -> Tuple[WirelessDeviceInfo, WirelessSnapshot, bytes, Dict[str, Any]]:
+        """Resolve ``mac`` and compile ``effect`` without touching the sender."""
+
+        snapshot, target = self._lookup_device(mac)
         if not target.is_bound:
             raise WirelessError(
                 "Device is not bound to a master controller; cannot send LED data"
             )
 
-        generator = TLEffectGenerator()
         fan_slots = target.fan_count if target.fan_count > 0 else 0
         if fan_slots <= 0:
             hint_leds = _infer_led_count(target)
@@ -295,47 +490,32 @@ class WirelessTransceiver:
         brightness = max(0, min(255, int(brightness)))
         direction = 0 if direction < 0 else (1 if direction > 1 else int(direction))
 
-        if tb is None:
-            front_frames = generator.generate(
-                effect, 0, fan_slots, brightness, direction
-            )
-            back_frames = generator.generate(
-                effect, 1, fan_slots, brightness, direction
-            )
-            frames = self._merge_half_frames(front_frames, back_frames)
-        else:
-            frames = generator.generate(effect, tb, fan_slots, brightness, direction)
-        if not frames:
-            raise WirelessError("Generated TL effect produced no frames")
+        compiled = compile_led_effect(
+            effect,
+            tb=tb,
+            fan_slots=fan_slots,
+            brightness=brightness,
+            direction=direction,
+            cache=self._effect_cache if use_cache else None,
+        )
 
-        leds_per_frame = len(frames[0][0])
         hint_leds = _infer_led_count(target)
-        if leds_per_frame != hint_leds:
+        if compiled.led_count != hint_leds:
             logger.debug(
                 "Generated TL effect length %s differs from inferred LED count %s for %s",
-                leds_per_frame,
+                compiled.led_count,
                 hint_leds,
                 mac,
             )
 
-        buffer = bytearray()
-        for frame in frames:
-            if len(frame[0]) != leds_per_frame:
-                raise WirelessError("Inconsistent frame lengths in TL effect output")
-            for led in range(leds_per_frame):
-                buffer.extend((frame[0][led], frame[1][led], frame[2][led]))
-
         interval = None if interval_ms is None else max(1, int(interval_ms))
-        self._transmit_led_effect(
-            target,
-            snapshot,
-            bytes(buffer),
-            led_count=leds_per_frame,
-            total_frames=len(frames),
-            dict_size=_DEFAULT_DICT_SIZE,
-            broadcast=broadcast,
-            interval_ms=interval,
-        )
+        options: Dict[str, Any] = {
+            "led_count": compiled.led_count,
+            "total_frames": compiled.total_frames,
+            "broadcast": broadcast,
+            "interval_ms": interval,
+        }
+        return target, snapshot, compiled.payload, options
 
     def set_led_frames(
         self,
@@ -347,12 +527,7 @@ class WirelessTransceiver:
     ) -> None:
         if not frames:
             raise WirelessError("Frames sequence cannot be empty")
-        snapshot = self.list_devices()
-        target = next(
-            (dev for dev in snapshot.devices if dev.mac.lower() == mac.lower()), None
-        )
-        if target is None:
-            raise WirelessError(f"Device with MAC {mac} not found")
+        snapshot, target = self._lookup_device(mac)
         if not target.is_bound:
             raise WirelessError(
                 "Device is not bound to a master controller; cannot send LED data"
@@ -360,16 +535,13 @@ class WirelessTransceiver:
         led_count = _infer_led_count(target)
         if led_count <= 0:
             raise WirelessError("Unable to infer LED count for target device")
-        buffer = bytearray()
-        for frame in frames:
-            frame_bytes = _expand_colors(frame, led_count, target.fan_count)
-            buffer.extend(frame_bytes)
+        buffer = LEDFrameBuffer.blank(len(frames), led_count)
+        for index, frame in enumerate(frames):
+            buffer.set_frame(index, _expand_colors(frame, led_count, target.fan_count))
         self._transmit_led_effect(
             target,
             snapshot,
-            bytes(buffer),
-            led_count=led_count,
-            total_frames=len(frames),
+            buffer,
             dict_size=_DEFAULT_DICT_SIZE,
             broadcast=broadcast,
             interval_ms=interval_ms,
@@ -379,17 +551,23 @@ class WirelessTransceiver:
         self,
         target: WirelessDeviceInfo,
         snapshot: WirelessSnapshot,
-        raw_rgb: bytes,
+        frames: Union[LEDFrameBuffer, bytes],
         *,
-        led_count: int,
-        total_frames: int,
+        led_count: Optional[int] = None,
+        total_frames: Optional[int] = None,
         dict_size: int,
         broadcast: bool,
         interval_ms: Optional[int],
     ) -> None:
-        if led_count <= 0:
+        if isinstance(frames, LEDFrameBuffer):
+            raw_rgb = frames.buffer
+            led_count = frames.led_count if led_count is None else led_count
+            total_frames = len(frames) if total_frames is None else total_frames
+        else:
+            raw_rgb = memoryview(frames)
+        if led_count is None or led_count <= 0:
             raise WirelessError("LED count must be positive")
-        if total_frames <= 0:
+        if total_frames is None or total_frames <= 0:
             raise WirelessError("Frame count must be positive")
         expected_len = led_count * total_frames * 3
         if len(raw_rgb) != expected_len:
@@ -403,40 +581,83 @@ class WirelessTransceiver:
             )
 
         compressed = tinyuz.compress_led_payload(raw_rgb, dict_size=dict_size)
-        compressed_len = len(compressed)
-        if not compressed_len:
-            raise WirelessError("LED payload is empty after compression")
-        data_packets = math.ceil(compressed_len / LED_DATA_CHUNK)
-        total_packets = 1 + data_packets
-        if total_packets > 255:
-            raise WirelessError("LED payload is too large to transmit")
+        self._transmit_compressed_led_effect(
+            target,
+            snapshot,
+            compressed,
+            led_count=led_count,
+            total_frames=total_frames,
+            broadcast=broadcast,
+            interval_ms=interval_ms,
+        )
 
-        mac_bytes = b"\xff" * 6 if broadcast else _mac_to_bytes(target.mac)
-        master_mac = _mac_to_bytes(target.master_mac)
-        effect_index = _generate_effect_index()
-        channel = target.channel if target.channel else snapshot.devices[0].channel
-        send_interval = interval_ms if interval_ms is not None else 50
+    def _transmit_compressed_led_effect(
+        self,
+        target: WirelessDeviceInfo,
+        snapshot: WirelessSnapshot,
+        compressed: bytes,
+        *,
+        led_count: int,
+        total_frames: int,
+        broadcast: bool,
+        interval_ms: Optional[int],
+    ) -> None:
+        upload = _LEDUpload.create(
+            target,
+            snapshot,
+            compressed,
+            led_count=led_count,
+            total_frames=total_frames,
+            broadcast=broadcast,
+            interval_ms=interval_ms,
+        )
+        for delay, payload in self._led_upload_steps(upload):
+            if delay > 0:
+                time.sleep(delay)
+            self._send_rf_data(upload.channel, target.rx_type, payload)
+        self._finish_led_upload(target)
+
+    def _led_upload_steps(
+        self, upload: "_LEDUpload"
+    ) -> Iterator[Tuple[float, bytearray]]:
+        """Yield ``(delay, payload)`` pairs: wait ``delay`` seconds, then send.
+
+        The caller owns the waiting so the same packet sequence can be paced
+        with ``time.sleep`` or an event loop. The yielded payload is a single
+        reused buffer and is only valid until the next step is requested.
+        """
+
+        target = upload.target
+        compressed = upload.compressed
+        compressed_len = len(compressed)
+        total_packets = upload.total_packets
+        send_interval = upload.interval_ms if upload.interval_ms is not None else 50
         if send_interval < 0:
             send_interval = 0
 
         logger.info(
             "Transmitting LED effect to %s (leds=%d frames=%d packets=%d)",
             target.mac,
-            led_count,
-            total_frames,
+            upload.led_count,
+            upload.total_frames,
             total_packets,
         )
 
+        # One payload buffer for the whole upload: the addressing prefix is
+        # written once and each packet only rewrites bytes 18 onwards.
+        payload = bytearray(RF_PAYLOAD_SIZE)
+        payload[0] = 0x12
+        payload[1] = 0x20
+        payload[2:8] = b"\xff" * 6 if upload.broadcast else _mac_to_bytes(target.mac)
+        payload[8:14] = _mac_to_bytes(target.master_mac)
+        payload[14:18] = _generate_effect_index()
+        payload[19] = total_packets & 0xFF
+        data = memoryview(compressed)
         data_offset = 0
+        delay = 0.0
         for packet_index in range(total_packets):
-            payload = bytearray(RF_PAYLOAD_SIZE)
-            payload[0] = 0x12
-            payload[1] = 0x20
-            payload[2:8] = mac_bytes
-            payload[8:14] = master_mac
-            payload[14:18] = effect_index
             payload[18] = packet_index & 0xFF
-            payload[19] = total_packets & 0xFF
+            payload[20:] = _LED_DATA_ZEROS
 
             if packet_index == 0:
                 data_len = len(compressed)
@@ -444,73 +665,38 @@ class WirelessTransceiver:
                 payload[21] = (data_len >> 16) & 0xFF
                 payload[22] = (data_len >> 8) & 0xFF
                 payload[23] = data_len & 0xFF
-                payload[24] = 0
-                payload[25] = (total_frames >> 8) & 0xFF
-                payload[26] = total_frames & 0xFF
-                payload[27] = led_count & 0xFF
+                payload[25] = (upload.total_frames >> 8) & 0xFF
+                payload[26] = upload.total_frames & 0xFF
+                payload[27] = upload.led_count & 0xFF
                 payload[32] = (send_interval >> 8) & 0xFF
                 payload[33] = send_interval & 0xFF
-                payload[34] = 0
-                payload[35] = 0
-                payload[36] = 0
-                payload[37] = 0
-                payload[38] = 0
-                payload[39] = 0
                 first_chunk_len = min(
                     FIRST_LED_PACKET_DATA_MAX, compressed_len - data_offset
                 )
                 if first_chunk_len:
-                    chunk = compressed[data_offset : data_offset + first_chunk_len]
+                    chunk = data[data_offset : data_offset + first_chunk_len]
                     start = FIRST_LED_PACKET_DATA_OFFSET
                     payload[start : start + first_chunk_len] = chunk
                     data_offset += first_chunk_len
             else:
                 chunk_len = min(LED_DATA_CHUNK, compressed_len - data_offset)
                 if chunk_len:
-                    chunk = compressed[data_offset : data_offset + chunk_len]
+                    chunk = data[data_offset : data_offset + chunk_len]
                     payload[20 : 20 + chunk_len] = chunk
                     data_offset += chunk_len
 
-            self._send_rf_data(channel, target.rx_type, payload)
+            yield delay, payload
+            # Re-read the pacing each packet so a backoff applies mid-upload.
+            pacing = self._current_pacing()
             if packet_index == 0:
-                for _ in range(3):
-                    time.sleep(0.02)
-                    self._send_rf_data(channel, target.rx_type, payload)
-            if packet_index < total_packets - 1:
-                time.sleep(0.01)
-
-    @staticmethod
-    def _merge_half_frames(
-        front: Sequence[Sequence[Sequence[int]]],
-        back: Sequence[Sequence[Sequence[int]]],
-    ) -> List[List[List[int]]]:
-        if not front and not back:
-            return []
-        if not front:
-            return [[list(channel) for channel in frame] for frame in back]
-        if not back:
-            return [[list(channel) for channel in frame] for frame in front]
-        total = max(len(front), len(back))
-        merged: List[List[List[int]]] = []
-        for index in range(total):
-            frame_front = front[index % len(front)]
-            frame_back = back[index % len(back)]
-            combined = [
-                list(frame_front[0]),
-                list(frame_front[1]),
-                list(frame_front[2]),
-            ]
-            led_count = len(frame_back[0])
-            for led in range(led_count):
-                r = frame_back[0][led]
-                g = frame_back[1][led]
-                b = frame_back[2][led]
-                if r or g or b:
-                    combined[0][led] = r
-                    combined[1][led] = g
-                    combined[2][led] = b
-            merged.append(combined)
-        return merged
+                for _ in range(pacing.header_repeats):
+                    yield pacing.header_repeat_interval, payload
+            delay = pacing.packet_interval
+
+    def _finish_led_upload(self, target: WirelessDeviceInfo) -> None:
+        if self._pacer is not None:
+            self._pacer.record_success()
+            self._pacer.expect_receiver(target.mac)
 
     def bind_device(
         self,
@@ -519,12 +705,7 @@ class WirelessTransceiver:
         master_mac: Optional[str] = None,
         rx_type: Optional[int] = None,
     ) -> WirelessDeviceInfo:
-        snapshot = self.list_devices()
-        target = next(
-            (dev for dev in snapshot.devices if dev.mac.lower() == mac.lower()), None
-        )
-        if target is None:
-            raise WirelessError(f"Device with MAC {mac} not found")
+        snapshot, target = self._lookup_device(mac)
         if target.is_bound:
             raise WirelessError("Device is already bound")
 
@@ -567,10 +748,7 @@ class WirelessTransceiver:
         payload[17:21] = bytes(pwm_tuple)
         self._send_rf_data(channel, target.rx_type or 0, payload)
         time.sleep(0.1)
-        refreshed = self.list_devices()
-        updated = next(
-            (dev for dev in refreshed.devices if dev.mac.lower() == mac.lower()), None
-        )
+        updated = self._refresh_after_binding_change(mac)
         logger.info(
             "Bind request sent for %s (channel=%s rx_type=%s master=%s)",
             mac,
@@ -581,12 +759,7 @@ class WirelessTransceiver:
         return updated or target
 
     def unbind_device(self, mac: str) -> WirelessDeviceInfo:
-        snapshot = self.list_devices()
-        target = next(
-            (dev for dev in snapshot.devices if dev.mac.lower() == mac.lower()), None
-        )
-        if target is None:
-            raise WirelessError(f"Device with MAC {mac} not found")
+        snapshot, target = self._lookup_device(mac)
         if not target.is_bound:
             raise WirelessError("Device is already unbound")
 
@@ -604,20 +777,12 @@ class WirelessTransceiver:
         payload[17:21] = bytes(pwm_tuple)
         self._send_rf_data(channel, target.rx_type, payload)
         time.sleep(0.1)
-        refreshed = self.list_devices()
-        updated = next(
-            (dev for dev in refreshed.devices if dev.mac.lower() == mac.lower()), None
-        )
+        updated = self._refresh_after_binding_change(mac)
         logger.info("Unbind request sent for %s", mac)
         return updated or target
 
     def set_pwm_sync(self, mac: str, enable: bool, fallback_pwm: int = 100) -> None:
-        snapshot = self.list_devices()
-        target = next(
-            (dev for dev in snapshot.devices if dev.mac.lower() == mac.lower()), None
-        )
-        if target is None:
-            raise WirelessError(f"Device with MAC {mac} not found")
+        _, target = self._lookup_device(mac)
         if not target.is_bound:
             raise WirelessError("Device is not bound")
 
@@ -633,6 +798,12 @@ class WirelessTransceiver:
         )
         self.set_pwm(mac, pwm_values)
 
+    def _refresh_after_binding_change(self, mac: str) -> Optional[WirelessDeviceInfo]:
+        updated = self.list_devices().find(mac)
+        # The receiver may still be applying the change; never reuse this listing.
+        self.invalidate_snapshot()
+        return updated
+
     def _fetch_page(self, page_count: int) -> Tuple[int, bytes]:
         command = bytearray(64)
         command[0] = RF_GET_DEV_CMD
@@ -701,25 +872,387 @@ class WirelessTransceiver:
             offset += 42
         return devices
 
-    def _send_rf_data(self, channel: int, rx: int, payload: bytes) -> None:
+    def _current_pacing(self) -> RFPacing:
+        return self._pacer.current if self._pacer is not None else FIXED_PACING
+
+    def _send_rf_data(
+        self, channel: int, rx: int, payload: Union[bytes, bytearray]
+    ) -> None:
+        for packet in self._rf_frame(channel, rx).load(payload):
+            self._write_sender(packet)
+            time.sleep(self._current_pacing().chunk_interval)
+
+    def _rf_frame(self, channel: int, rx: int) -> "_RFFrame":
+        if self._rf_frames is None:
+            self._rf_frames = {}
+        key = (channel & 0xFF, rx & 0xFF)
+        frame = self._rf_frames.get(key)
+        if frame is None:
+            frame = self._rf_frames[key] = _RFFrame(*key)
+        return frame
+
+    def _write_sender(self, packet: Union[bytes, bytearray, memoryview]) -> None:
+        """Write one sender packet, backing the pacing off on USB errors."""
+
+        attempt = 0
+        while True:
+            try:
+                self._sender.write(packet)
+                return
+            except USBError as exc:
+                if self._pacer is None or attempt >= RF_WRITE_RETRIES:
+                    raise
+                attempt += 1
+                self._pacer.record_failure(str(exc))
+                time.sleep(self._pacer.current.packet_interval)
+
+
+def _usb_location(device: object) -> str:
+    """Return a stable identifier for the USB port a dongle is plugged into."""
+
+    usb_device = getattr(device, "device", None)
+    bus = getattr(usb_device, "bus", None)
+    ports = getattr(usb_device, "port_numbers", None)
+    if bus is not None and ports:
+        return f"{bus}-{'.'.join(str(port) for port in ports)}"
+    address = getattr(usb_device, "address", None)
+    if bus is not None and address is not None:
+        return f"{bus}:{address}"
+    return "default"
+
+
+class _RFFrame:
+    """Reusable sender packets for one (channel, rx) pair.
+
+    The four 64-byte packets live in one buffer whose headers are written
+    once; :meth:`load` only copies the payload slices in and hands out
+    memoryviews, so sending allocates nothing per chunk.
+    """
+
+    __slots__ = ("_buffer", "_packets")
+
+    def __init__(self, channel: int, rx: int) -> None:
+        self._buffer = bytearray(64 * _RF_CHUNKS_PER_PAYLOAD)
+        view = memoryview(self._buffer)
+        self._packets = []
+        for sequence in range(_RF_CHUNKS_PER_PAYLOAD):
+            start = sequence * 64
+            self._buffer[start : start + 4] = bytes(
+                (RF_PACKET_HEADER, sequence, channel, rx)
+            )
+            self._packets.append(view[start : start + 64])
+
+    def load(self, payload: Union[bytes, bytearray, memoryview]) -> List[memoryview]:
         if len(payload) != RF_PAYLOAD_SIZE:
             raise WirelessError(f"RF payload must be {RF_PAYLOAD_SIZE} bytes")
-        chunk_index = 0
-        sequence = 0
-        while chunk_index < len(payload):
-            chunk = payload[chunk_index : chunk_index + RF_CHUNK_SIZE]
-            if len(chunk) < RF_CHUNK_SIZE:
-                chunk = chunk + bytes(RF_CHUNK_SIZE - len(chunk))
-            packet = bytearray(64)
-            packet[0] = RF_PACKET_HEADER
-            packet[1] = sequence & 0xFF
-            packet[2] = channel & 0xFF
-            packet[3] = rx & 0xFF
-            packet[4 : 4 + RF_CHUNK_SIZE] = chunk
-            self._sender.write(packet)
-            chunk_index += RF_CHUNK_SIZE
-            sequence = (sequence + 1) & 0xFF
-            time.sleep(0.002)
+        source = memoryview(payload)
+        for index, packet in enumerate(self._packets):
+            offset = index * RF_CHUNK_SIZE
+            packet[4:] = source[offset : offset + RF_CHUNK_SIZE]
+        return self._packets
+
+
+@dataclass(frozen=True)
+class _LEDUpload:
+    """A validated compressed LED effect ready to be packetised."""
+
+    target: WirelessDeviceInfo
+    channel: int
+    compressed: bytes
+    led_count: int
+    total_frames: int
+    broadcast: bool
+    interval_ms: Optional[int]
+
+    @property
+    def total_packets(self) -> int:
+        return 1 + math.ceil(len(self.compressed) / LED_DATA_CHUNK)
+
+    @classmethod
+    def create(
+        cls,
+        target: WirelessDeviceInfo,
+        snapshot: WirelessSnapshot,
+        compressed: bytes,
+        *,
+        led_count: int,
+        total_frames: int,
+        broadcast: bool,
+        interval_ms: Optional[int],
+    ) -> "_LEDUpload":
+        if not compressed:
+            raise WirelessError("LED payload is empty after compression")
+        upload = cls(
+            target=target,
+            channel=target.channel if target.channel else snapshot.devices[0].channel,
+            compressed=compressed,
+            led_count=led_count,
+            total_frames=total_frames,
+            broadcast=broadcast,
+            interval_ms=interval_ms,
+        )
+        if upload.total_packets > 255:
+            raise WirelessError("LED payload is too large to transmit")
+        return upload
+
+
+def _pwm_payload(
+    target: WirelessDeviceInfo,
+    pwm_tuple: Tuple[int, int, int, int],
+    sequence_index: int,
+) -> bytearray:
+    payload = bytearray(RF_PAYLOAD_SIZE)
+    payload[0] = 0x12
+    payload[1] = 0x10
+    payload[2:8] = _mac_to_bytes(target.mac)
+    payload[8:14] = _mac_to_bytes(target.master_mac)
+    payload[14] = target.rx_type
+    payload[15] = target.channel
+    payload[16] = sequence_index & 0xFF
+    payload[17:21] = bytes(pwm_tuple)
+    return payload
+
+
+def compile_led_effect(
+    effect: TLEffects,
+    *,
+    tb: Optional[int],
+    fan_slots: int,
+    brightness: int,
+    direction: int,
+    dict_size: int = _DEFAULT_DICT_SIZE,
+    cache: Optional[EffectCache] = None,
+) -> CompressedEffect:
+    """Generate a TL effect and compress it, consulting ``cache`` first.
+
+    ``tb`` selects the front (0) or back (1) half; ``None`` merges both.
+    """
+
+    key = EffectCacheKey(
+        effect=effect.name,
+        tb=tb,
+        fan_slots=fan_slots,
+        brightness=brightness,
+        direction=direction,
+        led_count=fan_slots * TLEffectGenerator.LEDS_PER_FAN,
+        dict_size=dict_size,
+    )
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    frames = _render_led_effect(
+        effect, tb=tb, fan_slots=fan_slots, brightness=brightness, direction=direction
+    )
+    compiled = CompressedEffect(
+        payload=tinyuz.compress_led_payload(frames.buffer, dict_size=dict_size),
+        led_count=frames.led_count,
+        total_frames=len(frames),
+    )
+    if cache is not None:
+        cache.put(key, compiled)
+    return compiled
+
+
+def _render_led_effect(
+    effect: TLEffects,
+    *,
+    tb: Optional[int],
+    fan_slots: int,
+    brightness: int,
+    direction: int,
+) -> LEDFrameBuffer:
+    """Render an effect into a frame buffer, merging both halves when ``tb`` is None.
+
+    Uses the NumPy generator when available and falls back to the list-based one.
+    """
+
+    generator: Union[TLEffectGenerator, tl_effects_numpy.NumpyTLEffectGenerator]
+    if tl_effects_numpy.is_available():
+        generator = tl_effects_numpy.NumpyTLEffectGenerator()
+    else:
+        generator = TLEffectGenerator()
+    if tb is None:
+        front = generator.generate_buffer(effect, 0, fan_slots, brightness, direction)
+        back = generator.generate_buffer(effect, 1, fan_slots, brightness, direction)
+        frames = front.overlay(back)
+    else:
+        frames = generator.generate_buffer(effect, tb, fan_slots, brightness, direction)
+    if not len(frames):
+        raise WirelessError("Generated TL effect produced no frames")
+    return frames
+
+
+class PWMSyncEngine:
+    """Mirror the motherboard PWM header onto wireless receivers.
+
+    The transceiver is opened once and kept across cycles; it is only
+    reopened after an error. Each cycle reads just the PWM indicator bytes
+    (:meth:`WirelessTransceiver.poll_motherboard_pwm`) and touches the device
+    listing only when an update actually has to be sent. Changes smaller than
+    ``deadband`` are ignored and each receiver is updated at most once per
+    ``min_send_interval`` seconds; the latest value is sent once the window
+    reopens.
+    """
+
+    def __init__(
+        self,
+        mac_addrs: Sequence[str],
+        *,
+        interval: float = 1.0,
+        deadband: int = DEFAULT_SYNC_DEADBAND,
+        min_send_interval: float = DEFAULT_SYNC_MIN_SEND_INTERVAL,
+        transceiver_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.macs = [mac.lower() for mac in mac_addrs]
+        self.interval = max(interval, MIN_SYNC_INTERVAL)
+        self.deadband = max(0, int(deadband))
+        self.min_send_interval = max(0.0, min_send_interval)
+        self._factory = transceiver_factory or WirelessTransceiver
+        self._stack: Optional[contextlib.ExitStack] = None
+        self._tx: Any = None
+        self._stop = threading.Event()
+        self._current_pwm: Optional[int] = None
+        self._last_sent: Dict[str, int] = {}
+        self._last_send_time: Dict[str, float] = {}
+        self._sequences: Dict[str, Tuple[int, int]] = {}
+        self._missing_logged = False
+
+    def run(
+        self,
+        *,
+        max_cycles: Optional[int] = None,
+        stop_after_first_send: bool = False,
+    ) -> None:
+        if not self.macs:
+            logger.info("No targets provided to PWM sync loop; nothing to do")
+            return
+        logger.info(
+            "Starting motherboard PWM sync loop for %d device(s) "
+            "(interval=%.2fs deadband=%d min send interval=%.2fs)",
+            len(self.macs),
+            self.interval,
+            self.deadband,
+            self.min_send_interval,
+        )
+        cycles = 0
+        any_sent = False
+        try:
+            while not self._stop.is_set():
+                try:
+                    any_sent = self.step() or any_sent
+                    cycles += 1
+                except (WirelessError, USBError) as exc:
+                    logger.warning("PWM sync iteration failed: %s", exc)
+                    self._drop_transceiver()
+                if stop_after_first_send and any_sent:
+                    break
+                if max_cycles is not None and cycles >= max_cycles:
+                    break
+                self._stop.wait(self.interval)
+        except KeyboardInterrupt:
+            logger.info("PWM sync loop interrupted by user")
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def close(self) -> None:
+        self._drop_transceiver()
+
+    def step(self) -> bool:
+        """Run one poll; return True when at least one receiver was updated."""
+
+        tx = self._transceiver()
+        poll = getattr(tx, "poll_motherboard_pwm", None)
+        snapshot: Optional[WirelessSnapshot] = None
+        if poll is not None:
+            pwm = poll()
+        else:
+            snapshot = tx.list_devices()
+            pwm = snapshot.motherboard_pwm()
+
+        if pwm is None:
+            if not self._missing_logged:
+                logger.debug(
+                    "No motherboard PWM value detected; %s",
+                    "nothing to sync this cycle"
+                    if self._current_pwm is None
+                    else f"reusing previous value {self._current_pwm}",
+                )
+                self._missing_logged = True
+            pwm = self._current_pwm
+            if pwm is None:
+                return False
+        else:
+            if pwm != self._current_pwm:
+                logger.debug("Motherboard PWM changed to %d", pwm)
+            self._current_pwm = pwm
+            self._missing_logged = False
+
+        now = time.monotonic()
+        due = [mac for mac in self.macs if self._needs_update(mac, pwm, now)]
+        if not due:
+            return False
+        if snapshot is None:
+            refresh = getattr(tx, "cached_snapshot", None) or tx.list_devices
+            snapshot = refresh()
+        available = {dev.mac.lower(): dev for dev in snapshot.devices if dev.is_bound}
+        sent = False
+        for mac in due:
+            target = available.get(mac)
+            if target is None:
+                logger.debug("Target %s not bound or missing from snapshot", mac)
+                continue
+            sequence_index = self._next_sequence(mac, target)
+            try:
+                tx.set_pwm_direct(target, [pwm] * 4, sequence_index=sequence_index)
+            except WirelessError as exc:
+                logger.warning("Failed to send PWM to %s: %s", target.mac, exc)
+                continue
+            self._last_sent[mac] = pwm
+            self._last_send_time[mac] = now
+            sent = True
+        return sent
+
+    def _needs_update(self, mac: str, pwm: int, now: float) -> bool:
+        last = self._last_sent.get(mac)
+        if last is None:
+            return True
+        if last == pwm:
+            return False
+        # Always let the ends of the range through so fans can fully stop
+        # or reach full speed even inside the deadband.
+        if abs(pwm - last) < self.deadband and pwm not in (0, 255):
+            return False
+        return now - self._last_send_time.get(mac, 0.0) >= self.min_send_interval
+
+    def _next_sequence(self, mac: str, target: WirelessDeviceInfo) -> int:
+        # Cached listings keep reporting the same command sequence, so keep
+        # counting from our last send until the receiver reports a new one.
+        base = target.command_sequence
+        previous = self._sequences.get(mac)
+        if previous is not None and previous[0] == base:
+            sequence = (previous[1] + 1) & 0xFF
+        else:
+            sequence = (base + 1) & 0xFF
+        self._sequences[mac] = (base, sequence)
+        return sequence
+
+    def _transceiver(self) -> Any:
+        if self._tx is None:
+            stack = contextlib.ExitStack()
+            self._tx = stack.enter_context(self._factory())
+            self._stack = stack
+        return self._tx
+
+    def _drop_transceiver(self) -> None:
+        stack, self._stack, self._tx = self._stack, None, None
+        if stack is not None:
+            with contextlib.suppress(Exception):
+                stack.close()
 
 
 def run_pwm_sync_loop(
@@ -728,97 +1261,23 @@ def run_pwm_sync_loop(
     interval: float = 1.0,
     max_cycles: Optional[int] = None,
     stop_after_first_send: bool = False,
+    transceiver_factory: Optional[Callable[[], "WirelessTransceiver"]] = None,
+    deadband: int = DEFAULT_SYNC_DEADBAND,
+    min_send_interval: float = DEFAULT_SYNC_MIN_SEND_INTERVAL,
 ) -> None:
-    macs = [m.lower() for m in mac_addrs]
-    if not macs:
-        logger.info("No targets provided to PWM sync loop; nothing to do")
-        return
-    interval = max(interval, 0.1)
-    logger.info(
-        "Starting motherboard PWM sync loop for %d device(s) (interval=%.2fs)",
-        len(macs),
-        interval,
-    )
-    last_sent: Dict[str, int] = {}
-    current_pwm: Optional[int] = None
-    missing_logged = False
-    cycles = 0
-    any_sent = False
-    try:
-        while True:
-            try:
-                with WirelessTransceiver() as tx:
-                    snapshot = tx.list_devices()
-                    pwm = snapshot.motherboard_pwm()
-                    pwm_values: Optional[List[int]] = None
-                    if pwm is None:
-                        if current_pwm is None:
-                            if not missing_logged:
-                                logger.debug(
-                                    "No motherboard PWM value detected; nothing to sync this cycle"
-                                )
-                                missing_logged = True
-                        else:
-                            pwm = current_pwm
-                            pwm_values = [pwm] * 4
-                            if not missing_logged:
-                                logger.debug(
-                                    "No new motherboard PWM value detected; reusing previous value %d",
-                                    pwm,
-                                )
-                                missing_logged = True
-                    else:
-                        logger.debug(
-                            "Extracted motherboard PWM raw=%s computed=%d",
-                            _format_pwm_debug(snapshot.raw),
-                            pwm,
-                        )
-                        current_pwm = pwm
-                        pwm_values = [pwm] * 4
-                        missing_logged = False
-                    if pwm_values is not None:
-                        pwm_int = pwm if pwm is not None else current_pwm
-                        if pwm_int is None:
-                            continue
-                        available = {
-                            dev.mac.lower(): dev
-                            for dev in snapshot.devices
-                            if dev.is_bound
-                        }
-                        for mac in macs:
-                            target = available.get(mac)
-                            if target is None:
-                                logger.debug(
-                                    "Target %s not bound or missing from snapshot", mac
-                                )
-                                continue
-                            if last_sent.get(mac) == pwm_int:
-                                continue
-                            sequence_index = (target.command_sequence + 1) & 0xFF
-                            try:
-                                tx.set_pwm_direct(
-                                    target,
-                                    pwm_values,
-                                    sequence_index=sequence_index,
-                                )
-                            except WirelessError as exc:
-                                logger.warning(
-                                    "Failed to send PWM to %s: %s", target.mac, exc
-                                )
-                                continue
-                            last_sent[mac] = pwm_int
-                            any_sent = True
-                cycles += 1
-            except WirelessError as exc:
-                logger.warning("PWM sync iteration failed: %s", exc)
-            if stop_after_first_send and any_sent:
-                break
-            if max_cycles is not None and cycles >= max_cycles:
-                break
-            time.sleep(interval)
-    except KeyboardInterrupt:
-        logger.info("PWM sync loop interrupted by user")
-        return
+    """Mirror the motherboard PWM onto ``mac_addrs`` every ``interval`` seconds.
+
+    ``transceiver_factory`` opens the session kept for the whole loop; it
+    defaults to :class:`WirelessTransceiver`. See :class:`PWMSyncEngine`.
+    """
+
+    PWMSyncEngine(
+        mac_addrs,
+        interval=interval,
+        deadband=deadband,
+        min_send_interval=min_send_interval,
+        transceiver_factory=transceiver_factory,
+    ).run(max_cycles=max_cycles, stop_after_first_send=stop_after_first_send)
 
 
 def _extract_motherboard_pwm(raw: bytes) -> Optional[int]:
@@ -839,16 +1298,11 @@ def _extract_motherboard_pwm(raw: bytes) -> Optional[int]:
     return pwm
 
 
-def _format_pwm_debug(raw: bytes) -> str:
-    if len(raw) < 4:
-        return "N/A"
-    return f"{raw[2]:02x}:{raw[3]:02x}"
-
-
 def _bytes_to_mac(raw: bytes) -> str:
     return ":".join(f"{b:02x}" for b in raw)
 
 
+@functools.lru_cache(maxsize=256)
 def _mac_to_bytes(mac: str) -> bytes:
     parts = mac.split(":")
     if len(parts) != 6:
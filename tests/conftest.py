@@ -1,7 +1,10 @@
+import os
 import sys
 import types
 from typing import Any, cast
 
+import pytest
+
 
 def _ensure_usb() -> None:
     try:
@@ -100,7 +103,31 @@ def _ensure_crypto() -> None:
         sys.modules.setdefault("Crypto.Cipher", cipher_module)
 
 
+BENCHMARK_ENV = "UWS_BENCHMARK"
+
+
 def pytest_configure(config):
     _ensure_usb()
     _ensure_hid()
     _ensure_crypto()
+    config.addinivalue_line(
+        "markers",
+        f"benchmark: timing report, skipped unless ${BENCHMARK_ENV} is set (run with -s)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get(BENCHMARK_ENV):
+        return
+    skip = pytest.mark.skip(reason=f"set {BENCHMARK_ENV}=1 to run benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_user_state(tmp_path, monkeypatch):
+    # Keep a `uws daemon` running on the developer machine, and the per-user
+    # cache/pacing files, out of the tests.
+    monkeypatch.setenv("UWS_DAEMON_SOCKET", str(tmp_path / "uwscli.sock"))
+    monkeypatch.setenv("UWS_CACHE_DIR", str(tmp_path / "cache"))
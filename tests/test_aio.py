@@ -0,0 +1,116 @@
+import asyncio
+import threading
+
+import pytest
+
+from uwscli import aio, tl_effects, wireless
+
+
+def _device():
+    return wireless.WirelessDeviceInfo(
+        mac="aa:bb:cc:dd:ee:ff",
+        master_mac="11:22:33:44:55:66",
+        channel=5,
+        rx_type=2,
+        device_type=0,
+        fan_count=3,
+        pwm_values=(0, 0, 0, 0),
+        fan_rpm=(0, 0, 0, 0),
+        command_sequence=1,
+        raw=bytes(42),
+    )
+
+
+def _transceiver(monkeypatch, sent):
+    device = _device()
+    snapshot = wireless.WirelessSnapshot(devices=[device], raw=b"")
+    tx = wireless.WirelessTransceiver.__new__(wireless.WirelessTransceiver)
+    monkeypatch.setattr(tx, "_lookup_device", lambda mac: (snapshot, device))
+    monkeypatch.setattr(
+        tx,
+        "_send_rf_data",
+        lambda channel, rx, payload: sent.append((channel, rx, bytes(payload))),
+    )
+    monkeypatch.setattr(tx, "close", lambda: sent.append("close"))
+    return tx
+
+
+def test_async_led_effect_matches_blocking_upload(monkeypatch):
+    effect_index = b"\x01\x02\x03\x04"
+    monkeypatch.setattr(wireless, "_generate_effect_index", lambda: effect_index)
+    blocking_sent, blocking_sleeps = [], []
+    monkeypatch.setattr(wireless.time, "sleep", blocking_sleeps.append)
+    _transceiver(monkeypatch, blocking_sent).set_led_effect(
+        "aa:bb:cc:dd:ee:ff", tl_effects.TLEffects.METEOR
+    )
+
+    def no_blocking_sleep(_):
+        raise AssertionError("async upload blocked on time.sleep")
+
+    monkeypatch.setattr(wireless.time, "sleep", no_blocking_sleep)
+    async_sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        async_sleeps.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(aio.asyncio, "sleep", fake_sleep)
+    async_sent = []
+
+    async def run():
+        async with aio.AsyncWirelessTransceiver(
+            _transceiver(monkeypatch, async_sent)
+        ) as tx:
+            await tx.set_led_effect("aa:bb:cc:dd:ee:ff", tl_effects.TLEffects.METEOR)
+
+    asyncio.run(run())
+    assert async_sent[:-1] == blocking_sent
+    assert async_sent[-1] == "close"
+    assert async_sleeps == blocking_sleeps
+    assert {channel for channel, _, _ in blocking_sent} == {5}
+
+
+class _SlowPanel:
+    def __init__(self, barrier, log):
+        self._barrier = barrier
+        self._log = log
+
+    def send_jpg(self, payload):
+        # Both panels must be inside send_jpg at once for the barrier to open.
+        self._barrier.wait(timeout=5)
+        self._log.append((threading.get_ident(), payload))
+
+    def handshake(self):
+        return {"mode": 1, "frame_index": 0}
+
+    def close(self):
+        pass
+
+
+def test_lcd_devices_run_on_separate_workers():
+    barrier = threading.Barrier(2)
+    log = []
+
+    async def run():
+        panels = [
+            aio.AsyncLCDDevice(_SlowPanel(barrier, log)),
+            aio.AsyncLCDDevice(_SlowPanel(barrier, log)),
+        ]
+        assert await panels[0].handshake() == {"mode": 1, "frame_index": 0}
+        await asyncio.gather(panels[0].send_jpg(b"a"), panels[1].send_jpg(b"b"))
+        for panel in panels:
+            await panel.close()
+
+    asyncio.run(run())
+    assert sorted(payload for _, payload in log) == [b"a", b"b"]
+    assert len({ident for ident, _ in log}) == 2
+
+
+def test_async_errors_propagate(monkeypatch):
+    def missing(**kwargs):
+        raise wireless.WirelessError("no dongle")
+
+    monkeypatch.setattr(wireless, "WirelessTransceiver", missing)
+    with pytest.raises(wireless.WirelessError, match="no dongle"):
+        asyncio.run(aio.AsyncWirelessTransceiver.open())
@@ -2,6 +2,8 @@ import json
 import sys
 from pathlib import Path
 
+import pytest
+
 SRC_ROOT = Path(__file__).resolve().parents[1].parent / "src"
 if str(SRC_ROOT) not in sys.path:
     sys.path.insert(0, str(SRC_ROOT))
@@ -124,6 +126,28 @@ class StubTransceiver:
             }
         )
 
+    def set_pwm_many(self, targets, *, sequence_index=1, chunk_interval=None):
+        self.pwm_many_chunk_interval = chunk_interval
+        results = []
+        for offset, (mac, pwm_values) in enumerate(targets.items()):
+            self.pwm_calls.append(
+                {
+                    "type": "set_pwm_many",
+                    "mac": mac,
+                    "pwm": list(pwm_values),
+                    "sequence_index": sequence_index,
+                }
+            )
+            results.append(
+                wireless.PWMSendResult(
+                    mac=mac,
+                    pwm_values=tuple(pwm_values),
+                    offset_ms=float(offset),
+                    duration_ms=0.5,
+                )
+            )
+        return results
+
 
 def test_pwm_sync_mac_json(monkeypatch, capsys):
     run_calls = []
@@ -564,6 +588,56 @@ def test_fan_set_fan_all_cli(monkeypatch, capsys):
         assert call["sequence_index"] == 1
 
 
+def test_fan_set_fan_mac_mapping_json(monkeypatch, capsys, tmp_path):
+    StubTransceiver.instances.clear()
+    monkeypatch.setattr(
+        wireless, "WirelessTransceiver", lambda *a, **k: StubTransceiver()
+    )
+
+    cli.main(
+        [
+            "--output",
+            "json",
+            "fan",
+            "set-fan",
+            "--mac",
+            "aa:bb:cc:dd:ee:01=100",
+            "--mac",
+            "aa:bb:cc:dd:ee:02=1,2,3,4",
+            "--mac",
+            "aa:bb:cc:dd:ee:03",
+            "--pwm",
+            "50",
+            "--chunk-interval-ms",
+            "0.5",
+        ]
+    )
+
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["macs"] == [
+        "aa:bb:cc:dd:ee:01",
+        "aa:bb:cc:dd:ee:02",
+        "aa:bb:cc:dd:ee:03",
+    ]
+    assert [entry["pwm"] for entry in payload["targets"]] == [
+        [100, 100, 100, 100],
+        [1, 2, 3, 4],
+        [50, 50, 50, 50],
+    ]
+    assert payload["targets"][2]["offset_ms"] == 2.0
+    assert payload["elapsed_ms"] == 2.5
+    stub = StubTransceiver.instances[-1]
+    assert stub.pwm_many_chunk_interval == 0.0005
+
+    targets_file = tmp_path / "targets.json"
+    targets_file.write_text(json.dumps({"aa:bb:cc:dd:ee:04": [300, 20]}))
+    cli.main(["fan", "set-fan", "--targets-json", str(targets_file)])
+
+    out = capsys.readouterr().out
+    assert "Applied PWM [255, 20, 20, 20] to aa:bb:cc:dd:ee:04" in out
+    assert StubTransceiver.instances[-1].pwm_calls[-1]["pwm"] == [255, 20, 20, 20]
+
+
 def test_fan_set_fan_sync_cli(monkeypatch, capsys):
     StubTransceiver.instances.clear()
     device = wireless.WirelessDeviceInfo(
@@ -1198,3 +1272,123 @@ def test_lcd_info_autodetects_single_serial(monkeypatch, capsys):
     payload = json.loads(capsys.readouterr().out.strip())
     assert payload["handshake"]["mode"] == 2
     assert calls == ["detected123"]
+
+
+def test_lcd_send_video_streams_file_handle(monkeypatch, capsys, tmp_path):
+    video = tmp_path / "boot.avi"
+    video.write_bytes(b"RIFF" + bytes(2044))
+    sent = []
+
+    class DummyDevice:
+        def __init__(self, serial):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def send_boot_video(self, payload):
+            sent.append(("boot", payload.read()))
+
+        def send_avi(self, payload):
+            sent.append(("avi", payload.read()))
+
+    monkeypatch.setattr(lcd, "TLLCDDevice", DummyDevice)
+
+    cli.main(
+        [
+            "--output",
+            "json",
+            "lcd",
+            "send-video",
+            "--serial",
+            "abc",
+            "--file",
+            str(video),
+            "--boot",
+        ]
+    )
+
+    assert json.loads(capsys.readouterr().out.strip()) == {
+        "bytes_sent": 2048,
+        "boot": True,
+    }
+    assert sent == [("boot", video.read_bytes())]
+
+    video.write_bytes(b"")
+    with pytest.raises(SystemExit, match="File is empty"):
+        cli.main(["lcd", "send-video", "--serial", "abc", "--file", str(video)])
+
+
+def test_lcd_send_jpg_fit_transcodes_for_panel(monkeypatch, capsys, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    import io
+
+    source = tmp_path / "photo.png"
+    Image.new("RGB", (800, 600), (0, 128, 255)).save(source)
+    sent = []
+
+    class DummyDevice:
+        def __init__(self, serial):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def send_jpg(self, payload):
+            sent.append(payload)
+
+    monkeypatch.setattr(lcd, "TLLCDDevice", DummyDevice)
+    argv = ["--output", "json", "lcd", "send-jpg", "--serial", "abc"]
+    argv += ["--file", str(source), "--fit", "--size", "320x240"]
+
+    cli.main(argv)
+    first = json.loads(capsys.readouterr().out.strip())
+    cli.main(argv)
+    second = json.loads(capsys.readouterr().out.strip())
+
+    assert Image.open(io.BytesIO(sent[0])).size == (320, 240)
+    assert sent[0] == sent[1]
+    assert first["bytes_sent"] == len(sent[0])
+    assert first["fit"]["source_bytes"] == source.stat().st_size
+    assert first["fit"]["cached"] is False
+    assert second["fit"]["cached"] is True
+
+
+def test_lcd_send_jpg_all_reports_each_panel(monkeypatch, capsys, tmp_path):
+    frame = tmp_path / "frame.jpg"
+    frame.write_bytes(b"\xff\xd8data")
+    calls = []
+
+    def fake_push_many(payload):
+        calls.append(payload)
+        return [
+            lcd.PanelPushResult(serial="a", bytes_sent=len(payload), latency_ms=12.0),
+            lcd.PanelPushResult(
+                serial="b", bytes_sent=0, latency_ms=5.0, error="USB write failed"
+            ),
+        ]
+
+    monkeypatch.setattr(lcd, "push_many", fake_push_many)
+
+    with pytest.raises(SystemExit, match="1 of 2 LCD panel"):
+        cli.main(
+            ["--output", "json", "lcd", "send-jpg", "--all", "--file", str(frame)]
+        )
+
+    payload = json.loads(capsys.readouterr().out.strip())
+    assert calls == [b"\xff\xd8data"]
+    assert payload["count"] == 2
+    assert payload["failed"] == 1
+    assert payload["panels"][0] == {
+        "serial": "a",
+        "bytes_sent": 6,
+        "latency_ms": 12.0,
+        "error": None,
+    }
+    assert payload["panels"][1]["error"] == "USB write failed"
@@ -0,0 +1,164 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from uwscli import cli, daemon, wireless
+from uwscli.tl_effects import TLEffects
+
+
+def _device(mac="aa:bb:cc:dd:ee:ff", master_mac="11:22:33:44:55:66"):
+    return wireless.WirelessDeviceInfo(
+        mac=mac,
+        master_mac=master_mac,
+        channel=8,
+        rx_type=1,
+        device_type=0,
+        fan_count=3,
+        pwm_values=(10, 20, 30, 0),
+        fan_rpm=(900, 910, 920, 0),
+        command_sequence=4,
+        raw=bytes(range(42)),
+    )
+
+
+class FakeTransceiver:
+    def __init__(self, log):
+        self.log = log
+
+    def list_devices(self):
+        return wireless.WirelessSnapshot(devices=[_device()], raw=b"\x01\x02")
+
+    def set_pwm(self, mac, pwm_values, sequence_index=1):
+        if mac == "00:00:00:00:00:01":
+            raise wireless.WirelessError(f"Device {mac} not found")
+        self.log.append(("set_pwm", mac, list(pwm_values), sequence_index))
+
+    def set_pwm_direct(self, target, pwm_values, *, sequence_index=1, label=None):
+        self.log.append(("set_pwm_direct", target.mac, list(pwm_values), label))
+
+    def set_led_effect(self, mac, effect, **kwargs):
+        self.log.append(("set_led_effect", mac, effect.name, kwargs["use_cache"]))
+
+    def unbind_device(self, mac):
+        raise RuntimeError("firmware exploded")
+
+    def close(self):
+        self.log.append(("close",))
+
+
+@pytest.fixture
+def running_daemon(tmp_path):
+    log = []
+    server = daemon.TransceiverDaemon(
+        tmp_path / "uwscli.sock", transceiver_factory=lambda: FakeTransceiver(log)
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon.ping(server.socket_path) is not None:
+            break
+        time.sleep(0.01)
+    else:
+        pytest.fail("daemon did not start")
+    yield server, log
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+def test_daemon_client_roundtrip(running_daemon):
+    server, log = running_daemon
+    with daemon.DaemonTransceiver(server.socket_path) as tx:
+        snapshot = tx.list_devices()
+        assert snapshot.devices == [_device()]
+        assert snapshot.raw == b"\x01\x02"
+        tx.set_pwm("aa:bb:cc:dd:ee:ff", [1, 2, 3, 4], sequence_index=2)
+        tx.set_pwm_direct(snapshot.devices[0], [5, 6, 7, 8], label="fan")
+        with pytest.raises(wireless.WirelessError, match="not found"):
+            tx.set_pwm("00:00:00:00:00:01", [1, 2, 3, 4])
+        with pytest.raises(daemon.DaemonError, match="Unknown method"):
+            tx.call("explode")
+    assert log == [
+        ("set_pwm", "aa:bb:cc:dd:ee:ff", [1, 2, 3, 4], 2),
+        ("set_pwm_direct", "aa:bb:cc:dd:ee:ff", [5, 6, 7, 8], "fan"),
+    ]
+
+
+def test_daemon_passes_effect_cache_choice_per_call(running_daemon):
+    server, log = running_daemon
+    mac = "aa:bb:cc:dd:ee:ff"
+    with daemon.DaemonTransceiver(server.socket_path) as tx:
+        tx.set_led_effect(mac, TLEffects.METEOR)
+        tx.set_led_effect(mac, TLEffects.METEOR, use_cache=False)
+    with daemon.DaemonTransceiver(server.socket_path, use_effect_cache=False) as tx:
+        tx.set_led_effect(mac, TLEffects.METEOR)
+    assert [entry[3] for entry in log] == [True, False, False]
+
+
+def test_cli_routes_through_running_daemon(running_daemon, monkeypatch, capsys):
+    server, log = running_daemon
+    monkeypatch.setenv(daemon.SOCKET_ENV, str(server.socket_path))
+
+    def refuse(*args, **kwargs):
+        raise AssertionError("CLI opened the dongles while a daemon was running")
+
+    monkeypatch.setattr(wireless, "WirelessTransceiver", refuse)
+    cli.main(["fan", "set-fan", "--mac", "aa:bb:cc:dd:ee:ff", "--pwm", "128"])
+    assert "Applied PWM" in capsys.readouterr().out
+    assert log == [("set_pwm", "aa:bb:cc:dd:ee:ff", [128, 128, 128, 128], 1)]
+
+    with pytest.raises(AssertionError, match="opened the dongles"):
+        cli.main(["--no-daemon", "fan", "set-fan", "--mac", "x", "--pwm", "1"])
+
+
+def test_daemon_stop_closes_transceiver(running_daemon):
+    server, log = running_daemon
+    with daemon.DaemonTransceiver(server.socket_path) as tx:
+        tx.list_devices()
+    assert daemon.stop(server.socket_path) is True
+    for _ in range(200):
+        if not server.socket_path.exists():
+            break
+        time.sleep(0.01)
+    assert not server.socket_path.exists()
+    assert log[-1] == ("close",)
+    assert daemon.ping(server.socket_path) is None
+    assert daemon.stop(server.socket_path) is False
+
+
+def test_daemon_replaces_stale_socket(tmp_path):
+    path = tmp_path / "stale.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    assert daemon.connect(path) is None
+
+    server = daemon.TransceiverDaemon(path, transceiver_factory=lambda: None)
+    server._prepare_socket_path()
+    assert not path.exists()
+
+    path.write_text("not a socket")
+    with pytest.raises(daemon.DaemonError, match="not a socket"):
+        server._prepare_socket_path()
+
+
+def test_unexpected_handler_errors_are_reported(running_daemon):
+    server, log = running_daemon
+    with daemon.DaemonTransceiver(server.socket_path) as tx:
+        with pytest.raises(daemon.DaemonError, match="firmware exploded"):
+            tx.unbind_device("aa:bb:cc:dd:ee:ff")
+        # The connection survives and the transceiver is reopened.
+        assert tx.list_devices().devices == [_device()]
+    assert log == [("close",)]
+
+
+def test_client_refuses_sockets_owned_by_other_users(running_daemon, monkeypatch):
+    server, _ = running_daemon
+    owner = server.socket_path.stat().st_uid
+    monkeypatch.setattr(daemon.os, "getuid", lambda: owner + 1)
+
+    assert daemon.connect(server.socket_path) is None
+    assert daemon.ping(server.socket_path) is None
+    with pytest.raises(daemon.DaemonError, match="owned by another user"):
+        daemon.DaemonTransceiver(server.socket_path)
@@ -0,0 +1,126 @@
+import json
+import os
+
+from uwscli import cli, effect_cache, tl_effects, tl_effects_numpy, wireless
+from uwscli.effect_cache import CompressedEffect, EffectCache, EffectCacheKey
+from uwscli.structs import WirelessDeviceInfo
+
+
+def _key(effect="RAINBOW", brightness=255):
+    return EffectCacheKey(
+        effect=effect,
+        tb=None,
+        fan_slots=4,
+        brightness=brightness,
+        direction=1,
+        led_count=104,
+        dict_size=4096,
+    )
+
+
+def test_cache_roundtrip_and_version_in_digest(tmp_path, monkeypatch):
+    cache = EffectCache(tmp_path)
+    key = _key()
+    assert cache.get(key) is None
+
+    stored = CompressedEffect(payload=b"\x01\x02\x03", led_count=104, total_frames=52)
+    cache.put(key, stored)
+    assert cache.get(key) == stored
+
+    monkeypatch.setattr(effect_cache, "__version__", "999.0.0")
+    assert cache.get(key) is None
+
+
+def test_cache_discards_corrupt_entries(tmp_path):
+    cache = EffectCache(tmp_path)
+    key = _key()
+    cache.put(key, CompressedEffect(payload=b"abc", led_count=104, total_frames=1))
+    (entry,) = cache.entries()
+    entry.path.write_bytes(b"not a cache entry")
+    assert cache.get(key) is None
+    assert cache.entries() == []
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    payload = bytes(400)
+    cache = EffectCache(tmp_path, max_bytes=1500)
+    keys = [_key(brightness=value) for value in (10, 20, 30)]
+    for index, key in enumerate(keys[:2]):
+        cache.put(key, CompressedEffect(payload=payload, led_count=104, total_frames=1))
+        path = tmp_path / f"{key.digest()}.uzc"
+        os.utime(path, (1000 + index, 1000 + index))
+
+    # Touch the oldest entry so the second one becomes least recently used.
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[2], CompressedEffect(payload=payload, led_count=104, total_frames=1))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+    assert cache.total_bytes() <= 1500
+
+
+def test_set_led_effect_reuses_cached_payload(tmp_path, monkeypatch):
+    device = WirelessDeviceInfo(
+        mac="aa:bb:cc:dd:ee:ff",
+        master_mac="11:22:33:44:55:66",
+        channel=3,
+        rx_type=2,
+        device_type=7,
+        fan_count=2,
+        pwm_values=(0, 0, 0, 0),
+        fan_rpm=(0, 0, 0, 0),
+        command_sequence=1,
+        raw=bytes(42),
+    )
+    snapshot = wireless.WirelessSnapshot(devices=[device], raw=b"")
+    tx = wireless.WirelessTransceiver.__new__(wireless.WirelessTransceiver)
+    tx._effect_cache = EffectCache(tmp_path)
+    transmitted = []
+    monkeypatch.setattr(tx, "list_devices", lambda: snapshot)
+    monkeypatch.setattr(
+        tx,
+        "_transmit_compressed_led_effect",
+        lambda target, snap, payload, **kwargs: transmitted.append((payload, kwargs)),
+    )
+    monkeypatch.setattr(tl_effects_numpy, "is_available", lambda: False)
+    generated = []
+    original = tl_effects.TLEffectGenerator.generate
+
+    def counting_generate(self, *args, **kwargs):
+        generated.append(args)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(tl_effects.TLEffectGenerator, "generate", counting_generate)
+
+    for _ in range(2):
+        tx.set_led_effect(device.mac, tl_effects.TLEffects.METEOR, tb=None)
+
+    assert len(generated) == 2  # front + back on the first call only
+    assert transmitted[0] == transmitted[1]
+
+    tx.set_led_effect(device.mac, tl_effects.TLEffects.METEOR, tb=None, use_cache=False)
+    assert len(generated) == 4
+    assert transmitted[2] == transmitted[0]
+    assert transmitted[0][1]["led_count"] == 2 * tl_effects.TLEffectGenerator.LEDS_PER_FAN
+
+
+def test_cache_cli_warm_list_purge(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv(effect_cache.CACHE_DIR_ENV, str(tmp_path))
+
+    cli.main(
+        ["--output", "json", "cache", "warm", "--effect", "breathing", "--fans", "2"]
+    )
+    warmed = json.loads(capsys.readouterr().out)
+    assert warmed["warmed"] == 1
+    assert warmed["effects"] == ["BREATHING"]
+
+    cli.main(["--output", "json", "cache", "list"])
+    listing = json.loads(capsys.readouterr().out)
+    assert [entry["effect"] for entry in listing["entries"]] == ["BREATHING"]
+    assert listing["entries"][0]["fans"] == 2
+    assert listing["entries"][0]["scope"] == "both"
+
+    cli.main(["--output", "json", "cache", "purge"])
+    assert json.loads(capsys.readouterr().out)["removed"] == 1
+    assert EffectCache(tmp_path).entries() == []
@@ -0,0 +1,186 @@
+import io
+import json
+
+import pytest
+
+from uwscli import cli, lcd, lcd_dedup, lcd_stream
+from uwscli.lcd_dedup import DedupLCDDevice, FrameDedupError
+
+
+class _Panel:
+    def __init__(self):
+        self.frames = []
+        self.synced = []
+        self.idle = 0.0
+        self.closed = False
+
+    def send_jpg(self, payload):
+        self.frames.append(payload)
+        self.idle = 0.0
+
+    def send_sync_jpg(self, payload):
+        self.synced.append(payload)
+        self.idle = 0.0
+
+    def idle_seconds(self):
+        return self.idle
+
+    def handshake(self):
+        return {"mode": 1}
+
+    def close(self):
+        self.closed = True
+
+
+def test_identical_frames_are_skipped_and_counted():
+    panel = _Panel()
+    device = DedupLCDDevice(panel)
+
+    assert device.send_jpg(b"A" * 100) is True
+    assert device.send_jpg(b"A" * 100) is False
+    assert device.send_sync_jpg(b"A" * 100) is False
+    assert device.send_jpg(b"B" * 50) is True
+
+    assert panel.frames == [b"A" * 100, b"B" * 50]
+    assert device.stats.as_dict() == {
+        "frames": 4,
+        "sent": 2,
+        "skipped": 2,
+        "identical": 2,
+        "similar": 0,
+        "refreshes": 0,
+        "bytes_sent": 150,
+        "bytes_saved": 200,
+    }
+    assert device.handshake() == {"mode": 1}
+
+    device.reset()
+    assert device.send_jpg(b"B" * 50) is True
+
+
+def test_duplicate_is_pushed_once_panel_is_due_for_refresh():
+    panel = _Panel()
+    device = DedupLCDDevice(panel, refresh_after=1.5)
+
+    device.send_jpg(b"frame")
+    panel.idle = 1.0
+    assert device.send_jpg(b"frame") is False
+    panel.idle = 1.5
+    assert device.send_jpg(b"frame") is True
+
+    assert panel.frames == [b"frame", b"frame"]
+    assert device.stats.refreshes == 1
+    assert device.stats.identical == 1
+
+
+def test_streamer_counts_suppressed_frames_as_skipped():
+    panel = _Panel()
+    device = DedupLCDDevice(panel)
+    source = [b"A" * 10, b"A" * 10, b"B" * 20, b"B" * 20, b"B" * 20, b"C"]
+    frames = lcd_stream.throttle(source, 50)
+
+    stats = lcd_stream.LCDStreamer(device, frames, fps=500).run(max_frames=5)
+
+    assert panel.frames == [b"A" * 10, b"B" * 20]
+    assert stats.frames_sent == 2
+    assert stats.frames_skipped == 3
+    assert stats.bytes_sent == 30
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(FrameDedupError, match="Similarity"):
+        DedupLCDDevice(_Panel(), similarity=1.5)
+    with pytest.raises(FrameDedupError, match="Refresh"):
+        DedupLCDDevice(_Panel(), refresh_after=0)
+
+
+def test_similar_frames_are_skipped_by_pixel_difference():
+    Image = pytest.importorskip("PIL.Image")
+
+    def jpeg(shade, corner=None):
+        image = Image.new("RGB", (400, 400), (shade, shade, shade))
+        if corner is not None:
+            image.paste(corner, (0, 0, 40, 40))
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        return buffer.getvalue()
+
+    panel = _Panel()
+    device = DedupLCDDevice(panel, similarity=0.02)
+
+    assert device.send_jpg(jpeg(100)) is True
+    # A 40x40 corner (1% of the area) changes: a mean shift of well under 2%.
+    assert device.send_jpg(jpeg(100, corner=(200, 200, 200))) is False
+    assert device.send_jpg(jpeg(180)) is True
+    assert device.send_jpg(b"not a jpeg") is True
+
+    assert len(panel.frames) == 3
+    assert device.stats.similar == 1
+    assert device.stats.bytes_saved > 0
+
+
+def test_cli_stream_dedup_reports_saved_transfers(monkeypatch, capsys, tmp_path):
+    frame = b"\xff\xd8\xff\xda\x00\x02same\xff\xd9"
+    recording = tmp_path / "clip.mjpeg"
+    recording.write_bytes(frame * 4)
+    panel = _Panel()
+
+    class DummyDevice:
+        def __init__(self, serial):
+            pass
+
+        def __enter__(self):
+            return panel
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    monkeypatch.setattr(lcd, "TLLCDDevice", DummyDevice)
+    cli.main(
+        [
+            "--output",
+            "json",
+            "lcd",
+            "stream",
+            "--serial",
+            "abc",
+            "--file",
+            str(recording),
+            "--fps",
+            "100",
+            "--stats-interval",
+            "0",
+            "--dedup",
+        ]
+    )
+
+    payload = json.loads(capsys.readouterr().out)
+    assert panel.frames == [frame]
+    # Stream totals agree with what actually reached the panel.
+    assert payload["frames_sent"] == 1
+    assert payload["frames_skipped"] == 3
+    assert payload["bytes_sent"] == len(frame)
+    assert payload["dedup"]["sent"] == 1
+    assert payload["dedup"]["identical"] == 3
+    assert payload["dedup"]["bytes_saved"] == 3 * len(frame)
+
+
+def test_cli_stream_similarity_requires_dedup(monkeypatch):
+    class DummyDevice:
+        def __init__(self, serial):
+            pass
+
+        def __enter__(self):
+            return _Panel()
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    monkeypatch.setattr(lcd, "TLLCDDevice", DummyDevice)
+    monkeypatch.setattr(lcd_dedup, "Image", None)
+    base = ["lcd", "stream", "--serial", "abc", "--stdin", "--similarity", "0.01"]
+
+    with pytest.raises(SystemExit, match="requires --dedup"):
+        cli.main(base)
+    with pytest.raises(SystemExit, match="Pillow is required"):
+        cli.main(base + ["--dedup"])
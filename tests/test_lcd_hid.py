@@ -0,0 +1,244 @@
+import collections
+import time
+
+import pytest
+
+from uwscli import lcd
+
+
+class _FakePanel:
+    """HID panel that acknowledges each report after a simulated round trip.
+
+    ``lockstep_only`` panels drop any report written while an earlier
+    acknowledgement is still unread, like firmware with a single reply slot.
+    """
+
+    def __init__(self, *, rtt=0.0, per_report=0.0, lockstep_only=False):
+        self.rtt = rtt
+        self.per_report = per_report
+        self.lockstep_only = lockstep_only
+        self.nonblocking = True
+        self.reports = []
+        self.dropped = 0
+        self._replies = collections.deque()
+        self._busy_until = 0.0
+
+    def write(self, packet):
+        now = time.perf_counter()
+        if self.lockstep_only and self._replies:
+            self.dropped += 1
+            return len(packet)
+        self.reports.append(bytes(packet))
+        done = max(now + self.rtt / 2, self._busy_until) + self.per_report
+        self._busy_until = done
+        reply = bytes([lcd.LCD_REPORT_ID, packet[1]]) + bytes(62)
+        self._replies.append((done + self.rtt / 2, reply))
+        return len(packet)
+
+    def read(self, size, timeout=None):
+        if not self._replies:
+            return b""
+        ready, reply = self._replies.popleft()
+        delay = ready - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return reply
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def open_panel(monkeypatch):
+    monkeypatch.setattr(lcd, "_LOCKSTEP_PANELS", set())
+
+    def open_panel(panel, **kwargs):
+        monkeypatch.setattr(lcd.hid, "Device", lambda path: panel, raising=False)
+        info = lcd.HidDeviceInfo(
+            path="hid-1",
+            vendor_id=0x04FC,
+            product_id=0x7393,
+            serial_number="P1",
+            manufacturer=None,
+            product=None,
+        )
+        return lcd.TLLCDDevice("P1", info=info, **kwargs)
+
+    return open_panel
+
+
+def _frame(size):
+    return (bytes(range(251)) * (size // 251 + 1))[:size]
+
+
+def _payload(reports):
+    data = bytearray()
+    for report in reports:
+        length = int.from_bytes(report[9:11], "big")
+        data += report[11 : 11 + length]
+    return bytes(data)
+
+
+def test_send_jpg_keeps_reports_in_flight(open_panel):
+    panel = _FakePanel()
+    device = open_panel(panel, ack_window=4)
+    frame = _frame(lcd.MAX_CHUNK * 10 + 7)
+
+    device.send_jpg(frame)
+
+    assert len(panel.reports) == 11
+    assert [int.from_bytes(r[6:9], "big") for r in panel.reports] == list(range(11))
+    assert _payload(panel.reports) == frame
+    assert not panel._replies  # every acknowledgement was consumed
+
+
+def test_lockstep_firmware_falls_back_and_is_remembered(open_panel):
+    panel = _FakePanel(lockstep_only=True)
+    device = open_panel(panel)
+    frame = _frame(lcd.MAX_CHUNK * 6)
+
+    device.send_jpg(frame)
+
+    assert panel.dropped > 0
+    assert _payload(panel.reports[-6:]) == frame
+    assert (0x04FC, 0x7393, "P1") in lcd._LOCKSTEP_PANELS
+
+    panel.reports.clear()
+    dropped = panel.dropped
+    device.send_jpg(frame)
+    assert panel.dropped == dropped
+    assert _payload(panel.reports) == frame
+
+
+def test_unacknowledged_single_report_still_raises(open_panel):
+    panel = _FakePanel()
+    device = open_panel(panel)
+    panel.write = lambda packet: len(packet)  # reports vanish
+
+    with pytest.raises(lcd.LCDDeviceError, match="Timeout waiting"):
+        device.control(lcd.LCDControlSetting(mode=lcd.LCDControlMode.SHOW_JPG))
+
+
+def test_reports_in_flight_never_exceed_ack_window(open_panel):
+    panel = _FakePanel()
+    device = open_panel(panel, ack_window=4)
+    in_flight = []
+    read = panel.read
+
+    def tracking_read(size, timeout=None):
+        in_flight.append(len(panel.reports) - len(in_flight))
+        return read(size, timeout)
+
+    panel.read = tracking_read
+    device.send_jpg(_frame(lcd.MAX_CHUNK * 12))
+
+    # Four reports go out before the first acknowledgement is read, and the
+    # window stays full but never overflows after that.
+    assert in_flight[0] == 4
+    assert max(in_flight) == 4
+    assert len(in_flight) == len(panel.reports) == 12
+
+    panel.reports.clear()
+    in_flight.clear()
+    open_panel(panel, ack_window=1).send_jpg(_frame(lcd.MAX_CHUNK * 3))
+    assert in_flight == [1, 1, 1]
+
+
+@pytest.mark.benchmark
+def test_pipelined_upload_benchmark(open_panel):
+    frame = _frame(60 * 1024)
+
+    def upload(window):
+        panel = _FakePanel(rtt=0.002, per_report=0.0001)
+        device = open_panel(panel, ack_window=window)
+        start = time.perf_counter()
+        device.send_jpg(frame)
+        elapsed = time.perf_counter() - start
+        assert _payload(panel.reports) == frame
+        return elapsed
+
+    lockstep = upload(1)
+    pipelined = upload(lcd.DEFAULT_ACK_WINDOW)
+    print(
+        f"HID upload {len(frame)} bytes: lock-step={lockstep * 1000:.1f}ms "
+        f"window={lcd.DEFAULT_ACK_WINDOW} {pipelined * 1000:.1f}ms "
+        f"({lockstep / pipelined:.1f}x)"
+    )
+
+
+def _copying_packets(command, data):
+    # Reference packetizer that copies every chunk into a fresh report.
+    if not data:
+        return [bytes([lcd.LCD_REPORT_ID, command]) + bytes(lcd.OUTPUT_PACKET_SIZE - 2)]
+    packets = []
+    for number, offset in enumerate(range(0, len(data), lcd.MAX_CHUNK)):
+        chunk = data[offset : offset + lcd.MAX_CHUNK]
+        packet = bytearray(lcd.OUTPUT_PACKET_SIZE)
+        packet[0:2] = bytes([lcd.LCD_REPORT_ID, command])
+        packet[2:6] = len(data).to_bytes(4, "big")
+        packet[6:9] = number.to_bytes(3, "big")
+        packet[9:11] = len(chunk).to_bytes(2, "big")
+        packet[11 : 11 + len(chunk)] = chunk
+        packets.append(bytes(packet))
+    return packets
+
+
+def test_build_packets_matches_copying_packetizer(open_panel):
+    device = open_panel(_FakePanel())
+    for size in (0, 1, lcd.MAX_CHUNK, lcd.MAX_CHUNK + 1, 5000, 1003):
+        data = _frame(size)
+        built = [bytes(report) for report in device._build_packets(0x47, data)]
+        assert built == _copying_packets(0x47, data), size
+
+
+def test_send_boot_video_streams_from_mmap(open_panel, tmp_path):
+    import hashlib
+    import mmap
+    import tracemalloc
+
+    video = tmp_path / "boot.avi"
+    video.write_bytes(_frame(4 * 1024 * 1024))
+    panel = _FakePanel()
+    digest = hashlib.sha256()
+    reports = [0]
+
+    def write(packet):
+        length = int.from_bytes(packet[9:11], "big")
+        digest.update(packet[11 : 11 + length])
+        reports[0] += 1
+        panel._replies.append((0.0, bytes([lcd.LCD_REPORT_ID, packet[1]])))
+        return len(packet)
+
+    panel.write = write
+    device = open_panel(panel)
+    with video.open("rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        tracemalloc.start()
+        try:
+            device.send_boot_video(mapped)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    assert reports[0] == -(-video.stat().st_size // lcd.MAX_CHUNK)
+    assert digest.digest() == hashlib.sha256(video.read_bytes()).digest()
+    assert peak < 256 * 1024
+
+
+def test_send_avi_accepts_open_files_and_streams(open_panel, tmp_path):
+    import io
+
+    panel = _FakePanel()
+    device = open_panel(panel)
+    video = tmp_path / "clip.avi"
+    video.write_bytes(_frame(lcd.MAX_CHUNK * 3 + 9))
+
+    with video.open("rb") as handle:
+        device.send_avi(handle)
+    assert _payload(panel.reports) == video.read_bytes()
+    assert {report[1] for report in panel.reports} == {0x45}
+
+    panel.reports.clear()
+    device.send_avi(io.BytesIO(b"RIFF" * 200))
+    assert _payload(panel.reports) == b"RIFF" * 200
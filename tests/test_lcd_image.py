@@ -0,0 +1,87 @@
+import io
+import os
+
+import pytest
+
+pytest.importorskip("PIL")
+
+from PIL import Image  # noqa: E402
+
+from uwscli import lcd_image  # noqa: E402
+from uwscli.lcd_image import FitOptions, FrameCache, LCDImageError  # noqa: E402
+
+
+def _encode(image, format="PNG", **kwargs):
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **kwargs)
+    return buffer.getvalue()
+
+
+def _noise(size):
+    return Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+
+
+def test_fit_jpeg_resizes_and_finds_highest_quality_within_budget():
+    source = _encode(_noise((1200, 900)))
+    options = FitOptions(max_bytes=60_000)
+
+    frame = lcd_image.fit_jpeg(source, options)
+
+    assert len(frame.data) <= 60_000
+    decoded = Image.open(io.BytesIO(frame.data))
+    assert decoded.format == "JPEG"
+    assert decoded.size == (400, 400)
+    assert frame.quality is not None and frame.quality < lcd_image.MAX_QUALITY
+    # One quality step up would have blown the budget.
+    prepared = lcd_image._prepare(Image.open(io.BytesIO(source)), options)
+    assert len(lcd_image._encode(prepared, frame.quality + 1)) > 60_000
+    assert frame.encodes <= 8
+
+
+def test_fit_jpeg_passes_through_panel_ready_jpegs():
+    source = _encode(Image.new("RGB", (400, 400), (10, 20, 30)), "JPEG")
+
+    frame = lcd_image.fit_jpeg(source)
+
+    assert frame.data is source
+    assert frame.quality is None
+
+
+def test_fit_jpeg_rotates_clockwise_before_fitting():
+    image = Image.new("RGB", (400, 200), (255, 0, 0))
+    image.paste((0, 0, 255), (200, 0, 400, 200))
+    options = FitOptions(size=(200, 400), rotation=90)
+
+    frame = lcd_image.fit_jpeg(_encode(image), options)
+
+    decoded = Image.open(io.BytesIO(frame.data)).convert("RGB")
+    assert decoded.size == (200, 400)
+    top, bottom = decoded.getpixel((100, 50)), decoded.getpixel((100, 350))
+    assert top[0] > 200 and top[2] < 60  # the left (red) half now on top
+    assert bottom[2] > 200 and bottom[0] < 60
+
+
+def test_fit_jpeg_reuses_cached_frames(tmp_path, monkeypatch):
+    cache = FrameCache(tmp_path)
+    source = _encode(_noise((300, 300)))
+
+    first = lcd_image.fit_jpeg(source, cache=cache)
+
+    def fail(image, quality):
+        raise AssertionError("cache hit must not re-encode")
+
+    monkeypatch.setattr(lcd_image, "_encode", fail)
+    second = lcd_image.fit_jpeg(source, cache=cache)
+    assert second.cached and second.data == first.data
+
+    with pytest.raises(AssertionError):
+        lcd_image.fit_jpeg(source, FitOptions(rotation=180), cache=cache)
+
+
+def test_fit_jpeg_reports_unreachable_budgets():
+    with pytest.raises(LCDImageError, match="does not fit in 500 bytes"):
+        lcd_image.fit_jpeg(_encode(_noise((400, 400))), FitOptions(max_bytes=500))
+    with pytest.raises(LCDImageError, match="Unable to decode"):
+        lcd_image.fit_jpeg(b"not an image")
+    with pytest.raises(LCDImageError, match="Rotation"):
+        FitOptions(rotation=45)
@@ -0,0 +1,147 @@
+import heapq
+import threading
+import time
+
+import pytest
+
+from uwscli import cli, lcd, lcd_keepalive
+
+
+class _Clock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class _Panel:
+    def __init__(self, *, busy=False, fail=False, clock=time.monotonic):
+        self.busy = busy
+        self.fail = fail
+        self.handshakes = []
+        self._clock = clock
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def idle_seconds(self):
+        if self.busy:
+            return 0.0  # a frame was pushed just now
+        return self._clock() - self._last if self._last else float("inf")
+
+    def handshake(self):
+        if self.fail:
+            raise lcd.LCDDeviceError("No valid handshake response from wireless LCD")
+        with self._lock:
+            self._last = self._clock()
+            self.handshakes.append(self._last)
+        return {"mode": 0, "frame_index": 0}
+
+
+def _run_due(scheduler, clock, steps):
+    """Advance the fake clock to each due refresh and run it inline."""
+    for _ in range(steps):
+        due, _, name = heapq.heappop(scheduler._queue)
+        clock.now = max(clock.now, due)
+        scheduler._refresh(name, scheduler._devices[name], scheduler._stats[name])
+
+
+def test_scheduler_refreshes_idle_panels_and_skips_busy_ones(monkeypatch):
+    # Always take the largest random share: full stagger, maximum jitter.
+    monkeypatch.setattr(lcd_keepalive.random, "uniform", lambda low, high: high)
+    clock = _Clock()
+    idle = _Panel(clock=clock)
+    busy = _Panel(busy=True, clock=clock)
+    broken = _Panel(fail=True, clock=clock)
+    errors = []
+    scheduler = lcd_keepalive.KeepAliveScheduler(
+        interval=10.0,
+        jitter=0.5,
+        on_error=lambda name, exc: errors.append(name),
+        clock=clock,
+    )
+    scheduler.add("idle", idle)
+    scheduler.add("busy", busy)
+    scheduler.add("broken", broken)
+
+    _run_due(scheduler, clock, 13)
+    stats = scheduler.stats()
+
+    # First refresh one interval in, then every interval less the jitter.
+    assert idle.handshakes == [110.0, 115.0, 120.0, 125.0, 130.0]
+    assert stats["idle"].handshakes == 5
+    assert stats["idle"].skipped == 0
+    # A panel that is always being written to is only ever looked at again.
+    assert busy.handshakes == []
+    assert stats["busy"].skipped == 3
+    assert stats["broken"].failures == 5
+    assert "No valid handshake" in stats["broken"].last_error
+    assert errors == ["broken"] * 5
+
+
+def test_scheduler_defers_refresh_after_a_frame_push():
+    clock = _Clock()
+    panel = _Panel(clock=clock)
+    scheduler = lcd_keepalive.KeepAliveScheduler(interval=10.0, jitter=0.0, clock=clock)
+    scheduler.add("panel", panel)
+    _run_due(scheduler, clock, 1)
+    first = panel.handshakes[-1]
+
+    # Someone else pushes a frame 4s after our refresh.
+    clock.now = first + 4.0
+    panel.handshake()
+    panel.handshakes.pop()
+    _run_due(scheduler, clock, 1)
+
+    assert scheduler.stats()["panel"].skipped == 1
+    assert scheduler._queue[0][0] == first + 14.0
+    _run_due(scheduler, clock, 1)
+    assert panel.handshakes == [first, first + 14.0]
+
+
+def test_scheduler_thread_handshakes_and_stops():
+    panel = _Panel()
+    scheduler = lcd_keepalive.KeepAliveScheduler(interval=0.01)
+    scheduler.add("panel", panel)
+    deadline = time.monotonic() + 5.0
+    with scheduler:
+        while not panel.handshakes and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    assert panel.handshakes
+    assert scheduler.stats()["panel"].handshakes == len(panel.handshakes)
+
+
+def test_scheduler_rejects_bad_configuration():
+    with pytest.raises(lcd_keepalive.KeepAliveError):
+        lcd_keepalive.KeepAliveScheduler(interval=0)
+    with pytest.raises(lcd_keepalive.KeepAliveError):
+        lcd_keepalive.KeepAliveScheduler(jitter=1.0)
+
+
+def test_cli_keep_alive_drives_every_serial(monkeypatch, capsys):
+    panels = {}
+
+    class DummyDevice(_Panel):
+        def __init__(self, serial):
+            super().__init__()
+            panels[serial] = self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    def interrupt(_seconds):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(lcd, "TLLCDDevice", DummyDevice)
+    monkeypatch.setattr(cli.time, "sleep", interrupt)
+    cli.main(["lcd", "keep-alive", "--serial", "a", "--serial", "serial:b"])
+
+    out = capsys.readouterr().out
+    assert "Keeping LCD a, b awake" in out
+    assert "Keep-alive stopped." in out
+    # Initial connectivity handshake on every panel.
+    assert [len(panels[name].handshakes) for name in ("a", "b")] == [1, 1]
@@ -0,0 +1,88 @@
+import threading
+
+from uwscli import lcd
+
+
+def _info(serial):
+    return lcd.HidDeviceInfo(
+        path=f"usb:1cbe:0006:{serial}",
+        vendor_id=0x1CBE,
+        product_id=0x0006,
+        serial_number=serial,
+        manufacturer="LIANLI",
+        product="TL-LCD Wireless",
+        source="wireless",
+        location_id=1,
+    )
+
+
+def test_push_many_sends_to_every_panel_in_parallel(monkeypatch):
+    listings = []
+    barrier = threading.Barrier(3)
+    opened = []
+    sent = []
+
+    def enumerate_devices():
+        listings.append(1)
+        return [_info("a"), _info("b"), _info("c")]
+
+    class DummyDevice:
+        def __init__(self, serial, *, info=None):
+            opened.append((serial, info.serial_number if info else None))
+            self.serial = serial
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def send_jpg(self, payload):
+            # Only opens once all three panels are writing at the same time.
+            barrier.wait(timeout=5)
+            if self.serial == "b":
+                raise lcd.LCDDeviceError("USB interface is busy")
+            sent.append((self.serial, payload))
+
+    monkeypatch.setattr(lcd, "enumerate_devices", enumerate_devices)
+    monkeypatch.setattr(lcd, "TLLCDDevice", DummyDevice)
+
+    results = lcd.push_many(b"\xff\xd8jpeg")
+
+    assert len(listings) == 1
+    assert sorted(opened) == [("a", "a"), ("b", "b"), ("c", "c")]
+    assert sorted(sent) == [("a", b"\xff\xd8jpeg"), ("c", b"\xff\xd8jpeg")]
+    assert [result.serial for result in results] == ["a", "b", "c"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[1].error == "USB interface is busy"
+    assert results[1].bytes_sent == 0
+    assert results[0].bytes_sent == 6
+    assert all(result.latency_ms >= 0 for result in results)
+
+
+def test_push_many_accepts_per_panel_frames(monkeypatch):
+    sent = {}
+
+    class DummyDevice:
+        def __init__(self, serial, *, info=None):
+            self.serial = serial
+            self.info = info
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def send_jpg(self, payload):
+            sent[self.serial] = (payload, self.info)
+
+    monkeypatch.setattr(lcd, "enumerate_devices", lambda: [_info("a"), _info("a")])
+    monkeypatch.setattr(lcd, "TLLCDDevice", DummyDevice)
+
+    results = lcd.push_many({"a": b"one", "x": b"two"})
+
+    assert [result.ok for result in results] == [True, True]
+    # Ambiguous or unknown serials are left for TLLCDDevice to resolve.
+    assert sent == {"a": (b"one", None), "x": (b"two", None)}
+    assert lcd.push_many({}) == []
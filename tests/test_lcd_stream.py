@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+
+from uwscli import cli, lcd, lcd_stream
+
+
+def _jpeg(tag: bytes) -> bytes:
+    """Minimal JPEG-shaped frame with traps for a naive FFD9 search."""
+
+    thumbnail = b"\xff\xd8thumb\xff\xd9"
+    app1 = b"Exif\x00\x00" + thumbnail
+    sos_header = b"\x01\x01\x00\x00\x3f\x00"
+    # Entropy data: stuffed 0xFF00, a restart marker, then the payload tag.
+    scan = b"\x12\xff\x00\x34\xff\xd0" + tag
+    return (
+        b"\xff\xd8"
+        + b"\xff\xe1"
+        + (len(app1) + 2).to_bytes(2, "big")
+        + app1
+        + b"\xff\xda"
+        + (len(sos_header) + 2).to_bytes(2, "big")
+        + sos_header
+        + scan
+        + b"\xff\xd9"
+    )
+
+
+def test_splitter_handles_thumbnails_and_mjpeg_boundaries():
+    frames = [_jpeg(b"one"), _jpeg(b"two"), _jpeg(b"three")]
+    stream = b""
+    for frame in frames:
+        stream += b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n"
+
+    splitter = lcd_stream.JPEGSplitter()
+    out = []
+    for index in range(len(stream)):
+        out.extend(splitter.feed(stream[index : index + 1]))
+    assert out == frames
+
+    assert lcd_stream.JPEGSplitter().feed(b"".join(frames)) == frames
+
+
+def test_frame_queue_keeps_only_newest():
+    queue = lcd_stream.FrameQueue(maxsize=2)
+    for index in range(5):
+        queue.put(lcd_stream.Frame(bytes([index]), 0.0, 0.0))
+    assert queue.get_latest(timeout=0).data == b"\x04"
+    assert queue.dropped == 4
+    assert queue.get_latest(timeout=0) is None
+    queue.close()
+    assert queue.exhausted
+
+
+class _SlowPanel:
+    def __init__(self, delay):
+        self.delay = delay
+        self.frames = []
+
+    def send_jpg(self, payload):
+        time.sleep(self.delay)
+        self.frames.append(payload)
+
+    def idle_seconds(self):
+        return 0.0
+
+    def handshake(self):
+        return {"mode": 1, "frame_index": 0}
+
+
+def test_streamer_drops_stale_frames_instead_of_lagging():
+    produced = threading.Event()
+
+    def source():
+        for index in range(200):
+            yield b"frame-%d" % index
+        produced.set()
+
+    panel = _SlowPanel(0.02)
+    streamer = lcd_stream.LCDStreamer(panel, source(), fps=1000, queue_size=2)
+    stats = streamer.run(duration=2.0)
+
+    assert produced.is_set()
+    assert stats.frames_read == 200
+    assert 0 < stats.frames_sent < 50
+    assert stats.frames_sent + stats.frames_dropped == 200
+    assert panel.frames[-1] == b"frame-199"
+    info = stats.as_dict()
+    assert info["avg_send_ms"] >= 15
+    assert info["fps"] > 0
+
+
+def test_streamer_paces_to_target_fps():
+    panel = _SlowPanel(0)
+    frames = lcd_stream.throttle((b"x" for _ in range(1000)), 200)
+    stats = lcd_stream.LCDStreamer(panel, frames, fps=20).run(max_frames=5)
+    assert stats.frames_sent == 5
+    # Five frames at 20 fps span at least four 50 ms slots.
+    assert stats.elapsed >= 0.19
+
+
+def test_splitter_resyncs_past_garbage_without_recursing():
+    garbage = b"\xff\xd8\x00" * 5000  # SOI markers followed by non-markers
+    splitter = lcd_stream.JPEGSplitter()
+
+    out = splitter.feed(_jpeg(b"one") + garbage + _jpeg(b"two") + garbage)
+    out += splitter.feed(_jpeg(b"three"))
+
+    assert out == [_jpeg(b"one"), _jpeg(b"two"), _jpeg(b"three")]
+
+
+def test_directory_source_yields_newest_complete_file(tmp_path):
+    (tmp_path / "old.jpg").write_bytes(_jpeg(b"old"))
+    time.sleep(0.01)
+    (tmp_path / "partial.jpg").write_bytes(_jpeg(b"new")[:-4])
+    stop = threading.Event()
+    frames = lcd_stream.iter_directory(tmp_path, poll_interval=0.01, stop=stop)
+
+    partial = tmp_path / "partial.jpg"
+    timer = threading.Timer(0.05, partial.write_bytes, args=(_jpeg(b"new"),))
+    timer.start()
+    try:
+        assert next(frames) == _jpeg(b"new")
+    finally:
+        timer.join()
+        stop.set()
+
+
+def test_cli_stream_from_file(monkeypatch, capsys, tmp_path):
+    recording = tmp_path / "clip.mjpeg"
+    recording.write_bytes(b"".join(_jpeg(bytes([65 + i])) for i in range(3)))
+    panel = _SlowPanel(0)
+
+    class DummyDevice:
+        def __init__(self, serial):
+            assert serial == "abc"
+
+        def __enter__(self):
+            return panel
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    monkeypatch.setattr(lcd, "TLLCDDevice", DummyDevice)
+    cli.main(
+        [
+            "--output",
+            "json",
+            "lcd",
+            "stream",
+            "--serial",
+            "abc",
+            "--file",
+            str(recording),
+            "--fps",
+            "50",
+            "--stats-interval",
+            "0",
+        ]
+    )
+
+    payload = json.loads(capsys.readouterr().out)
+    assert panel.frames == [_jpeg(bytes([65 + i])) for i in range(3)]
+    assert payload["frames_sent"] == 3
+    assert payload["frames_dropped"] == 0
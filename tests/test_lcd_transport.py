@@ -0,0 +1,257 @@
+import time
+
+import pytest
+
+from uwscli import lcd
+from uwscli.usbutil import USBError
+
+
+class _XorDES:
+    """Stand-in cipher: XOR with 0x5A so encrypted bytes are recognisable."""
+
+    MODE_CBC = 2
+
+    @staticmethod
+    def new(key, mode, iv):
+        return _XorDES()
+
+    def encrypt(self, data, output=None):
+        encrypted = bytes(byte ^ 0x5A for byte in data)
+        if output is None:
+            return encrypted
+        output[:] = encrypted
+        return None
+
+
+class _FakeEndpoint:
+    """Receiver that counts displayed frames in its handshake reply.
+
+    ``reject_short`` stalls short frame transfers; ``ignore_short`` lets
+    libusb report them written while the firmware drops them.
+    """
+
+    def __init__(self, reject_short=False, ignore_short=False):
+        self.reject_short = reject_short
+        self.ignore_short = ignore_short
+        self.writes = []
+        self.frame_index = 0
+
+    def write(self, payload):
+        short = 512 < len(payload) < lcd.WirelessUSBTransport._PAYLOAD_BUFFER
+        if self.reject_short and short:
+            raise USBError("USB write failed: [Errno 32] Pipe error")
+        self.writes.append(bytes(payload))
+        if len(payload) > 512 and not (self.ignore_short and short):
+            self.frame_index = (self.frame_index + 1) & 0xFF
+        return len(payload)
+
+    def read(self, size, timeout_ms=None):
+        reply = bytearray(size)
+        reply[0] = lcd.WirelessCommand.GET_POS_INDEX
+        reply[9] = self.frame_index
+        return bytes(reply)
+
+    def close(self):
+        pass
+
+
+def _transport(monkeypatch, endpoint, location_id=7, **kwargs):
+    monkeypatch.setattr(lcd, "DES", _XorDES)
+    monkeypatch.setattr(lcd, "USBEndpointDevice", lambda *args, **kw: endpoint)
+    monkeypatch.setattr(lcd.time, "sleep", lambda _: None)
+    transport = lcd.WirelessUSBTransport(
+        0x1CBE, 0x0006, location_id=location_id, **kwargs
+    )
+    transport._last_contact = lcd.time.monotonic()
+    return transport
+
+
+@pytest.fixture(autouse=True)
+def _fresh_probe_cache(monkeypatch):
+    monkeypatch.setattr(lcd, "_MIN_TRANSFER_SIZES", {})
+    monkeypatch.delenv(lcd.COMPACT_TRANSFERS_ENV, raising=False)
+
+
+def _frames(endpoint):
+    return [write for write in endpoint.writes if len(write) > 512]
+
+
+def test_frames_use_full_size_transfers_by_default(monkeypatch):
+    endpoint = _FakeEndpoint()
+    transport = _transport(monkeypatch, endpoint)
+
+    transport.send_jpg(b"\xaa" * 2000)
+    transport.send_jpg(b"\xbb" * 100)
+
+    assert [len(write) for write in endpoint.writes] == [102400, 102400]
+    assert endpoint.writes[1][512:612] == b"\xbb" * 100
+    assert set(endpoint.writes[1][612:]) == {0}
+    assert lcd._MIN_TRANSFER_SIZES == {}
+
+
+def test_compact_frames_reuse_one_buffer_and_send_used_length(monkeypatch):
+    endpoint = _FakeEndpoint()
+    transport = _transport(monkeypatch, endpoint, compact_transfers=True)
+
+    transport.send_jpg(b"\xaa" * 2000)
+    buffer = transport._transfer
+    transport.send_jpg(b"\xbb" * 100)
+    transport.send_jpg(b"\xcc" * 512)
+
+    assert transport._transfer is buffer
+    # The probe frame is bracketed by handshakes; later frames are not.
+    headers = [write[0] ^ 0x5A for write in endpoint.writes]
+    assert headers.count(lcd.WirelessCommand.GET_POS_INDEX) == 2
+    first, second, third = _frames(endpoint)
+    assert len(first) == 512 + 2000
+    assert first[0] == lcd.WirelessCommand.PUSH_JPG ^ 0x5A
+    assert first[8:12] == bytes(b ^ 0x5A for b in (2000).to_bytes(4, "big"))
+    # PKCS#7 padding block encrypted in place after the 504-byte header.
+    assert first[504:512] == bytes([8 ^ 0x5A] * 8)
+    assert len(second) == 612
+    assert second[512:] == b"\xbb" * 100
+    # 1024 bytes would end on a full USB packet; one zero byte terminates it.
+    assert third[512:] == b"\xcc" * 512 + b"\x00"
+    assert buffer[1024:2512] == bytes(1488)
+
+
+def test_rejected_short_transfer_falls_back_to_full_buffer(monkeypatch):
+    endpoint = _FakeEndpoint(reject_short=True)
+    transport = _transport(monkeypatch, endpoint, compact_transfers=True)
+
+    transport.send_jpg(b"\x01" * 300)
+    transport.send_jpg(b"\x02" * 10)
+
+    frames = _frames(endpoint)
+    assert [len(write) for write in frames] == [102400, 102400]
+    assert frames[1][512:523] == b"\x02" * 10 + b"\x00"
+    assert set(frames[1][522:]) == {0}
+
+    # The probe result is shared with later transports for the same receiver.
+    other = _transport(monkeypatch, _FakeEndpoint(), compact_transfers=True)
+    other.send_jpg(b"\x03")
+    assert [len(write) for write in other._device.writes] == [102400]
+
+
+def test_short_transfer_written_but_not_shown_falls_back(monkeypatch):
+    endpoint = _FakeEndpoint(ignore_short=True)
+    monkeypatch.setenv(lcd.COMPACT_TRANSFERS_ENV, "1")
+    transport = _transport(monkeypatch, endpoint)
+
+    transport.send_jpg(b"\x01" * 300)
+    transport.send_jpg(b"\x02" * 300)
+
+    # libusb accepted the probe, but the frame index never moved: the same
+    # frame is resent in the full buffer and every later frame follows suit.
+    assert [len(write) for write in _frames(endpoint)] == [812, 102400, 102400]
+    assert _frames(endpoint)[1][512:812] == b"\x01" * 300
+    assert endpoint.frame_index == 2
+
+
+def _legacy_packet(des, padding, command, timestamp, payload):
+    """Packet construction as it was before the reusable transfer buffer."""
+
+    header = bytearray(504)
+    header[0] = command
+    header[2] = 26
+    header[3] = 109
+    header[4:8] = timestamp.to_bytes(4, "little")
+    if payload is not None:
+        header[8:12] = len(payload).to_bytes(4, "big")
+    key = lcd.WirelessUSBTransport._KEY
+    cipher = des.new(key, des.MODE_CBC, iv=key)
+    encrypted = cipher.encrypt(padding.pad(bytes(header), 8, style="pkcs7"))
+    if payload is None:
+        packet = bytearray(512)
+        packet[: len(encrypted)] = encrypted
+        return bytes(packet)
+    packet = bytearray(max(102400, 512 + len(payload)))
+    packet[: len(encrypted)] = encrypted
+    packet[512 : 512 + len(payload)] = payload
+    return bytes(packet)
+
+
+def _construction_fixture(monkeypatch):
+    des = pytest.importorskip("Cryptodome.Cipher.DES")
+    padding = pytest.importorskip("Cryptodome.Util.Padding")
+    transport = _transport(monkeypatch, _FakeEndpoint())
+    monkeypatch.setattr(lcd, "DES", des)
+    monkeypatch.setattr(transport, "_timestamp_ms", lambda: 0x01020304)
+
+    def build(command, payload):
+        return transport._build_packet(command, payload=payload, single_byte=None)
+
+    def legacy(command, payload):
+        return _legacy_packet(des, padding, command, 0x01020304, payload)
+
+    return build, legacy
+
+
+def test_command_construction_matches_legacy_packets(monkeypatch):
+    build, legacy = _construction_fixture(monkeypatch)
+    frame = bytes(range(256)) * 240  # ~60 KiB, a typical 400x400 JPEG
+    handshake = lcd.WirelessCommand.GET_POS_INDEX
+    push = lcd.WirelessCommand.PUSH_JPG
+
+    assert bytes(build(handshake, None)) == legacy(handshake, None)
+    assert bytes(build(push, frame)) == legacy(push, frame)[: 512 + len(frame)]
+
+
+@pytest.mark.benchmark
+def test_command_construction_benchmark(monkeypatch):
+    build, legacy = _construction_fixture(monkeypatch)
+    frame = bytes(range(256)) * 240
+
+    def best_of(func, *args) -> float:
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(200):
+                func(*args)
+            timings.append((time.perf_counter() - start) / 200)
+        return min(timings)
+
+    for name, command, payload in (
+        ("handshake", lcd.WirelessCommand.GET_POS_INDEX, None),
+        ("send_jpg", lcd.WirelessCommand.PUSH_JPG, frame),
+    ):
+        current = best_of(build, command, payload)
+        before = best_of(legacy, command, payload)
+        print(
+            f"{name} command construction: {current * 1e6:.1f}us "
+            f"(was {before * 1e6:.1f}us)"
+        )
+
+
+def test_frame_writes_keep_the_receiver_awake(monkeypatch):
+    endpoint = _FakeEndpoint()
+    transport = _transport(monkeypatch, endpoint)
+    transport._last_contact = 0.0
+    assert transport.idle_seconds() == float("inf")
+
+    transport.send_jpg(b"\x01" * 10)
+    transport.send_jpg(b"\x02" * 10)
+
+    # Only the first push had to handshake; the write itself counts as contact.
+    headers = [write[0] ^ 0x5A for write in endpoint.writes]
+    assert headers.count(lcd.WirelessCommand.GET_POS_INDEX) == 1
+    assert transport.idle_seconds() < lcd.AWAKE_WINDOW
+
+
+def test_send_jpg_accepts_file_objects(monkeypatch, tmp_path):
+    import io
+
+    endpoint = _FakeEndpoint()
+    transport = _transport(monkeypatch, endpoint)
+    frame = tmp_path / "frame.jpg"
+    frame.write_bytes(b"\x00skip" + b"\xdd" * 3000)
+
+    with frame.open("rb") as handle:
+        handle.seek(5)  # uploads start at the current position
+        transport.send_jpg(handle)
+    transport.send_jpg(io.BytesIO(b"\xee" * 40))
+
+    first, second = endpoint.writes
+    assert first[512:3512] == b"\xdd" * 3000
+    assert second[512:552] == b"\xee" * 40
+    assert set(second[552:]) == {0}
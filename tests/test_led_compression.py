@@ -1,16 +1,20 @@
 import os
+import time
 from typing import Tuple
 
 import pytest
 
 from uwscli.tinyuz import (
+    _BIG_POS_FOR_LEN,
+    _CODE_TYPE_DATA,
     _CTRL_STREAM_END,
+    _TinyUZLiteralEncoder,
     compress_led_payload,
     generate_rainbow_frames,
 )
 
 
-def _decode_literal_stream(encoded: bytes) -> Tuple[int, bytes]:
+def _decode_stream(encoded: bytes) -> Tuple[int, bytes]:
     dict_size = int.from_bytes(encoded[:4], "little")
     data = encoded[4:]
     pos = 0
@@ -47,8 +51,15 @@ def _decode_literal_stream(encoded: bytes) -> Tuple[int, bytes]:
                 return value
             value += 1
 
+    def read_dict_pos() -> int:
+        value = read_byte()
+        if value & 0x80:
+            value = (value & 0x7F) | ((read_len(2) + 1) << 7)
+        return value
+
     output = bytearray()
     is_have_data_back = False
+    dict_pos_back = 1
     while True:
         code_type = read_type_bit()
         if code_type == 1:
@@ -57,22 +68,31 @@ def _decode_literal_stream(encoded: bytes) -> Tuple[int, bytes]:
             continue
 
         saved_len = read_len(1)
-        if is_have_data_back:
-            reuse_flag = read_type_bit()
-            assert reuse_flag == 0, "literal encoder must not emit reuse flag"
-        dict_pos = read_byte()
-        assert dict_pos == 0, "literal encoder must emit ctrl with dict_pos=0"
-        if saved_len == _CTRL_STREAM_END:
-            break
-        raise AssertionError(f"Unsupported control code {saved_len}")
-
+        if is_have_data_back and read_type_bit():
+            dict_pos = dict_pos_back
+        else:
+            dict_pos = read_dict_pos()
+            assert dict_pos <= _BIG_POS_FOR_LEN, "encoder must avoid biased positions"
+        is_have_data_back = False
+        if dict_pos == 0:
+            dict_pos_back = 1
+            if saved_len == _CTRL_STREAM_END:
+                break
+            raise AssertionError(f"Unsupported control code {saved_len}")
+        assert dict_pos <= min(dict_size, len(output)), "match reaches past dictionary"
+        dict_pos_back = dict_pos
+        start = len(output) - dict_pos
+        for offset in range(saved_len + 2):
+            output.append(output[start + offset])
+
+    assert pos == len(data), "trailing bytes after stream end"
     return dict_size, bytes(output)
 
 
 def test_compress_led_payload_roundtrip():
     payload = os.urandom(64)
     encoded = compress_led_payload(payload)
-    dict_size, decoded = _decode_literal_stream(encoded)
+    dict_size, decoded = _decode_stream(encoded)
     assert dict_size == 4096
     assert decoded == payload
 
@@ -80,11 +100,106 @@ def test_compress_led_payload_roundtrip():
 def test_compress_led_payload_dict_size_override():
     payload = b"\x01\x02\x03"
     encoded = compress_led_payload(payload, dict_size=255)
-    dict_size, decoded = _decode_literal_stream(encoded)
+    dict_size, decoded = _decode_stream(encoded)
     assert dict_size == 255
     assert decoded == payload
 
 
+def test_compress_led_payload_literal_only_roundtrip():
+    payload = os.urandom(64)
+    encoded = compress_led_payload(payload, literal_only=True)
+    dict_size, decoded = _decode_stream(encoded)
+    assert dict_size == 4096
+    assert decoded == payload
+    assert len(encoded) > len(payload)
+
+
+def test_compress_led_payload_matches_shrink_repetitive_frames():
+    led_count = 104
+    frame_count = 255
+    payload = generate_rainbow_frames(led_count, frame_count=frame_count) + bytes(
+        led_count * 3 * 40
+    )
+    encoded = compress_led_payload(payload)
+    _, decoded = _decode_stream(encoded)
+    assert decoded == payload
+    literal = compress_led_payload(payload, literal_only=True)
+    assert len(encoded) * 3 < len(literal)
+
+
+def test_compress_led_payload_mixed_roundtrip():
+    chunks = []
+    for index in range(40):
+        chunks.append(os.urandom(index % 7 + 1))
+        chunks.append(bytes([index % 5]) * (index * 13 % 300))
+        chunks.append(b"\x10\x20\x30" * (index % 4))
+    payload = b"".join(chunks) + os.urandom(3000) + b"".join(chunks)
+    for dict_size in (16, 255, 4096):
+        encoded = compress_led_payload(payload, dict_size=dict_size)
+        decoded_size, decoded = _decode_stream(encoded)
+        assert decoded_size == dict_size
+        assert decoded == payload
+
+
+def _bytewise_literal_stream(pieces) -> bytes:
+    writer = _TinyUZLiteralEncoder(dict_size=4096)
+    for piece in pieces:
+        for byte in piece:
+            writer._out_type(_CODE_TYPE_DATA)
+            writer._state.code.append(byte)
+            writer._state.is_have_data_back = True
+    writer.finish()
+    return writer.to_bytes()
+
+
+def _bulk_literal_stream(pieces) -> bytes:
+    writer = _TinyUZLiteralEncoder(dict_size=4096)
+    for piece in pieces:
+        writer.write_literal(piece)
+    writer.finish()
+    return writer.to_bytes()
+
+
+def test_bulk_literal_path_matches_bytewise_output():
+    payload = os.urandom(517)
+    for sizes in ((517,), (3, 8, 1, 0, 21, 484), (7, 7, 7, 496)):
+        pieces = []
+        offset = 0
+        for size in sizes:
+            pieces.append(payload[offset : offset + size])
+            offset += size
+        assert _bulk_literal_stream(pieces) == _bytewise_literal_stream(pieces)
+
+
+def _four_fan_payload() -> bytes:
+    return generate_rainbow_frames(4 * 26, frame_count=255)
+
+
+def test_bulk_literal_path_matches_bytewise_four_fans():
+    payload = _four_fan_payload()
+    assert _bulk_literal_stream([payload]) == _bytewise_literal_stream([payload])
+
+
+@pytest.mark.benchmark
+def test_bulk_literal_path_benchmark_four_fans():
+    payload = _four_fan_payload()
+
+    def best_of(func) -> float:
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            func([payload])
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    bulk = best_of(_bulk_literal_stream)
+    bytewise = best_of(_bytewise_literal_stream)
+    print(
+        f"literal encode {len(payload)} bytes: bulk={bulk * 1000:.2f}ms "
+        f"bytewise={bytewise * 1000:.2f}ms ({bytewise / bulk:.1f}x)"
+    )
+
+
 def test_compress_led_payload_empty_payload():
     with pytest.raises(ValueError):
         compress_led_payload(b"")
@@ -0,0 +1,63 @@
+import pytest
+
+from uwscli.led_frames import LEDFrameBuffer
+from uwscli.tl_effects import TLEffectGenerator, TLEffects
+
+
+def _reference_overlay(front, back):
+    total = max(len(front), len(back))
+    merged = []
+    for index in range(total):
+        frame_front = front[index % len(front)]
+        frame_back = back[index % len(back)]
+        combined = [list(channel) for channel in frame_front]
+        for led in range(len(frame_back[0])):
+            rgb = (frame_back[0][led], frame_back[1][led], frame_back[2][led])
+            if any(rgb):
+                for channel in range(3):
+                    combined[channel][led] = rgb[channel]
+        merged.append(combined)
+    return LEDFrameBuffer.from_planes(merged, len(front[0][0]))
+
+
+def test_from_planes_interleaves_channels_and_exposes_frame_views():
+    frames = [
+        [[1, 2], [3, 4], [5, 6]],
+        [[7, 8], [9, 10], [11, 12]],
+    ]
+    buffer = LEDFrameBuffer.from_planes(frames, 2)
+
+    assert len(buffer) == 2
+    assert buffer.tobytes() == bytes([1, 3, 5, 2, 4, 6, 7, 9, 11, 8, 10, 12])
+    assert bytes(buffer.frame(-1)) == bytes([7, 9, 11, 8, 10, 12])
+    views = list(buffer)
+    assert all(isinstance(view, memoryview) for view in views)
+    assert views[0].obj is buffer.buffer.obj
+
+    buffer.set_frame(0, bytes(6))
+    assert buffer.tobytes()[:6] == bytes(6)
+    with pytest.raises(IndexError):
+        buffer.frame(2)
+
+
+def test_buffer_validates_geometry_and_read_only_data():
+    with pytest.raises(ValueError):
+        LEDFrameBuffer(bytes(7), 2)
+    frozen = LEDFrameBuffer(bytes(12), 2)
+    with pytest.raises(TypeError):
+        frozen.set_frame(0, bytes(6))
+
+
+@pytest.mark.parametrize("effect", [TLEffects.METEOR, TLEffects.VOICE, TLEffects.TWINKLE])
+def test_overlay_matches_per_led_merge(effect):
+    generator = TLEffectGenerator()
+    front = generator.generate(effect, 0, 3, 255, 1)
+    back = generator.generate(TLEffects.BREATHING, 1, 3, 180, 0)
+    led_count = 3 * TLEffectGenerator.LEDS_PER_FAN
+
+    merged = LEDFrameBuffer.from_planes(front, led_count).overlay(
+        LEDFrameBuffer.from_planes(back, led_count)
+    )
+
+    assert len(merged) == max(len(front), len(back))
+    assert merged == _reference_overlay(front, back)
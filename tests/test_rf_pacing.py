@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from uwscli import rf_pacing
+
+
+def test_controller_tightens_and_persists(tmp_path):
+    path = tmp_path / "pacing.json"
+    store = rf_pacing.PacingStore(path)
+    controller = store.controller("1-2")
+    assert controller.scale == rf_pacing.INITIAL_SCALE
+    for _ in range(20):
+        controller.record_success()
+    assert controller.scale == rf_pacing.MIN_SCALE
+    assert controller.current.chunk_interval == pytest.approx(
+        rf_pacing.FIXED_PACING.chunk_interval * rf_pacing.MIN_SCALE
+    )
+    assert controller.current.header_repeats == rf_pacing.FIXED_PACING.header_repeats
+
+    # Successes stay in memory until the store is flushed.
+    assert not path.exists()
+    controller.flush()
+    mtime = path.stat().st_mtime_ns
+    controller.flush()
+    assert path.stat().st_mtime_ns == mtime
+
+    reloaded = rf_pacing.PacingStore(path).controller("1-2")
+    assert reloaded.scale == rf_pacing.MIN_SCALE
+    assert rf_pacing.PacingStore(path).controller("3-1").scale == (
+        rf_pacing.INITIAL_SCALE
+    )
+
+
+def test_failure_backs_off_and_raises_floor(tmp_path):
+    store = rf_pacing.PacingStore(tmp_path / "pacing.json")
+    controller = store.controller("1-2")
+    controller.record_failure("USB write failed")
+    assert controller.scale == pytest.approx(rf_pacing.INITIAL_SCALE * 2)
+    assert controller.floor == pytest.approx(rf_pacing.INITIAL_SCALE * 1.25)
+    for _ in range(50):
+        controller.record_success()
+    assert controller.scale == pytest.approx(controller.floor)
+    for _ in range(10):
+        controller.record_failure("again")
+    assert controller.scale == 1.0
+    assert controller.current == rf_pacing.FIXED_PACING
+
+
+def test_missing_receiver_after_upload_counts_as_failure(tmp_path):
+    store = rf_pacing.PacingStore(tmp_path / "pacing.json")
+    controller = store.controller("1-2")
+    controller.expect_receiver("AA:BB:CC:DD:EE:FF")
+    controller.flush()
+
+    # A fresh process still knows which upload it has to confirm.
+    controller = rf_pacing.PacingStore(store.path).controller("1-2")
+    assert controller.pending == {"aa:bb:cc:dd:ee:ff"}
+    controller.confirm_receivers({"aa:bb:cc:dd:ee:ff"})
+    assert controller.scale == rf_pacing.INITIAL_SCALE
+    assert controller.pending == set()
+
+    controller.expect_receiver("aa:bb:cc:dd:ee:ff")
+    controller.confirm_receivers(set())
+    assert controller.scale > rf_pacing.INITIAL_SCALE
+    # Backoffs are persisted without waiting for a flush.
+    reloaded = rf_pacing.PacingStore(store.path).controller("1-2")
+    assert reloaded.scale == controller.scale
+
+
+def test_corrupt_state_is_ignored(tmp_path):
+    path = tmp_path / "pacing.json"
+    path.write_text("{not json")
+    controller = rf_pacing.PacingStore(path).controller("1-2")
+    assert controller.scale == rf_pacing.INITIAL_SCALE
+    controller.record_success()
+    controller.flush()
+    assert json.loads(path.read_text())["senders"]["1-2"]["scale"] < (
+        rf_pacing.INITIAL_SCALE
+    )
+
+
+def test_adaptive_enabled_override(monkeypatch):
+    monkeypatch.delenv(rf_pacing.PACING_ENV, raising=False)
+    assert rf_pacing.adaptive_enabled() is False
+    assert rf_pacing.adaptive_enabled("adaptive") is True
+    monkeypatch.setenv(rf_pacing.PACING_ENV, "adaptive")
+    assert rf_pacing.adaptive_enabled() is True
+    assert rf_pacing.adaptive_enabled("fixed") is False
@@ -0,0 +1,321 @@
+import time
+
+import pytest
+
+from uwscli import system_usb
+from uwscli.system_usb import USBDeviceIndex, USBRecord
+
+
+def _write_device(root, name, vid, pid, *, serial=None, busnum=1, devnum=2):
+    entry = root / name
+    entry.mkdir(parents=True)
+    (entry / "idVendor").write_text(f"{vid:04x}\n")
+    (entry / "idProduct").write_text(f"{pid:04x}\n")
+    (entry / "busnum").write_text(f"{busnum}\n")
+    (entry / "devnum").write_text(f"{devnum}\n")
+    if serial is not None:
+        (entry / "serial").write_text(serial + "\n")
+    return entry
+
+
+class _CountingScanner:
+    def __init__(self, records):
+        self.records = records
+        self.calls = 0
+
+    def __call__(self, ids=None):
+        self.calls += 1
+        self.ids = ids
+        return [
+            r for r in self.records if ids is None or (r.vendor_id, r.product_id) in ids
+        ]
+
+
+class _FakeMonitor:
+    def __init__(self):
+        self.pending = []
+
+    def drain(self):
+        events, self.pending = self.pending, []
+        return events
+
+    def close(self):
+        pass
+
+
+def _index(scanner, monkeypatch, *, monitor=None, signature=None, ids=None):
+    monkeypatch.setattr(USBDeviceIndex, "_bus_signature", lambda self: signature)
+    index = USBDeviceIndex(scanner=scanner, ids=ids, watch=False, max_age=60)
+    index._monitor = monitor
+    return index
+
+
+def test_index_serves_lookups_from_one_scan(monkeypatch):
+    scanner = _CountingScanner(
+        [
+            USBRecord(0x0416, 0x8040, serial="A", location_id=0x0102),
+            USBRecord(0x0416, 0x8041, serial="B", location_id=0x0103),
+            USBRecord(0x1D6B, 0x0002, location_id=0x0101),
+        ]
+    )
+    index = _index(scanner, monkeypatch)
+
+    assert [r.serial for r in index.find(0x0416, 0x8040)] == ["A"]
+    assert [r.product_id for r in index.find_serial("B")] == [0x8041]
+    assert index.find_location(0x0101).vendor_id == 0x1D6B
+    assert index.find(0x1234, 0x5678) == []
+    assert scanner.calls == 1
+
+    index.invalidate()
+    index.find(0x0416, 0x8040)
+    assert scanner.calls == 2
+
+
+def test_index_rescans_when_usbfs_changes(monkeypatch):
+    scanner = _CountingScanner([USBRecord(0x0416, 0x8040)])
+    signature = [(("001", 1),)]
+    monkeypatch.setattr(USBDeviceIndex, "_bus_signature", lambda self: signature[0])
+    index = USBDeviceIndex(scanner=scanner, watch=False)
+
+    index.records()
+    index.records()
+    assert scanner.calls == 1
+
+    signature[0] = (("001", 2),)
+    index.records()
+    assert scanner.calls == 2
+
+
+def test_index_applies_hotplug_events_without_rescanning(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_usb, "SYSFS_ROOT", tmp_path)
+    _write_device(
+        tmp_path / "devices/pci0000:00/usb1",
+        "1-2",
+        0x0416,
+        0x8040,
+        serial="LCD1",
+        busnum=1,
+        devnum=7,
+    )
+    scanner = _CountingScanner([USBRecord(0x0416, 0x8041, location_id=0x0103)])
+    monitor = _FakeMonitor()
+    index = _index(scanner, monkeypatch, monitor=monitor)
+    assert index.find(0x0416, 0x8040) == []
+
+    message = b"\0".join(
+        [
+            b"add@/devices/pci0000:00/usb1/1-2",
+            b"ACTION=add",
+            b"DEVPATH=/devices/pci0000:00/usb1/1-2",
+            b"SUBSYSTEM=usb",
+            b"DEVTYPE=usb_device",
+            b"BUSNUM=001",
+            b"DEVNUM=007",
+            b"",
+        ]
+    )
+    monitor.pending.append(system_usb._parse_uevent(message))
+    added = index.find(0x0416, 0x8040)
+    assert [(r.serial, r.location_id) for r in added] == [("LCD1", 0x0107)]
+
+    monitor.pending.append({"ACTION": "remove", "BUSNUM": "001", "DEVNUM": "003"})
+    assert index.find(0x0416, 0x8041) == []
+    assert scanner.calls == 1
+
+    monitor.pending = None  # socket overflowed: events were lost
+    index.records()
+    assert scanner.calls == 2
+
+
+def test_silent_monitor_still_rescans_when_usbfs_changes(monkeypatch):
+    # In a container the uevent socket binds but no event ever arrives.
+    scanner = _CountingScanner([USBRecord(0x0416, 0x8040)])
+    signature = [(("001", 1),)]
+    monkeypatch.setattr(USBDeviceIndex, "_bus_signature", lambda self: signature[0])
+    index = USBDeviceIndex(scanner=scanner, watch=False)
+    index._monitor = _FakeMonitor()
+
+    index.records()
+    index.records()
+    assert scanner.calls == 1
+
+    signature[0] = (("001", 2),)
+    scanner.records.append(USBRecord(0x1CBE, 0x0006))
+    assert index.find(0x1CBE, 0x0006) == [USBRecord(0x1CBE, 0x0006)]
+    assert scanner.calls == 2
+
+
+def test_filtered_index_widens_its_ids_on_unknown_lookups(monkeypatch):
+    scanner = _CountingScanner(
+        [
+            USBRecord(0x0416, 0x8040, serial="A", location_id=0x0102),
+            USBRecord(0x1D6B, 0x0002, location_id=0x0101),
+        ]
+    )
+    index = _index(scanner, monkeypatch, ids=[(0x0416, 0x8040)])
+
+    assert [r.serial for r in index.find(0x0416, 0x8040)] == ["A"]
+    assert scanner.ids == {(0x0416, 0x8040)}
+    assert index.find_location(0x0101) is None
+    assert scanner.calls == 1
+
+    assert [r.location_id for r in index.find(0x1D6B, 0x0002)] == [0x0101]
+    assert scanner.ids == {(0x0416, 0x8040), (0x1D6B, 0x0002)}
+    index.find(0x1D6B, 0x0002)
+    index.add_ids([(0x0416, 0x8040)])
+    index.find(0x0416, 0x8040)
+    assert scanner.calls == 2
+
+
+def test_filtered_index_ignores_hotplug_of_other_devices(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_usb, "SYSFS_ROOT", tmp_path)
+    scanner = _CountingScanner([USBRecord(0x0416, 0x8040, location_id=0x0102)])
+    monitor = _FakeMonitor()
+    index = _index(scanner, monkeypatch, monitor=monitor, ids=[(0x0416, 0x8040)])
+    index.records()
+    opened = []
+    monkeypatch.setattr(system_usb, "_read_text", lambda path: opened.append(path))
+
+    monitor.pending.append(
+        {
+            "ACTION": "add",
+            "DEVPATH": "/devices/pci0000:00/usb1/1-3",
+            "PRODUCT": "46d/c52b/1211",
+            "BUSNUM": "001",
+            "DEVNUM": "004",
+        }
+    )
+    assert [r.location_id for r in index.records()] == [0x0102]
+    assert opened == []
+    assert scanner.calls == 1
+
+
+def test_default_index_scans_for_lcd_and_rf_ids(monkeypatch):
+    from uwscli import lcd, wireless
+
+    monkeypatch.setattr(system_usb, "_default_index", None)
+    index = system_usb.default_index()
+    try:
+        assert index._ids == set(lcd.KNOWN_LCD_IDS) | {
+            (wireless.RF_SENDER_VID, wireless.RF_SENDER_PID),
+            (wireless.RF_RECEIVER_VID, wireless.RF_RECEIVER_PID),
+        }
+    finally:
+        index.close()
+
+
+def test_parse_uevent_ignores_interfaces_and_udev_messages():
+    interface = (
+        b"add@/devices/usb1/1-2/1-2:1.0\0ACTION=add\0"
+        b"SUBSYSTEM=usb\0DEVTYPE=usb_interface\0"
+    )
+    assert system_usb._parse_uevent(interface) is None
+    assert system_usb._parse_uevent(b"libudev\0\xfe\xed\xca\xfe") is None
+
+
+def test_scan_linux_sysfs_skips_interfaces(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_usb, "SYSFS_USB_DEVICES", tmp_path)
+    _write_device(tmp_path, "1-2", 0x0416, 0x8040, serial="LCD1", devnum=5)
+    (tmp_path / "1-2:1.0").mkdir()
+    (tmp_path / "usb1").mkdir()
+
+    records = system_usb._scan_linux_sysfs()
+
+    assert records == [USBRecord(0x0416, 0x8040, serial="LCD1", location_id=0x0105)]
+
+
+def _write_uevent(entry, vid, pid, busnum, devnum):
+    (entry / "uevent").write_text(
+        f"MAJOR=189\nMINOR={devnum - 1}\nDEVNAME=bus/usb/{busnum:03d}/{devnum:03d}\n"
+        f"DEVTYPE=usb_device\nDRIVER=usb\nPRODUCT={vid:x}/{pid:x}/100\n"
+        f"TYPE=0/0/0\nBUSNUM={busnum:03d}\nDEVNUM={devnum:03d}\n"
+    )
+
+
+def _synthetic_sysfs(root, count):
+    wanted = {(0x0416, 0x8040): "TX", (0x1CBE, 0x0006): "LCD"}
+    for index in range(count):
+        busnum, devnum = index // 100 + 1, index % 100 + 2
+        vid, pid = 0x046D, 0xC000 + index
+        serial = f"OTHER{index}"
+        if index in (7, count - 2):
+            (vid, pid), serial = list(wanted.items())[index % 2]
+        entry = _write_device(
+            root,
+            f"{busnum}-{index}",
+            vid,
+            pid,
+            serial=serial,
+            busnum=busnum,
+            devnum=devnum,
+        )
+        (entry / "product").write_text("Device\n")
+        (entry / "manufacturer").write_text("Vendor\n")
+        _write_uevent(entry, vid, pid, busnum, devnum)
+        (root / f"{busnum}-{index}:1.0").mkdir()
+    return set(wanted)
+
+
+def _legacy_scan(root):
+    # Seven attribute reads per device, as before the filtered scanner.
+    devices = []
+    for entry in root.iterdir():
+        if ":" in entry.name or not entry.is_dir():
+            continue
+        read = system_usb._read_text
+        vid = system_usb._parse_int(read(entry / "idVendor"), base=16)
+        pid = system_usb._parse_int(read(entry / "idProduct"), base=16)
+        product, vendor = read(entry / "product"), read(entry / "manufacturer")
+        serial = read(entry / "serial")
+        busnum = system_usb._parse_int(read(entry / "busnum"))
+        devnum = system_usb._parse_int(read(entry / "devnum"))
+        devices.append(
+            USBRecord(vid, pid, product, vendor, serial, (busnum << 8) | devnum)
+        )
+    return devices
+
+
+def test_filtered_scan_reads_strings_only_for_matches(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_usb, "SYSFS_USB_DEVICES", tmp_path)
+    wanted = _synthetic_sysfs(tmp_path, 40)
+    opened = []
+    real_read_text = system_usb._read_text
+
+    def tracking_read_text(path):
+        opened.append(path.name)
+        return real_read_text(path)
+
+    monkeypatch.setattr(system_usb, "_read_text", tracking_read_text)
+    records = system_usb._scan_linux_sysfs(wanted)
+
+    assert sorted(r.serial for r in records) == ["LCD", "TX"]
+    assert opened.count("uevent") == 40
+    assert opened.count("serial") == 2
+    assert "idVendor" not in opened
+
+    full = system_usb._scan_linux_sysfs()
+    key = lambda record: record.location_id  # noqa: E731
+    assert sorted(full, key=key) == sorted(_legacy_scan(tmp_path), key=key)
+
+
+@pytest.mark.benchmark
+def test_filtered_scan_benchmark_synthetic_sysfs(tmp_path, monkeypatch):
+    monkeypatch.setattr(system_usb, "SYSFS_USB_DEVICES", tmp_path)
+    wanted = _synthetic_sysfs(tmp_path, 400)
+
+    def best_of(func) -> float:
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    legacy = best_of(lambda: _legacy_scan(tmp_path))
+    full = best_of(system_usb._scan_linux_sysfs)
+    filtered = best_of(lambda: system_usb._scan_linux_sysfs(wanted))
+    print(
+        f"sysfs scan 400 devices: legacy={legacy * 1000:.2f}ms "
+        f"full={full * 1000:.2f}ms filtered={filtered * 1000:.2f}ms "
+        f"({legacy / filtered:.1f}x)"
+    )
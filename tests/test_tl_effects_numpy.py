@@ -0,0 +1,46 @@
+import pytest
+
+from uwscli import tl_effects_numpy, wireless
+from uwscli.tl_effects import TLEffectGenerator, TLEffects
+
+np = pytest.importorskip("numpy")
+
+
+def _as_array(frames):
+    return np.array(frames, dtype=np.uint8).transpose(0, 2, 1)
+
+
+@pytest.mark.parametrize("effect", list(TLEffects), ids=lambda effect: effect.name)
+def test_numpy_generator_matches_reference(effect):
+    reference = TLEffectGenerator()
+    vectorised = tl_effects_numpy.NumpyTLEffectGenerator()
+    for fans in range(1, 5):
+        for tb in (0, 1):
+            for direction in (0, 1):
+                for brightness in (255, 7):
+                    args = (effect, tb, fans, brightness, direction)
+                    try:
+                        expected = reference.generate(*args)
+                    except IndexError:
+                        with pytest.raises(IndexError):
+                            vectorised.generate(*args)
+                        continue
+                    result = vectorised.generate(*args)
+                    assert result.dtype == np.uint8
+                    np.testing.assert_array_equal(result, _as_array(expected))
+
+
+def test_generate_buffer_matches_reference_buffer():
+    reference = TLEffectGenerator().generate_buffer(TLEffects.METEOR, 1, 3, 200, 0)
+    vectorised = tl_effects_numpy.NumpyTLEffectGenerator().generate_buffer(
+        TLEffects.METEOR, 1, 3, 200, 0
+    )
+    assert vectorised == reference
+
+
+def test_compile_led_effect_is_backend_independent(monkeypatch):
+    kwargs = dict(tb=None, fan_slots=2, brightness=200, direction=1)
+    fast = wireless.compile_led_effect(TLEffects.TIDE, **kwargs)
+    monkeypatch.setattr(tl_effects_numpy, "is_available", lambda: False)
+    slow = wireless.compile_led_effect(TLEffects.TIDE, **kwargs)
+    assert fast == slow
@@ -97,3 +97,90 @@ def test_claim_interface_busy_exhaustion_raises_usb_error(monkeypatch, fake_devi
             write_endpoint=0x01,
             read_endpoint=0x81,
         )
+
+
+class _BusDevice(_FakeDevice):
+    def __init__(self, bus, address, serial, *, vid=0x1CBE, pid=0x0006):
+        super().__init__()
+        self.idVendor = vid
+        self.idProduct = pid
+        self.bus = bus
+        self.address = address
+        self.iSerialNumber = 3
+        self.serial = serial
+        self.gone = False
+
+    def get_active_configuration(self):
+        if self.gone:
+            raise usb.core.USBError("No such device", 19)
+        return self._config
+
+    def set_configuration(self, *args):
+        if self.gone:
+            raise usb.core.USBError("No such device", 19)
+
+
+@pytest.fixture
+def usb_bus(monkeypatch):
+    bus = {"devices": [], "finds": [], "strings": 0}
+
+    def fake_find(custom_match=None, **kwargs):
+        bus["finds"].append(kwargs)
+        for dev in bus["devices"]:
+            if all(getattr(dev, key) == value for key, value in kwargs.items()):
+                if custom_match is None or custom_match(dev):
+                    return dev
+        return None
+
+    def fake_get_string(dev, index):
+        bus["strings"] += 1
+        return dev.serial
+
+    monkeypatch.setattr(usb.core, "find", fake_find)
+    monkeypatch.setattr(usb.util, "get_string", fake_get_string)
+    monkeypatch.setattr(usb.util, "claim_interface", lambda dev, intf: None)
+    monkeypatch.setattr(usbutil, "_DEVICES", {})
+    monkeypatch.setattr(usbutil, "_SERIAL_LOCATIONS", {})
+    return bus
+
+
+def test_open_by_location_skips_serial_reads_and_reuses_handle(usb_bus):
+    target = _BusDevice(1, 9, "LCD-B")
+    usb_bus["devices"] = [_BusDevice(1, 4, "LCD-A"), target]
+
+    first = usbutil.USBEndpointDevice(0x1CBE, 0x0006, location_id=0x0109)
+    assert first.device is target
+    assert usb_bus["finds"][0]["bus"] == 1 and usb_bus["finds"][0]["address"] == 9
+    assert usb_bus["strings"] == 0
+
+    first.close()
+    again = usbutil.USBEndpointDevice(0x1CBE, 0x0006, location_id=0x0109)
+    assert again.device is target
+    assert len(usb_bus["finds"]) == 1
+
+    with pytest.raises(usbutil.USBError, match="at location 0x0105"):
+        usbutil.USBEndpointDevice(0x1CBE, 0x0006, location_id=0x0105)
+
+
+def test_open_by_serial_caches_location_across_calls(usb_bus):
+    target = _BusDevice(2, 7, "LCD-C")
+    usb_bus["devices"] = [
+        _BusDevice(1, 4, "LCD-A"),
+        _BusDevice(1, 5, "LCD-B"),
+        target,
+    ]
+
+    usbutil.USBEndpointDevice(0x1CBE, 0x0006, serial_number="LCD-C").close()
+    assert usb_bus["strings"] == 3  # one string request per candidate
+
+    usbutil.USBEndpointDevice(0x1CBE, 0x0006, serial_number="LCD-C")
+    assert usb_bus["strings"] == 3
+    assert len(usb_bus["finds"]) == 1
+
+    # Replugged: the cached handle is dead and the device has a new address.
+    target.gone = True
+    moved = _BusDevice(2, 8, "LCD-C")
+    usb_bus["devices"][2] = moved
+    reopened = usbutil.USBEndpointDevice(0x1CBE, 0x0006, serial_number="LCD-C")
+    assert reopened.device is moved
+    assert usbutil._SERIAL_LOCATIONS[(0x1CBE, 0x0006, "LCD-C")] == 0x0208
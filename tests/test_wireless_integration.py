@@ -1,6 +1,6 @@
 import pytest
 
-from uwscli import wireless
+from uwscli import rf_pacing, wireless
 
 
 def _build_listing_page(
@@ -94,6 +94,168 @@ def test_set_pwm_sync_enable_emits_sentinel(fake_usb):
     assert pwm_bytes == bytes([6, 6, 6, 6])
 
 
+def _count_listings(receiver):
+    listings = []
+    original_write = receiver.write
+
+    def write(data):
+        listings.append(bytes(data[:2]))
+        original_write(data)
+
+    receiver.write = write
+    return listings
+
+
+def test_commands_reuse_cached_snapshot(fake_usb):
+    sender, receiver = fake_usb
+    listings = _count_listings(receiver)
+    with wireless.WirelessTransceiver() as tx:
+        tx.set_pwm("aa:bb:cc:dd:ee:ff", [1, 2, 3, 4])
+        tx.set_pwm("AA:BB:CC:DD:EE:FF", [5, 6, 7, 8])
+        tx.set_pwm_sync("aa:bb:cc:dd:ee:ff", enable=True)
+
+    assert len(listings) == 1
+    assert len(sender.writes) == 12
+
+
+def test_snapshot_ttl_zero_lists_every_command(fake_usb):
+    _, receiver = fake_usb
+    listings = _count_listings(receiver)
+    with wireless.WirelessTransceiver(snapshot_ttl=0) as tx:
+        tx.set_pwm("aa:bb:cc:dd:ee:ff", [1, 2, 3, 4])
+        tx.set_pwm("aa:bb:cc:dd:ee:ff", [5, 6, 7, 8])
+
+    assert len(listings) == 2
+
+
+def test_unknown_mac_refreshes_cached_snapshot_once(fake_usb):
+    _, receiver = fake_usb
+    listings = _count_listings(receiver)
+    with wireless.WirelessTransceiver() as tx:
+        tx.list_devices()
+        with pytest.raises(wireless.WirelessError, match="not found"):
+            tx.set_pwm("00:11:22:33:44:55", [1, 2, 3, 4])
+
+    assert len(listings) == 2
+
+
+def test_unbind_invalidates_cached_snapshot(fake_usb, monkeypatch):
+    _, receiver = fake_usb
+    listings = _count_listings(receiver)
+    monkeypatch.setattr(wireless.time, "sleep", lambda *_: None)
+    with wireless.WirelessTransceiver() as tx:
+        tx.unbind_device("aa:bb:cc:dd:ee:ff")
+        assert len(listings) == 2  # lookup + post-unbind refresh
+        tx.set_pwm("aa:bb:cc:dd:ee:ff", [1, 2, 3, 4])
+
+    assert len(listings) == 3
+
+
+def test_set_pwm_many_streams_one_burst(fake_usb, monkeypatch):
+    sender, receiver = fake_usb
+    listings = _count_listings(receiver)
+    sleeps = []
+    monkeypatch.setattr(wireless.time, "sleep", sleeps.append)
+    with wireless.WirelessTransceiver() as tx:
+        results = tx.set_pwm_many(
+            {"aa:bb:cc:dd:ee:ff": [10], "AA:BB:CC:DD:EE:FF": [1, 2, 3, 4]},
+            chunk_interval=0.001,
+        )
+
+    assert len(listings) == 1
+    assert [result.pwm_values for result in results] == [
+        (10, 10, 10, 10),
+        (1, 2, 3, 4),
+    ]
+    assert results[1].offset_ms >= results[0].offset_ms
+    assert len(sender.writes) == 8
+    assert [packet[1] for packet in sender.writes] == [0, 1, 2, 3] * 2
+    assert sender.writes[4][4 + 17 : 4 + 21] == bytes([1, 2, 3, 4])
+    # Pacing only between chunks, never after the final write.
+    assert sleeps == [0.001] * 7
+
+
+def test_set_pwm_many_validates_before_sending(fake_usb):
+    sender, _ = fake_usb
+    with wireless.WirelessTransceiver() as tx:
+        with pytest.raises(wireless.WirelessError, match="not found"):
+            tx.set_pwm_many({"aa:bb:cc:dd:ee:ff": [10], "00:11:22:33:44:55": [20]})
+
+    assert sender.writes == []
+
+
+def test_adaptive_pacing_shortens_led_upload(fake_usb, monkeypatch, tmp_path):
+    sender, _ = fake_usb
+    sleeps = []
+    monkeypatch.setattr(wireless.time, "sleep", sleeps.append)
+    with wireless.WirelessTransceiver() as tx:
+        tx.set_led_static("aa:bb:cc:dd:ee:ff", (255, 0, 0))
+    fixed_sleep = sum(sleeps)
+    fixed_writes = len(sender.writes)
+
+    sleeps.clear()
+    sender.writes.clear()
+    store = rf_pacing.PacingStore(tmp_path / "pacing.json")
+    with wireless.WirelessTransceiver(pacing=store) as tx:
+        tx.set_led_static("aa:bb:cc:dd:ee:ff", (255, 0, 0))
+        controller = tx._pacer
+
+    assert sum(sleeps) < fixed_sleep / 3
+    # Only the gaps shrink: packet 0 still goes out, then its three re-sends.
+    assert len(sender.writes) == fixed_writes
+    repeats = rf_pacing.FIXED_PACING.header_repeats
+    assert repeats == 3
+    assert sender.writes.count(sender.writes[0]) == repeats + 1
+    assert controller.scale < rf_pacing.INITIAL_SCALE
+    assert controller.pending == {"aa:bb:cc:dd:ee:ff"}
+    # Closing the transceiver persisted what the upload learned.
+    reloaded = rf_pacing.PacingStore(store.path).controller(controller.location)
+    assert reloaded.pending == {"aa:bb:cc:dd:ee:ff"}
+
+
+def test_adaptive_pacing_backs_off_and_retries_write_errors(
+    fake_usb, monkeypatch, tmp_path
+):
+    sender, _ = fake_usb
+    monkeypatch.setattr(wireless.time, "sleep", lambda *_: None)
+    original_write = sender.write
+    failures = [wireless.USBError("USB write failed: timeout")]
+
+    def flaky_write(data):
+        if failures:
+            raise failures.pop()
+        original_write(data)
+
+    sender.write = flaky_write
+    store = rf_pacing.PacingStore(tmp_path / "pacing.json")
+    with wireless.WirelessTransceiver(pacing=store) as tx:
+        tx.set_pwm("aa:bb:cc:dd:ee:ff", [1, 2, 3, 4])
+        assert tx._pacer.scale == pytest.approx(rf_pacing.INITIAL_SCALE * 2)
+    assert len(sender.writes) == 4
+
+    failures.append(wireless.USBError("USB write failed: timeout"))
+    with wireless.WirelessTransceiver() as tx:
+        with pytest.raises(wireless.USBError):
+            tx.set_pwm("aa:bb:cc:dd:ee:ff", [1, 2, 3, 4])
+
+
+def test_pwm_payload_template_is_patched_per_send(fake_usb, monkeypatch):
+    sender, _ = fake_usb
+    monkeypatch.setattr(wireless.time, "sleep", lambda *_: None)
+    with wireless.WirelessTransceiver() as tx:
+        tx.set_pwm("aa:bb:cc:dd:ee:ff", [1, 2, 3, 4], sequence_index=7)
+        tx.set_pwm("aa:bb:cc:dd:ee:ff", [200, 201, 202, 203], sequence_index=9)
+        assert len(tx._pwm_templates) == 1
+        assert len(tx._rf_frames) == 1
+
+    first, second = sender.writes[0], sender.writes[4]
+    assert first[:4] == bytes([wireless.RF_PACKET_HEADER, 0, 3, 2])
+    assert first[4 + 16 : 4 + 21] == bytes([7, 1, 2, 3, 4])
+    assert second[4 + 16 : 4 + 21] == bytes([9, 200, 201, 202, 203])
+    assert second[4 + 2 : 4 + 8] == bytes.fromhex("aabbccddeeff")
+    assert [packet[1] for packet in sender.writes] == [0, 1, 2, 3] * 2
+
+
 def test_snapshot_motherboard_pwm_extracts_ratio():
     raw = bytes([wireless.RF_GET_DEV_CMD, 1, 2, 6])
     snapshot = wireless.WirelessSnapshot(devices=[], raw=raw)
@@ -319,3 +481,91 @@ def test_run_pwm_sync_loop_stop_after_first(monkeypatch):
             "sequence": (device.command_sequence + 1) & 0xFF,
         }
     ]
+
+
+class _PollStub:
+    def __init__(self, readings, device, log):
+        self.readings = readings
+        self.device = device
+        self.log = log
+        self.sent = []
+
+    def __enter__(self):
+        self.log.append("open")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.log.append("close")
+        return False
+
+    def poll_motherboard_pwm(self):
+        reading = self.readings.pop(0)
+        if isinstance(reading, Exception):
+            raise reading
+        return reading
+
+    def cached_snapshot(self):
+        self.log.append("snapshot")
+        return wireless.WirelessSnapshot(devices=[self.device], raw=b"")
+
+    def set_pwm_direct(self, target, pwm_values, sequence_index=1, **kwargs):
+        self.sent.append((pwm_values[0], sequence_index))
+
+
+def _sync_device():
+    return wireless.WirelessDeviceInfo(
+        mac="aa:bb:cc:dd:ee:ff",
+        master_mac="11:22:33:44:55:66",
+        channel=3,
+        rx_type=2,
+        device_type=7,
+        fan_count=4,
+        pwm_values=(10, 20, 30, 40),
+        fan_rpm=(1000, 0, 0, 0),
+        command_sequence=5,
+        raw=bytes(42),
+    )
+
+
+def test_pwm_sync_engine_applies_deadband_and_rate_limit(monkeypatch):
+    log = []
+    stub = _PollStub([100, 101, 120, 121, 124, None, 0], _sync_device(), log)
+    clock = iter([0.0, 0.05, 0.1, 0.2, 0.4, 0.5, 0.7])
+    monkeypatch.setattr(wireless.time, "monotonic", lambda: next(clock))
+    engine = wireless.PWMSyncEngine(
+        ["AA:BB:CC:DD:EE:FF"],
+        deadband=3,
+        min_send_interval=0.25,
+        transceiver_factory=lambda: stub,
+    )
+
+    results = [engine.step() for _ in range(7)]
+    engine.close()
+
+    # 101 is inside the deadband, 120 is rate limited until t=0.4 when the
+    # latest value (124) goes out; 0 always passes the deadband.
+    assert results == [True, False, False, False, True, False, True]
+    assert stub.sent == [(100, 6), (124, 7), (0, 8)]
+    # One session for every cycle; the listing is only read before sends.
+    assert log == ["open", "snapshot", "snapshot", "snapshot", "close"]
+
+
+def test_pwm_sync_engine_reopens_after_usb_error():
+    log = []
+    readings = [wireless.USBError("USB read failed"), 150]
+    stubs = []
+
+    def factory():
+        stubs.append(_PollStub(readings, _sync_device(), log))
+        return stubs[-1]
+
+    wireless.run_pwm_sync_loop(
+        ["aa:bb:cc:dd:ee:ff"],
+        interval=0.01,
+        stop_after_first_send=True,
+        transceiver_factory=factory,
+    )
+
+    assert len(stubs) == 2
+    assert stubs[1].sent == [(150, 6)]
+    assert log == ["open", "close", "open", "snapshot", "close"]